@@ -0,0 +1,235 @@
+"""
+벤치마크 - 헤드리스 백엔드(ooxml/openpyxl)와 zip 압축 정책별 저장 속도/파일 크기 비교
+
+- python excel_template_filler.py bench       (원천 데이터 앞 20행)
+- python excel_template_filler.py bench 100   (앞 100행)
+- python excel_template_filler.py bench --synthetic 100000  (합성 10만 행 전체 실행의 메모리 확인)
+
+같은 행을 정책마다 임시 폴더에 렌더링해 건/초, 행당 ms, 평균 파일 크기를 표로 출력하고
+결과를 report_dir/bench.json에 저장한다. 사진 삽입/PDF 저장은 제외한다 (Excel 필요).
+
+--synthetic N은 원천 데이터 앞 행을 반복해 N행 CSV를 만들고 process_all을 그대로 실행해
+(ooxml, 메모리 상한 모드) 최대 RSS와 N행마다의 RSS 기록을 출력한다.
+"""
+
+import io
+import os
+import sys
+import csv
+import json
+import time
+import shutil
+import tempfile
+import contextlib
+from itertools import islice
+
+from row_sources import open_row_source
+from zip_policy import ZipPolicy
+
+# 합성 배치에서 반복할 원천 행 수
+SYNTHETIC_BASE_ROWS = 100
+# memory_limit_mb가 설정되지 않았을 때 합성 배치에 쓰는 상한
+SYNTHETIC_LIMIT_MB = 512
+# 합성 배치 진행 출력 간격 (초)
+SYNTHETIC_PROGRESS_SEC = 5
+
+# 비교할 압축 정책 (XML 압축 수준, 이미지 무압축 여부)
+BENCH_POLICIES = [(0, True), (1, True), (6, True), (9, True), (6, False)]
+HEADLESS_BACKENDS = ["ooxml", "openpyxl"]
+
+
+def load_rows(filler, rows):
+    """원천 데이터 앞 rows행 -> [(행 인덱스, 컨텍스트)]"""
+    source = open_row_source(filler.config, fields=filler.projected_fields())
+    return list(islice(enumerate(source.iter_rows()), rows))
+
+
+def bench_policy(filler, backend, policy, contexts, work_dir):
+    """한 백엔드/정책으로 모든 행 렌더링 -> (걸린 초, 파일 수, 전체 바이트)"""
+    render = filler.fill_workbook_ooxml if backend == "ooxml" else filler.fill_workbook_openpyxl
+    filler.zip_policy = policy
+    files = 0
+    total_bytes = 0
+    start = time.perf_counter()
+    # 행마다 출력하는 진행 메시지는 측정에서 제외
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index, context in contexts:
+            rendered = {}
+            for template_path, output_path in filler.get_row_outputs(context, index, work_dir):
+                render(template_path, context, output_path, rendered, save_pdf=False)
+                files += 1
+    elapsed = time.perf_counter() - start
+    for name in os.listdir(work_dir):
+        total_bytes += os.path.getsize(os.path.join(work_dir, name))
+    return elapsed, files, total_bytes
+
+
+def print_results(results):
+    print(f"\n{'백엔드':<9}{'압축 정책':<22}{'건/초':>8}{'행당 ms':>10}{'평균 KB':>10}")
+    print("-" * 59)
+    for result in results:
+        print(
+            f"{result['backend']:<9}{result['policy']:<22}{result['rows_per_sec']:>8.1f}"
+            f"{result['ms_per_row']:>10.1f}{result['avg_kb']:>10.1f}"
+        )
+
+
+def run_bench(filler, rows=20):
+    """bench 명령 - 결과 목록 반환 (행이 없으면 None)"""
+    contexts = load_rows(filler, rows)
+    if not contexts:
+        print("원천 데이터에 행이 없습니다.")
+        return None
+
+    capabilities = filler.detect_backends()
+    backends = [name for name in HEADLESS_BACKENDS if capabilities.get(name) is None]
+    print(f"벤치마크: {len(contexts)}행, 백엔드 {', '.join(backends)}")
+
+    # 템플릿 컴파일/zip 준비는 측정에서 제외
+    for template_path in filler.get_template_paths():
+        filler.templates.get(template_path).ooxml()
+
+    original_policy = filler.zip_policy
+    results = []
+    work_root = tempfile.mkdtemp(prefix="bench_")
+    try:
+        for backend in backends:
+            for level, store_media in BENCH_POLICIES:
+                policy = ZipPolicy(level, store_media)
+                work_dir = os.path.join(work_root, f"{backend}_{level}_{int(store_media)}")
+                os.makedirs(work_dir)
+                elapsed, files, total_bytes = bench_policy(filler, backend, policy, contexts, work_dir)
+                results.append({
+                    "backend": backend,
+                    "policy": policy.describe(),
+                    "zip_xml_level": level,
+                    "zip_store_media": store_media,
+                    "rows": len(contexts),
+                    "files": files,
+                    "rows_per_sec": len(contexts) / elapsed if elapsed else 0.0,
+                    "ms_per_row": elapsed * 1000 / len(contexts),
+                    "avg_kb": total_bytes / max(files, 1) / 1024,
+                })
+                shutil.rmtree(work_dir, ignore_errors=True)
+    finally:
+        filler.zip_policy = original_policy
+        shutil.rmtree(work_root, ignore_errors=True)
+
+    print_results(results)
+    print(f"\n현재 설정: {original_policy.describe()}")
+
+    report_dir = filler.get_report_dir()
+    os.makedirs(report_dir, exist_ok=True)
+    bench_path = os.path.join(report_dir, "bench.json")
+    with open(bench_path, "w", encoding="utf-8") as f:
+        json.dump({"compression": results}, f, ensure_ascii=False, indent=2)
+    print(f"벤치마크 결과 저장: {bench_path}")
+    return results
+
+
+@contextlib.contextmanager
+def quiet_output():
+    """행마다 출력하는 메시지를 버림 (작업자 프로세스도 물려받도록 파일 디스크립터 단위) -> 콘솔 파일 객체
+
+    버퍼에 모으면 그 자체가 행 수만큼 메모리를 차지하므로 버린다.
+    """
+    sys.stdout.flush()
+    saved = os.dup(1)
+    console = open(os.dup(saved), "w", encoding=sys.stdout.encoding or "utf-8")
+    try:
+        with open(os.devnull, "w") as devnull:
+            os.dup2(devnull.fileno(), 1)
+            with contextlib.redirect_stdout(devnull):
+                yield console
+    finally:
+        os.dup2(saved, 1)
+        os.close(saved)
+        console.close()
+
+
+def write_synthetic_rows(filler, rows, path):
+    """원천 데이터 앞 행을 반복해 rows행 CSV 작성 (파일명/키 필드에 번호를 붙여 서로 다르게)"""
+    # 조인은 합성 파일에 다시 적용되므로 기본 원천 데이터만 읽음
+    source = open_row_source(filler.config, path=filler.config["raw_data_file"])
+    columns = source.columns()
+    base = list(islice(source.iter_rows(), SYNTHETIC_BASE_ROWS))
+    if not base:
+        return False
+    unique_fields = set(filler.config.filename_fields)
+    unique_fields.add(filler.config.get("shard_key_field") or filler.config["photo_field"])
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for i in range(rows):
+            row = base[i % len(base)]
+            copy = i // len(base)
+            writer.writerow([
+                f"{row.get(column, '')}_{copy}" if copy and column in unique_fields else row.get(column, "")
+                for column in columns
+            ])
+    return True
+
+
+def run_synthetic(filler, rows):
+    """bench --synthetic 명령 - 합성 rows행 전체 실행 후 보고서의 memory 항목 반환"""
+    from excel_template_filler import ExcelTemplateFiller, FillerConfig
+
+    work_root = tempfile.mkdtemp(prefix="bench_synthetic_")
+    try:
+        data_path = os.path.join(work_root, "synthetic.csv")
+        if not write_synthetic_rows(filler, rows, data_path):
+            print("원천 데이터에 행이 없습니다.")
+            return None
+
+        raw = dict(filler.config)
+        raw.update({
+            "raw_data_file": data_path,
+            "raw_data_format": "csv",
+            "encoding": "utf-8",
+            "backend": "ooxml",
+            "save_pdf": False,
+            "pdf_bundle": False,
+            "catalog": False,
+            "output_dir": os.path.join(work_root, "output"),
+            "report_dir": os.path.join(work_root, "report"),
+            "memory_limit_mb": filler.config.get("memory_limit_mb") or SYNTHETIC_LIMIT_MB,
+        })
+        synthetic = ExcelTemplateFiller(config=FillerConfig(raw, path=filler.config.path))
+        limit = synthetic.config["memory_limit_mb"]
+        print(f"합성 배치: {rows}행, 메모리 상한 {limit}MB, 작업자 {synthetic.config.get('workers', 0)}개")
+
+        last = [0.0]
+
+        def progress(event):
+            # 행마다 출력하는 메시지는 숨기고 진행률만 간격을 두고 출력
+            if event["kind"] == "row" and time.perf_counter() - last[0] >= SYNTHETIC_PROGRESS_SEC:
+                last[0] = time.perf_counter()
+                print(f"  {event['done']}/{rows}행 ({event['rate']:.1f}건/초)", file=console, flush=True)
+
+        start = time.perf_counter()
+        with quiet_output() as console:
+            report = synthetic.process_all(events=progress)
+        elapsed = time.perf_counter() - start
+        if not report:
+            print("합성 배치 실행 실패")
+            return None
+
+        memory = report.get("memory", {})
+        print(f"\n완료: 성공 {report['success']}/{report['selected_rows']}행, {elapsed:.1f}초 "
+              f"({report['selected_rows'] / elapsed if elapsed else 0:.1f}건/초)")
+        if memory.get("rss_available", True):
+            print(f"최대 RSS: {memory.get('peak_mb')}MB / 상한 {limit}MB "
+                  f"(경고 {memory.get('warnings', 0)}회, 정리 {memory.get('relieved', 0)}회)")
+        else:
+            print(f"최대 RSS: 측정 불가 - {memory['note']}")
+        samples = memory.get("samples", [])
+        step = max(1, len(samples) // 10)
+        for done, rss_mb in samples[::step]:
+            print(f"  {done:>8}행  {rss_mb:>8.1f}MB")
+        workers = report.get("workers")
+        if workers:
+            print(f"작업자: 최대 RSS {workers['max_rss_mb']}MB, 축소 {workers['throttled']}회 "
+                  f"(최소 {workers['min_workers']}개), 교체 {workers['recycled']}회")
+        return memory
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
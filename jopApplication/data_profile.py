@@ -0,0 +1,181 @@
+"""
+원천 데이터 프로파일 - 렌더러가 보는 그대로(문자열) 앞 몇 행과 컬럼별 통계 출력
+
+- python excel_template_filler.py profile            (앞 5행 + 컬럼 통계)
+- python excel_template_filler.py profile --refresh  (저장된 통계를 무시하고 다시 계산)
+- python excel_template_filler.py sample             (같은 내용, 앞 3행)
+
+렌더링과 같은 행 공급자(row_sources.py)로 한 행씩 읽으면서 앞 행은 바로 출력하고,
+컬럼마다 채움률, 서로 다른 값 수, 최대 길이, 추정 날짜 형식을 한 번에 계산한다.
+결과는 원천 데이터 스냅샷(raw_snapshot.sqlite)에 함께 저장해 원천 파일이 바뀌기 전까지는
+바로 출력한다.
+"""
+
+import time
+import datetime
+
+from raw_snapshot import RawSnapshot
+from row_sources import open_row_source
+
+# 날짜 형식 후보 (date:/combine: 입력 형식으로 쓰는 형식)
+DATE_FORMATS = [
+    "%Y-%m-%d", "%Y.%m.%d", "%Y/%m/%d", "%Y%m%d", "%y.%m.%d", "%y-%m-%d",
+    "%Y-%m-%d %H:%M:%S", "%Y.%m", "%Y-%m", "%Y년 %m월 %d일",
+]
+# 날짜 형식 추정을 멈추는 기준: 이만큼의 값이 어느 형식에도 맞지 않으면 날짜 컬럼이 아님
+DATE_PROBE_VALUES = 50
+# 이 비율 이상의 값이 맞는 형식만 보고
+DATE_FORMAT_RATIO = 0.9
+# 컬럼별로 기억하는 서로 다른 값 수 상한 (자유 서술 컬럼의 메모리 제한)
+DISTINCT_LIMIT = 10000
+# 표에 보여 줄 값의 최대 길이
+HEAD_VALUE_WIDTH = 20
+
+
+def matching_formats(value, formats=DATE_FORMATS):
+    matched = []
+    for fmt in formats:
+        try:
+            datetime.datetime.strptime(value, fmt)
+            matched.append(fmt)
+        except ValueError:
+            pass
+    return tuple(matched)
+
+
+class ColumnStats:
+    """컬럼 하나의 한 번 훑기 통계"""
+
+    __slots__ = ("name", "filled", "max_length", "values", "overflow", "format_rows", "date_like", "probed")
+
+    def __init__(self, name):
+        self.name = name
+        self.filled = 0
+        self.max_length = 0
+        self.values = {}        # 값 -> 맞는 날짜 형식 (DISTINCT_LIMIT개까지)
+        self.overflow = False   # 서로 다른 값이 상한을 넘음
+        self.format_rows = {}   # 날짜 형식 -> 맞는 행 수
+        self.date_like = True
+        self.probed = 0
+
+    def add(self, value):
+        if not value:
+            return
+        self.filled += 1
+        if len(value) > self.max_length:
+            self.max_length = len(value)
+
+        formats = self.values.get(value)
+        if formats is None:
+            formats = ()
+            if self.date_like:
+                # 이미 맞았던 형식을 먼저 확인 (날짜 컬럼은 보통 형식 하나)
+                formats = matching_formats(value, self.format_rows) if self.format_rows else ()
+                if not formats:
+                    formats = matching_formats(value)
+                self.probed += 1
+                if not formats and not self.format_rows and self.probed >= DATE_PROBE_VALUES:
+                    self.date_like = False
+            if len(self.values) < DISTINCT_LIMIT:
+                self.values[value] = formats
+            else:
+                self.overflow = True
+        for fmt in formats:
+            self.format_rows[fmt] = self.format_rows.get(fmt, 0) + 1
+
+    def summary(self, rows):
+        date_formats = [
+            {"format": fmt, "rows": count, "ratio": round(count / self.filled, 4)}
+            for fmt, count in sorted(self.format_rows.items(), key=lambda item: -item[1])
+            if self.filled and count >= self.filled * DATE_FORMAT_RATIO
+        ]
+        return {
+            "name": self.name,
+            "filled": self.filled,
+            "fill_rate": round(self.filled / rows, 3) if rows else 0.0,
+            "distinct": len(self.values),
+            "distinct_overflow": self.overflow,
+            "max_length": self.max_length,
+            "date_formats": date_formats,
+        }
+
+
+def compute_profile(filler, head=5, on_head=None):
+    """원천 데이터를 한 번 읽어 앞 head행과 컬럼 통계 계산 (on_head: 앞 행을 다 읽었을 때 호출)"""
+    start = time.perf_counter()
+    source = open_row_source(filler.config)
+    columns = source.columns()
+    stats = {name: ColumnStats(name) for name in columns}
+    head_rows = []
+    rows = 0
+    for context in source.iter_rows():
+        rows += 1
+        if len(head_rows) < head:
+            head_rows.append({name: str(value) for name, value in context.items()})
+            if len(head_rows) == head and on_head:
+                on_head(head_rows)
+        for name, value in context.items():
+            column = stats.get(name)
+            if column is None:
+                # 1:N 조인처럼 헤더에 없던 컬럼
+                column = stats[name] = ColumnStats(name)
+            column.add(str(value))
+    if len(head_rows) < head and on_head:
+        on_head(head_rows)
+    return {
+        "source": source.describe(),
+        "rows": rows,
+        "head": head_rows,
+        "columns": [column.summary(rows) for column in stats.values()],
+        "elapsed_sec": round(time.perf_counter() - start, 3),
+    }
+
+
+def short(value):
+    text = str(value).replace("\n", "⏎")
+    return text if len(text) <= HEAD_VALUE_WIDTH else text[:HEAD_VALUE_WIDTH - 1] + "…"
+
+
+def print_head(head_rows):
+    if not head_rows:
+        print("(행 없음)")
+        return
+    print(f"\n상위 {len(head_rows)}행 (렌더러가 보는 값):")
+    for i, row in enumerate(head_rows, 1):
+        print(f"  [{i}] " + ", ".join(f"{name}={short(value)}" for name, value in row.items()))
+
+
+def print_columns(profile):
+    print(f"\n컬럼 통계 ({profile['rows']}행, {len(profile['columns'])}개 컬럼):")
+    width = max([len(column["name"]) for column in profile["columns"]] + [4])
+    print(f"  {'컬럼':<{width}}  {'채움률':>7}  {'고유값':>7}  {'최대 길이':>8}  날짜 형식")
+    for column in profile["columns"]:
+        distinct = f"{column['distinct']}+" if column["distinct_overflow"] else str(column["distinct"])
+        formats = ", ".join(
+            item["format"] + (f" ({item['ratio'] * 100:.2f}%)" if item["rows"] < column["filled"] else "")
+            for item in column["date_formats"]
+        )
+        print(f"  {column['name']:<{width}}  {column['fill_rate'] * 100:>6.1f}%  {distinct:>7}  "
+              f"{column['max_length']:>8}  {formats or '-'}")
+
+
+def run_profile(filler, head=5, refresh=False):
+    """profile 명령 - 저장된 통계가 최신이면 바로 출력, 아니면 계산 후 저장"""
+    snapshot = RawSnapshot(filler)
+    try:
+        signature = snapshot.signature(all_columns=True)
+        profile = None if refresh else snapshot.load_profile(signature)
+        if profile is not None and len(profile["head"]) >= min(head, profile["rows"]):
+            print(f"원천 데이터 프로파일: {profile['source']} (저장된 통계)")
+            print_head(profile["head"][:head])
+            print_columns(profile)
+            return profile
+
+        print(f"원천 데이터 프로파일: {filler.config['raw_data_file']}")
+        profile = compute_profile(filler, head, on_head=print_head)
+        print_columns(profile)
+        print(f"\n계산 {profile['elapsed_sec']}초")
+        snapshot.save_profile(signature, profile)
+        return profile
+    finally:
+        snapshot.close()
@@ -0,0 +1,317 @@
+"""
+데이터 품질 사전 검사 - 렌더링 전에 원천 데이터를 컬럼 단위로 훑어 문제 행 목록 만들기
+
+렌더링 도중 '날짜 변환 실패' 등이 한 건씩 출력될 때는 이미 잘못된 지원서가 만들어진 뒤이므로,
+템플릿이 쓰는 변환을 기준으로 미리 검사한다.
+- date:/combine: 날짜 필드가 선언한 입력 형식으로 읽히는지 (combine은 두 필드 모두)
+- digits: 숫자 자릿수가 그럴듯한지 (data_quality_lengths 설정, 없으면 열의 주요 자릿수로 판단)
+- zfill:N: 값이 N자보다 길지 않은지
+- split_line:N: 여러 줄 필드에 N+1줄 이상 있는지
+
+행을 한 번 읽어 필드마다 값 -> 행 번호 목록으로 묶은 뒤, 서로 다른 값마다 한 번씩만
+변환/검사하고 결과를 해당 행 전체에 적용한다 (5만 행도 몇 초 안에 끝남).
+빈 값은 렌더링 결과도 빈 칸이므로 검사하지 않는다.
+
+config.json의 data_quality: warn(보고 후 계속), fail(문제가 있으면 렌더링 시작 안 함), off
+결과: report_dir/data_quality.json (행별 문제 목록)
+- --shard i/N 실행은 그 샤드 몫의 행만 검사해 data_quality_shard-i-of-N.json에 저장하고,
+  merge 명령이 샤드별 파일을 data_quality.json 하나로 합친다 (merge_data_quality)
+"""
+
+import os
+import re
+import json
+import time
+import datetime
+import tempfile
+from pathlib import Path
+from collections import OrderedDict
+
+from openpyxl.utils import get_column_letter
+
+from excel_template_filler import compile_pipe
+
+# 자릿수를 추정할 때 이 비율 이상을 차지하는 자릿수만 정상으로 봄
+COMMON_LENGTH_RATIO = 0.05
+# 콘솔에 보여 줄 문제 행 수
+SHOWN_ROWS = 20
+
+
+def collect_rules(filler):
+    """템플릿 플레이스홀더의 (필드, 파이프) -> 참조 위치 목록 (변환이 있는 것만)"""
+    placements = OrderedDict()
+    for template_path in filler.get_template_paths():
+        template = filler.templates.get(template_path)
+        name = os.path.basename(template_path)
+        for sheet_name, row, col, _, segments in template.cells:
+            for seg in segments:
+                if isinstance(seg, tuple) and seg[1]:
+                    placements.setdefault(seg, []).append(f"{name}:{sheet_name}!{get_column_letter(col)}{row}")
+
+    # combine의 세 번째 인자가 변환이면 다른 필드에도 그 변환이 적용됨
+    for (field, pipe), places in list(placements.items()):
+        for name, param, error in compile_pipe(pipe):
+            if name == "combine" and not error and param[2] and param[2][0] == "pipe":
+                placements.setdefault((param[0], param[2][1]), []).extend(places)
+    return placements
+
+
+def rule_fields(placements):
+    """검사에 필요한 필드 (combine의 다른 필드 포함)"""
+    fields = []
+    for field, pipe in placements:
+        fields.append(field)
+        for name, param, error in compile_pipe(pipe):
+            if name == "combine" and not error:
+                fields.append(param[0])
+    return list(OrderedDict.fromkeys(fields))
+
+
+def parses(value, fmt):
+    try:
+        datetime.datetime.strptime(value, fmt)
+        return True
+    except ValueError:
+        return False
+
+
+def check_dates(values, fmt, label):
+    """형식에 맞지 않는 값 -> {원래 값: 문제}"""
+    return {
+        raw: f"날짜 형식 불일치 ({label}: 입력 형식 {fmt})"
+        for raw, value in values.items() if value and not parses(value, fmt)
+    }
+
+
+def common_lengths(values, weights):
+    """값 목록의 숫자 자릿수 중 COMMON_LENGTH_RATIO 이상을 차지하는 자릿수"""
+    counts = {}
+    for raw, value in values.items():
+        if value:
+            counts[len(value)] = counts.get(len(value), 0) + weights[raw]
+    total = sum(counts.values())
+    return {length for length, count in counts.items() if count >= total * COMMON_LENGTH_RATIO}
+
+
+def check_step(name, param, field, current, weights, lengths):
+    """변환 단계 하나의 입력 값 검사 -> {원래 값: 문제}"""
+    bad = {}
+    if name == "date":
+        bad = check_dates(current, param[0], "date")
+    elif name == "combine" and param[2] and param[2][0] == "date":
+        bad = check_dates(current, param[2][1][0], f"combine:{param[0]}")
+    elif name == "zfill":
+        for raw, value in current.items():
+            if len(value) > param:
+                bad[raw] = f"{len(value)}자로 zfill:{param}보다 김"
+    elif name == "digits":
+        digits = {raw: re.sub(r"\D+", "", value) for raw, value in current.items() if value}
+        if field in lengths:
+            low, high = lengths[field]
+            allowed = set(range(low, high + 1))
+        else:
+            allowed = common_lengths(digits, weights)
+        expected = "/".join(str(n) for n in sorted(allowed))
+        for raw, value in digits.items():
+            if not value:
+                bad[raw] = "숫자 없음 (digits)"
+            elif len(value) not in allowed:
+                bad[raw] = f"숫자 {len(value)}자리 (digits, 보통 {expected}자리)"
+    elif name == "split_line":
+        for raw, value in current.items():
+            if not value:
+                continue
+            lines = value.replace("\r\n", "\n").count("\n") + 1
+            if lines <= param:
+                bad[raw] = f"{lines}줄 (split_line:{param}에는 {param + 1}줄 이상 필요)"
+    return bad
+
+
+def analyze_rule(filler, field, pipe, columns, lengths):
+    """(필드, 파이프) 하나 검사 -> [(필드, 원래 값, 변환, 문제)]
+
+    앞 단계 변환을 서로 다른 값마다 적용해 가며 각 단계의 입력 값을 검사한다.
+    combine 이후 단계는 다른 필드 값에 따라 달라지므로 검사하지 않는다.
+    """
+    values = columns[field]
+    weights = {raw: len(rows) for raw, rows in values.items()}
+    current = {raw: raw for raw in values}
+    findings = []
+    for name, param, error in compile_pipe(pipe):
+        if error:
+            continue
+        bad = check_step(name, param, field, current, weights, lengths)
+        for raw, problem in bad.items():
+            findings.append((field, raw, name, problem))
+        if name == "combine":
+            other_field, _, third = param
+            if third and third[0] == "date":
+                for raw, problem in check_dates(
+                    {raw: raw for raw in columns[other_field]}, third[1][0], f"combine:{other_field}"
+                ).items():
+                    findings.append((other_field, raw, name, problem))
+            break
+        # 렌더링과 같은 변환 코드로 다음 단계 입력 값 계산
+        # (문제를 보고한 값은 더 검사하지 않음 - 변환 실패 경고는 렌더링할 때만 출력)
+        current = {raw: filler.apply_step(value, name, param) for raw, value in current.items() if raw not in bad}
+    return findings
+
+
+def result_path(report_dir, shard=None):
+    """검사 결과 파일 경로 (샤드 실행은 write_run_report와 같은 접미사)"""
+    suffix = f"_shard-{shard[0]}-of-{shard[1]}" if shard else ""
+    return os.path.join(report_dir, f"data_quality{suffix}.json")
+
+
+def save_result(result, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    result["file"] = os.path.abspath(path)
+
+
+class QualityCheck:
+    """행을 하나씩 받아(add) 필드마다 {값: [행 인덱스]}로 묶고, finish에서 값마다 검사
+
+    process_all은 출력 경로 충돌 검사와 같은 순회에서 add를 호출해 원천 데이터를 한 번만 읽는다.
+    보고서에만 쓰는 행별 키/이름은 임시 파일에 적어 두고 문제가 있는 행만 다시 읽는다
+    (메모리에 남는 것은 검사 필드의 값 색인뿐 - 서로 다른 값 수와 필드당 행 번호 목록에 비례).
+    """
+
+    def __init__(self, filler):
+        self.filler = filler
+        self.start = time.perf_counter()
+        self.placements = collect_rules(filler)
+        self.columns = {field: {} for field in rule_fields(self.placements)}
+        self.rows = 0
+        report_dir = filler.get_report_dir()
+        os.makedirs(report_dir, exist_ok=True)
+        # 닫으면 자동 삭제되는 임시 파일 (한 줄에 [행 인덱스, 키, 이름])
+        self.labels = tempfile.TemporaryFile(
+            "w+", encoding="utf-8", dir=report_dir, prefix="quality_", suffix=".jsonl"
+        )
+
+    def add(self, index, context):
+        self.rows += 1
+        key = self.filler.get_shard_key(context, index)
+        self.labels.write(json.dumps([index, key, str(context.get("이름", ""))], ensure_ascii=False) + "\n")
+        for field, values in self.columns.items():
+            value = context.get(field, "")
+            value = "" if value is None else str(value).strip()
+            rows_of_value = values.get(value)
+            if rows_of_value is None:
+                values[value] = [index]
+            else:
+                rows_of_value.append(index)
+
+    def row_labels(self, indexes):
+        """문제가 있는 행의 {행 인덱스: (키, 이름)} (임시 파일을 한 번 훑음)"""
+        labels = {}
+        self.labels.seek(0)
+        for line in self.labels:
+            index, key, name = json.loads(line)
+            if index in indexes:
+                labels[index] = (key, name)
+        self.labels.close()
+        return labels
+
+    def finish(self, verbose=True, shard=None):
+        """검사 결과 dict (report_dir/data_quality.json 또는 샤드별 파일에도 저장)
+
+        shard: (i, N)이면 add로 받은 행은 그 샤드 몫이고 결과는 샤드별 파일에 저장
+        """
+        filler, columns = self.filler, self.columns
+        lengths = filler.config.get("data_quality_lengths", {})
+
+        row_issues = {}
+        counts = OrderedDict()
+        for (field, pipe), places in self.placements.items():
+            where = places[0] + (f" 외 {len(places) - 1}곳" if len(places) > 1 else "")
+            for issue_field, raw, step, problem in analyze_rule(filler, field, pipe, columns, lengths):
+                rows_of_value = columns[issue_field][raw]
+                counts[(issue_field, step)] = counts.get((issue_field, step), 0) + len(rows_of_value)
+                issue = {"field": issue_field, "value": raw, "problem": problem, "where": where}
+                for index in rows_of_value:
+                    row_issues.setdefault(index, []).append(issue)
+
+        labels = self.row_labels(row_issues)
+        result = {
+            "shard": list(shard) if shard else None,
+            "rows": self.rows,
+            "rows_with_issues": len(row_issues),
+            "issues": sum(len(issues) for issues in row_issues.values()),
+            "elapsed_sec": round(time.perf_counter() - self.start, 3),
+            "by_check": [
+                {"field": field, "check": step, "rows": count} for (field, step), count in counts.items()
+            ],
+            "row_issues": [
+                {"row": index + 1, "key": labels[index][0], "name": labels[index][1], "issues": row_issues[index]}
+                for index in sorted(row_issues)
+            ],
+        }
+
+        save_result(result, result_path(filler.get_report_dir(), shard))
+
+        if verbose:
+            print_result(result)
+        return result
+
+
+def check_data_quality(filler, rows, verbose=True, shard=None):
+    """rows: (행 인덱스, 컨텍스트) 반복자 -> 검사 결과 dict (QualityCheck.finish 참고)"""
+    check = QualityCheck(filler)
+    for index, context in rows:
+        check.add(index, context)
+    return check.finish(verbose, shard)
+
+
+def merge_data_quality(report_dir, shard_count):
+    """샤드별 검사 결과(N이 shard_count인 것)를 data_quality.json 하나로 합치기 -> 결과 (파일이 없으면 None)"""
+    files = sorted(Path(report_dir).glob(f"data_quality_shard-*-of-{shard_count}.json"))
+    if not files:
+        return None
+
+    shards = []
+    counts = OrderedDict()
+    row_issues = []
+    totals = {"rows": 0, "rows_with_issues": 0, "issues": 0}
+    elapsed = 0.0
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            part = json.load(f)
+        shards.append(part["shard"][0])
+        for key in totals:
+            totals[key] += part[key]
+        elapsed = max(elapsed, part["elapsed_sec"])
+        for item in part["by_check"]:
+            key = (item["field"], item["check"])
+            counts[key] = counts.get(key, 0) + item["rows"]
+        row_issues.extend(part["row_issues"])
+
+    result = {
+        "shard": None,
+        "shards": sorted(shards),
+        **totals,
+        "elapsed_sec": elapsed,
+        "by_check": [{"field": field, "check": step, "rows": count} for (field, step), count in counts.items()],
+        "row_issues": sorted(row_issues, key=lambda entry: entry["row"]),
+    }
+    save_result(result, result_path(report_dir))
+    return result
+
+
+def print_result(result):
+    if not result["rows_with_issues"]:
+        print(f"데이터 품질 검사 통과: {result['rows']}행 ({result['elapsed_sec']}초)")
+        return
+    print(f"데이터 품질 문제: {result['rows_with_issues']}/{result['rows']}행, "
+          f"{result['issues']}건 ({result['elapsed_sec']}초)")
+    for item in result["by_check"]:
+        print(f"  - {item['field']} ({item['check']}): {item['rows']}행")
+    for entry in result["row_issues"][:SHOWN_ROWS]:
+        for issue in entry["issues"]:
+            value = issue["value"].replace("\n", "⏎")
+            print(f"  행 {entry['row']} {entry['name']} ({entry['key']}): "
+                  f"{issue['field']} '{value}' - {issue['problem']} [{issue['where']}]")
+    if result["rows_with_issues"] > SHOWN_ROWS:
+        print(f"  ... 외 {result['rows_with_issues'] - SHOWN_ROWS}행")
+    print(f"  전체 목록: {result['file']}")
@@ -4,10 +4,56 @@ Raw 데이터 엑셀 파일의 각 행을 읽어서 템플릿에 자동으로 
 
 사용법:
 1. templates/ 폴더에 플레이스홀더가 포함된 템플릿 파일 배치
-2. raw_data/ 폴더에 원천 데이터 엑셀 파일 배치  
+2. raw_data/ 폴더에 원천 데이터 파일 배치 (엑셀, CSV, JSON Lines, SQLite - row_sources.py 참고)
 3. config.json에서 매핑 설정
 4. python excel_template_filler.py 실행
 
+분산 실행 (여러 PC/프로세스에서 나눠 처리):
+- python excel_template_filler.py --shard 1/3  (각 호스트에서 1/3, 2/3, 3/3 실행)
+- python excel_template_filler.py merge  (샤드별 실행 보고서/매니페스트 병합)
+
+출력 찾기 (실행마다 출력 카탈로그 기록, output_catalog.py 참고):
+- python excel_template_filler.py find 홍길동 --open  (지원자 파일 바로 열기)
+
+감시 모드:
+- python excel_template_filler.py watch  (원천 데이터/사진/템플릿/설정 변경 시 바뀐 지원자만 재생성)
+
+렌더링 서비스:
+- python excel_template_filler.py serve  (POST /render 로 JSON 컨텍스트를 받아 .xlsx 반환, render_service.py 참고)
+
+병렬 처리 (감시되는 작업 프로세스, render_workers.py 참고):
+- config.json의 workers를 1 이상으로 설정하면 작업 프로세스에서 렌더링
+- row_timeout 초를 넘긴 행은 작업자를 강제 종료하고 실패로 기록, 배치는 계속 진행
+
+렌더링 백엔드 (config.json의 backend, 실행 시작 시 한 번 확인하고 선택 결과/손실 항목을 출력):
+- auto: Excel이 있으면 xlwings, 없으면 ooxml
+- xlwings: Excel로 직접 편집 (사진 삽입, PDF 저장)
+- ooxml: 시트 XML만 직접 수정 (Excel 불필요, 템플릿 이미지/서식 유지, ooxml_writer.py 참고)
+- openpyxl: openpyxl로 저장 (템플릿 이미지 손실 가능)
+
+묶음 PDF (pdf_bundle.py 참고):
+- config.json의 pdf_bundle을 true로 하면 PDF가 만들어지는 대로 한 파일에 이어 붙임 (지원자별 책갈피)
+- pdf_bundle_group_field로 공고/직무 등 필드 값마다 나눠서 생성
+
+압축 정책 (zip_policy.py 참고):
+- config.json의 zip_xml_level(0-9)과 zip_store_media로 .xlsx 저장 속도와 크기 조절
+- python excel_template_filler.py bench 20  (20행으로 백엔드/압축 수준별 속도와 파일 크기 비교)
+
+대량 배치 메모리 (memory_guard.py 참고):
+- config.json의 memory_sample_rows마다 RSS를 실행 보고서(memory)에 기록
+- memory_limit_mb를 설정하면 매니페스트/충돌 검사 색인을 임시 파일에 두고, 상한 근처에서 캐시 정리/작업자 축소
+- python excel_template_filler.py bench --synthetic 100000  (합성 10만 행으로 최대 RSS 확인)
+
+원천 데이터 확인 (data_profile.py 참고):
+- python excel_template_filler.py profile  (앞 5행 + 컬럼별 채움률/고유값 수/최대 길이/날짜 형식, 결과는 캐시)
+
+미리보기 (preview.py 참고):
+- python excel_template_filler.py preview 12  (12번째 행 또는 키가 12인 지원자를 임시 폴더에 렌더링 후 열기)
+
+사전 검사:
+- python excel_template_filler.py check  (렌더링 없이 필드/변환 검사, 문제가 있으면 종료 코드 1)
+- 데이터 품질 검사(data_quality.py)로 날짜 형식/자릿수/줄 수가 맞지 않는 행을 렌더링 전에 보고
+
 플레이스홀더 문법:
 - 기본: {{필드명}}
 - 변환: {{필드명|변환1|변환2:인자}}
@@ -20,77 +66,679 @@ Raw 데이터 엑셀 파일의 각 행을 읽어서 템플릿에 자동으로 
 - date:입력포맷->출력포맷: 날짜 형식 변환
 - map:키=값,키=값: 값 매핑 (성별 등)
 - default:기본값: 빈 값일 때 기본값 사용
+
+보조 시트 조인:
+- config.json의 joins로 경력/자격증/점수 시트를 수험번호 등 키로 붙임
+- 1:1은 '{{시험.점수}}', 1:N은 '{{경력[0].회사}}', '{{경력.건수}}' 형태로 사용
+
+템플릿 선택:
+- config.json의 template_rules로 필드 값(공고, 직무 등)에 따라 행별 템플릿을 1개 이상 지정
+- 일치하는 규칙이 없으면 template_file 사용
 """
 
+import io
 import os
 import re
+import sys
 import json
+import time
+import zlib
+import socket
+import hashlib
+import string
 import datetime
-import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.drawing.image import Image
+import functools
+import gc
+import threading
+from collections import OrderedDict
 from pathlib import Path
 import shutil
-from copy import deepcopy
-import xlwings as xw
+
+from row_sources import open_row_source, row_fingerprint
+from zip_policy import ZipPolicy, save_workbook
+from memory_guard import MemoryGuard, ManifestSpool
+
+# pandas / openpyxl / xlwings / PIL 은 실제로 필요한 단계에서만 임포트 (시작 속도, Excel 없는 환경 대응)
+
+
+# 설정 기본값 테이블: 키 -> (기본값, 허용 타입, 설명)
+CONFIG_DEFAULTS = {
+    "template_file": ("../templates/application_template.xlsx", str, "템플릿 파일"),
+    "raw_data_file": ("../raw_data/applicants.xlsx", str, "원천 데이터 파일"),
+    "raw_data_sheet": ("공고별 지원자 관리", str, "원천 데이터 시트 이름 (SQLite는 테이블 이름)"),
+    "raw_data_format": ("", str, "원천 데이터 형식: excel/csv/jsonl/sqlite (비어 있으면 확장자로 판단)"),
+    "raw_data_query": ("", str, "SQLite 조회 SQL (비어 있으면 raw_data_sheet 테이블 전체)"),
+    "column_projection": (True, bool, "템플릿/설정이 참조하는 컬럼만 로드 (false면 전체 컬럼)"),
+    "joins": ([], list, "키로 붙일 보조 시트 (경력/자격증 등, row_sources.JoinedRowSource 참고)"),
+    "output_dir": ("../output", str, "출력 폴더"),
+    "filename_pattern": ("{이름}_입사지원서.xlsx", str, "출력 파일명 패턴"),
+    "save_pdf": (True, bool, "PDF 저장 여부"),
+    # 묶음 PDF (pdf_bundle.py)
+    "pdf_bundle": (False, bool, "생성된 PDF를 지원자별 책갈피가 있는 묶음 PDF로 합치기 (pypdf 필요)"),
+    "pdf_bundle_file": ("지원서_묶음.pdf", str, "묶음 PDF 파일명 (output_dir 기준)"),
+    "pdf_bundle_group_field": ("", str, "묶음 PDF를 나눌 기준 필드 (예: 공고, 비어 있으면 하나로)"),
+    "encoding": ("utf-8", str, "텍스트 인코딩"),
+    # 지원자 사진 관련 설정
+    "images_dir": ("../images", str, "지원자 사진 폴더"),
+    "photo_field": ("수험번호", str, "사진 파일명의 기준 필드"),
+    "photo_extensions": ([".png", ".jpg", ".jpeg"], list, "지원 이미지 형식"),
+    "photo_placeholder": ("{{사진}}", str, "템플릿에서 사진 위치 지정"),
+    "photo_width": (121, int, "사진 너비 (픽셀) - 열너비 17.25 * 7"),
+    "photo_height": (156, int, "사진 높이 (픽셀) - 행높이와 동일"),
+    # 분산 실행(샤드) 관련 설정
+    "shard_key_field": ("", str, "샤드 분배 기준 필드 (비어 있으면 photo_field 사용)"),
+    "report_dir": ("", str, "실행 보고서/매니페스트 폴더 (비어 있으면 output_dir/_runs)"),
+    "collision_policy": ("suffix", str, "출력 경로 충돌/키 중복 처리: suffix(뒤 행 파일명에 _2 등), skip(뒤 행 건너뛰기), fail(렌더링 시작 안 함)"),
+    # 출력 카탈로그 (output_catalog.py)
+    "catalog": (True, bool, "실행마다 지원자별 출력 파일을 카탈로그에 기록 (find 명령, GUI 찾기)"),
+    "catalog_file": ("", str, "카탈로그 SQLite 파일 (비어 있으면 report_dir/catalog.sqlite)"),
+    # 템플릿 선택 규칙 / 캐시
+    "template_rules": ([], list, "필드 값에 따라 행별 템플릿 선택 (첫 번째로 일치하는 규칙 사용)"),
+    "template_cache_size": (8, int, "컴파일된 템플릿을 메모리에 유지할 최대 개수"),
+    "preflight": (True, bool, "렌더링 전 템플릿/데이터 필드 검사 (실패 시 시작하지 않음)"),
+    # 데이터 품질 사전 검사 (data_quality.py)
+    "data_quality": ("warn", str, "렌더링 전 날짜/자릿수/줄 수 검사: warn(문제 행 보고 후 계속), fail(문제가 있으면 시작 안 함), off"),
+    "data_quality_lengths": ({}, dict, "digits 필드별 허용 자릿수 (예: {\"연락처\": [10, 11]}, 없으면 열의 주요 자릿수로 판단)"),
+    "backend": ("auto", str, "렌더링 백엔드: auto/xlwings/openpyxl/ooxml (auto는 Excel이 있으면 xlwings, 없으면 ooxml)"),
+    # .xlsx zip 압축 정책 (ooxml/openpyxl 백엔드, zip_policy.py)
+    "zip_xml_level": (6, int, "XML 항목 압축 수준 0-9 (0은 압축 안 함, 낮을수록 빠르고 파일이 큼)"),
+    "zip_store_media": (True, bool, "이미 압축된 이미지(PNG/JPEG 등)는 다시 압축하지 않고 저장"),
+    # 감시되는 작업 프로세스 (render_workers.py)
+    "workers": (0, int, "렌더링 작업 프로세스 수 (0이면 현재 프로세스에서 차례로 처리)"),
+    "row_timeout": (300.0, float, "행 하나의 최대 처리 시간 (초, 초과 시 작업자 강제 종료 후 실패 처리, 0이면 제한 없음)"),
+    "worker_max_rows": (200, int, "작업자 하나가 처리할 최대 행 수 (초과 시 새 작업자로 교체, 0이면 제한 없음)"),
+    "worker_max_memory_mb": (1024, int, "작업자 메모리(RSS) 상한 MB (초과 시 새 작업자로 교체, 0이면 제한 없음)"),
+    # 메모리 상한 실행 (memory_guard.py)
+    "memory_limit_mb": (0, int, "전체 메모리 상한 MB (0이면 없음) - 설정하면 매니페스트/충돌 검사 색인을 파일로 내보내고 상한 근처에서 캐시 정리/작업자 축소"),
+    "memory_sample_rows": (100, int, "N행마다 메모리(RSS)를 실행 보고서에 기록 (0이면 기록 안 함)"),
+    # 로컬 렌더링 서비스 (serve 명령)
+    "service_host": ("127.0.0.1", str, "렌더링 서비스 주소 (기본: 로컬 전용)"),
+    "service_port": (8765, int, "렌더링 서비스 포트"),
+    # watch 모드
+    "watch_interval": (1.0, float, "watch 모드 변경 확인 주기 (초)"),
+    "watch_debounce": (2.0, float, "마지막 변경 후 이 시간(초) 동안 조용하면 재생성 (연속 저장 묶기)"),
+}
+
+
+# 렌더링 백엔드별로 잃는 것 (실행 시작 시 한 번 보고)
+BACKEND_FIDELITY = {
+    "xlwings": "손실 없음 (Excel로 직접 편집, 사진 삽입/PDF 저장 가능)",
+    "ooxml": "지원자 사진 미삽입, 플레이스홀더 셀의 부분 서식 단순화 (템플릿 이미지/도형/서식은 그대로 유지)",
+    "openpyxl": "템플릿 이미지/도형/차트 손실 가능, 지원자 사진 미삽입, 일부 서식 손실",
+}
+# auto 선택 순서
+BACKEND_PREFERENCE = ["xlwings", "ooxml", "openpyxl"]
+
+
+class ConfigError(ValueError):
+    """설정 파일 검증 실패"""
+
+
+class FillerConfig(dict):
+    """검증된 설정 객체 (dict 호환 + 속성 접근)
+
+    CONFIG_DEFAULTS 테이블로 기본값을 병합하고 타입을 검증한 뒤,
+    자주 쓰는 파생 값(파일명 패턴 필드 등)을 미리 계산해 둔다.
+    """
+
+    def __init__(self, raw=None, path=None):
+        super().__init__()
+        self.path = path
+        raw = dict(raw or {})
+        problems = []
+
+        for key, (default, expected, _) in CONFIG_DEFAULTS.items():
+            value = raw.pop(key, deepcopy_default(default))
+            # bool은 int의 하위 타입이므로 별도로 구분
+            if expected is int and (isinstance(value, bool) or not isinstance(value, int)):
+                problems.append(f"{key}: 정수가 필요합니다 (현재: {value!r})")
+            elif expected is float and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                problems.append(f"{key}: 숫자가 필요합니다 (현재: {value!r})")
+            elif expected not in (int, float) and not isinstance(value, expected):
+                problems.append(f"{key}: {expected.__name__} 타입이 필요합니다 (현재: {value!r})")
+            self[key] = value
+
+        # 테이블에 없는 키는 그대로 보존 (하위 호환)
+        self.update(raw)
+
+        if not problems:
+            problems.extend(self.validate())
+        if problems:
+            raise ConfigError("설정 파일 오류:\n  - " + "\n  - ".join(problems))
+
+        # 미리 계산해 두는 파생 값
+        self.filename_fields = [
+            name for _, name, _, _ in string.Formatter().parse(self["filename_pattern"]) if name
+        ]
+        self.photo_extensions = tuple(ext.lower() for ext in self["photo_extensions"])
+
+    def validate(self):
+        """값 범위 검증 - 문제 목록 반환"""
+        problems = []
+        if self["photo_width"] <= 0 or self["photo_height"] <= 0:
+            problems.append("photo_width/photo_height는 0보다 커야 합니다")
+        if not all(isinstance(ext, str) and ext.startswith(".") for ext in self["photo_extensions"]):
+            problems.append("photo_extensions는 '.png' 형식의 문자열 목록이어야 합니다")
+        for i, rule in enumerate(self["template_rules"]):
+            if not isinstance(rule, dict) or not isinstance(rule.get("when", {}), dict):
+                problems.append(f"template_rules[{i}]: 'when'은 {{필드: 값}} 형식이어야 합니다")
+                continue
+            templates = rule.get("templates")
+            if not isinstance(templates, list) or not templates:
+                problems.append(f"template_rules[{i}]: 'templates' 목록이 필요합니다")
+                continue
+            for spec in templates:
+                if not (isinstance(spec, str) or (isinstance(spec, dict) and isinstance(spec.get("file"), str))):
+                    problems.append(f"template_rules[{i}]: 템플릿은 경로 문자열 또는 {{\"file\": 경로}} 형식이어야 합니다")
+        for i, join in enumerate(self["joins"]):
+            if not isinstance(join, dict) or not isinstance(join.get("sheet"), str):
+                problems.append(f"joins[{i}]: {{\"sheet\": 시트 이름, \"key\": 키 컬럼}} 형식이어야 합니다")
+        if self["watch_interval"] <= 0 or self["watch_debounce"] < 0:
+            problems.append("watch_interval은 0보다 크고 watch_debounce는 0 이상이어야 합니다")
+        if self["workers"] < 0 or self["worker_max_rows"] < 0 or self["worker_max_memory_mb"] < 0:
+            problems.append("workers/worker_max_rows/worker_max_memory_mb는 0 이상이어야 합니다")
+        if self["memory_limit_mb"] < 0 or self["memory_sample_rows"] < 0:
+            problems.append("memory_limit_mb/memory_sample_rows는 0 이상이어야 합니다")
+        if self["row_timeout"] < 0:
+            problems.append("row_timeout은 0 이상이어야 합니다")
+        if self["data_quality"] not in ("warn", "fail", "off"):
+            problems.append(f"data_quality는 warn/fail/off 중 하나여야 합니다 (현재: {self['data_quality']!r})")
+        for field, bounds in self["data_quality_lengths"].items():
+            if not (isinstance(bounds, list) and len(bounds) == 2 and all(isinstance(n, int) for n in bounds)):
+                problems.append(f"data_quality_lengths.{field}: [최소, 최대] 자릿수 형식이어야 합니다")
+        if self["collision_policy"] not in ("suffix", "skip", "fail"):
+            problems.append(f"collision_policy는 suffix/skip/fail 중 하나여야 합니다 (현재: {self['collision_policy']!r})")
+        if self["backend"] != "auto" and self["backend"] not in BACKEND_FIDELITY:
+            problems.append(f"backend는 auto/{'/'.join(BACKEND_FIDELITY)} 중 하나여야 합니다 (현재: {self['backend']!r})")
+        if not 0 <= self["zip_xml_level"] <= 9:
+            problems.append(f"zip_xml_level은 0~9 사이여야 합니다 (현재: {self['zip_xml_level']})")
+        if self["template_cache_size"] < 1:
+            problems.append("template_cache_size는 1 이상이어야 합니다")
+        try:
+            list(string.Formatter().parse(self["filename_pattern"]))
+        except ValueError as e:
+            problems.append(f"filename_pattern 형식 오류: {e}")
+        return problems
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    @classmethod
+    def defaults(cls):
+        """기본 설정 (설정 파일 생성용 일반 dict)"""
+        return {key: deepcopy_default(default) for key, (default, _, _) in CONFIG_DEFAULTS.items()}
+
+
+def deepcopy_default(value):
+    """기본값 테이블의 list/dict가 공유되지 않도록 복사"""
+    if isinstance(value, (list, dict)):
+        return json.loads(json.dumps(value))
+    return value
+
+
+# 경로별로 한 번만 만들고 공유하는 설정 객체 (파일 수정 시각이 바뀌면 다시 로드)
+_CONFIG_CACHE = {}
+
+
+def load_config(config_path="config.json"):
+    """설정 파일 로드 (없으면 기본 설정 파일 생성) - 검증된 FillerConfig 반환"""
+    if not os.path.exists(config_path):
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump(FillerConfig.defaults(), f, ensure_ascii=False, indent=2)
+        print(f"기본 설정 파일을 생성했습니다: {config_path}")
+
+    cache_key = os.path.abspath(config_path)
+    mtime = os.path.getmtime(config_path)
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+    config = FillerConfig(raw, path=cache_key)
+    _CONFIG_CACHE[cache_key] = (mtime, config)
+    return config
+
+
+def is_missing(value):
+    """None / NaN / pandas NA 여부 (pandas 임포트 없이 판단)"""
+    if value is None:
+        return True
+    if isinstance(value, float):
+        return value != value
+    return type(value).__name__ in ("NAType", "NaTType")
+
+
+# 인자 없는 변환 / 인자(변환:인자)가 필요한 변환
+SIMPLE_TRANSFORMS = ("trim", "upper", "lower", "digits", "extract_age")
+ARG_TRANSFORMS = ("zfill", "date", "map", "default", "prefix", "suffix", "split_line", "combine")
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*([^}|]+)\s*(\|[^}]*)?\}\}")
+
+
+def compile_step(step):
+    """변환 한 단계를 (이름, 미리 해석한 인자, 오류 메시지) 튜플로 변환"""
+    name, sep, arg = step.partition(":")
+    if not sep:
+        if name in SIMPLE_TRANSFORMS:
+            return (name, None, None)
+        if name in ARG_TRANSFORMS:
+            return (name, None, f"'{name}' 변환에는 인자가 필요합니다 ({name}:...)")
+        return (name, None, f"알 수 없는 변환: {name}")
+
+    if name in SIMPLE_TRANSFORMS:
+        return (name, None, f"'{name}' 변환은 인자를 받지 않습니다: {step}")
+    if name not in ARG_TRANSFORMS:
+        return (name, None, f"알 수 없는 변환: {name}")
+
+    if name in ("zfill", "split_line"):
+        try:
+            return (name, int(arg.split(":")[0]), None)
+        except ValueError:
+            return (name, None, f"'{name}' 인자는 정수여야 합니다: {step}")
+    if name == "date":
+        # date:%Y-%m-%d->%Y.%m.%d
+        formats = arg.split("->")
+        if len(formats) != 2:
+            return (name, None, f"date 인자는 '입력포맷->출력포맷' 형식이어야 합니다: {step}")
+        return (name, tuple(formats), None)
+    if name == "map":
+        # map:남=Male,여=Female
+        mapping = {}
+        for pair in arg.split(","):
+            if "=" in pair:
+                key, val = pair.split("=", 1)
+                mapping[key.strip()] = val.strip()
+        if not mapping:
+            return (name, None, f"map 인자는 '키=값,키=값' 형식이어야 합니다: {step}")
+        return (name, mapping, None)
+    if name == "combine":
+        # combine:복무종료일,~,%Y-%m-%d->%y.%m.%d
+        parts = arg.split(",")
+        if len(parts) < 2 or not parts[0].strip():
+            return (name, None, f"combine 인자는 '필드,구분자[,포맷]' 형식이어야 합니다: {step}")
+        other_field = parts[0].strip()
+        separator = parts[1].strip()
+        third = None
+        if len(parts) >= 3:
+            third_param = parts[2].strip()
+            if "->" in third_param:
+                formats = third_param.split("->")
+                if len(formats) != 2:
+                    return (name, None, f"combine 날짜 포맷 형식 오류: {step}")
+                third = ("date", tuple(formats))
+            else:
+                # 변환 이름인 경우 (extract_age 등)
+                third = ("pipe", "|" + third_param)
+        return (name, (other_field, separator, third), None)
+
+    # default / prefix / suffix
+    return (name, arg, None)
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_pipe(pipe_spec):
+    """'|변환1|변환2:인자' -> 미리 해석한 변환 단계 튜플 (같은 파이프는 한 번만 해석)"""
+    if not pipe_spec:
+        return ()
+    return tuple(
+        compile_step(p.strip()) for p in pipe_spec.strip("|").split("|") if p.strip()
+    )
+
+
+def compile_text(text):
+    """플레이스홀더가 포함된 문자열 -> [리터럴 문자열 | (필드, 파이프)] 세그먼트 목록"""
+    segments = []
+    pos = 0
+    for match in PLACEHOLDER_PATTERN.finditer(text):
+        if match.start() > pos:
+            segments.append(text[pos:match.start()])
+        segments.append((match.group(1).strip(), match.group(2) or ""))
+        pos = match.end()
+    if pos < len(text):
+        segments.append(text[pos:])
+    return segments
+
+
+class CompiledTemplate:
+    """플레이스홀더 위치와 변환을 미리 분석해 둔 템플릿
+
+    플레이스홀더 셀 목록은 한 번만 분석하고 템플릿 파일 내용은 메모리에 보관한다.
+    openpyxl 렌더링은 보관한 내용으로 렌더링마다 새 워크북을 만든다 (openpyxl은 저장할 때
+    이미지 데이터를 닫으므로 한 워크북을 여러 번 저장할 수 없음).
+    """
+
+    def __init__(self, path, photo_placeholder):
+        self.path = os.path.abspath(path)
+        self.mtime = os.path.getmtime(path)
+        with open(path, "rb") as f:
+            self.data = f.read()
+        self.cells = []  # (시트 이름, 행, 열, 원본 문자열, 세그먼트 목록)
+        self.photo_cells = []  # (시트 이름, 행, 열)
+        self.lock = threading.Lock()
+
+        for ws in self.new_workbook().worksheets:
+            for row in ws.iter_rows():
+                for cell in row:
+                    value = cell.value
+                    if not (isinstance(value, str) and "{{" in value):
+                        continue
+                    if photo_placeholder in value:
+                        self.photo_cells.append((ws.title, cell.row, cell.column))
+                    segments = compile_text(value)
+                    if any(isinstance(seg, tuple) for seg in segments):
+                        self.cells.append((ws.title, cell.row, cell.column, value, segments))
+
+        # 템플릿이 참조하는 필드와 파이프 (검증/프로젝션용)
+        self.placeholders = [
+            seg for _, _, _, _, segments in self.cells for seg in segments if isinstance(seg, tuple)
+        ]
+        self.fields = {field for field, _ in self.placeholders}
+        self.ooxml_template = None
+
+    def new_workbook(self):
+        """보관한 템플릿 내용으로 새 openpyxl 워크북 생성 (디스크를 다시 읽지 않음)"""
+        from openpyxl import load_workbook
+
+        return load_workbook(io.BytesIO(self.data), data_only=False)
+
+    def ooxml(self):
+        """ooxml 백엔드용 zip/시트 XML 조각 (처음 쓸 때 한 번만 준비)"""
+        if self.ooxml_template is None:
+            from ooxml_writer import OoxmlTemplate
+
+            with self.lock:
+                if self.ooxml_template is None:
+                    self.ooxml_template = OoxmlTemplate(self.path, self.cells)
+        return self.ooxml_template
+
+
+class TemplateCache:
+    """컴파일된 템플릿 LRU 캐시 (파일 수정 시 자동 재컴파일)"""
+
+    def __init__(self, photo_placeholder, maxsize=8):
+        self.photo_placeholder = photo_placeholder
+        self.maxsize = max(1, maxsize)
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path):
+        key = os.path.abspath(path)
+        mtime = os.path.getmtime(path)
+        with self.lock:
+            template = self.entries.get(key)
+            if template is not None and template.mtime == mtime:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return template
+
+        template = CompiledTemplate(path, self.photo_placeholder)
+        print(f"  템플릿 컴파일: {os.path.basename(path)} (플레이스홀더 셀 {len(template.cells)}개)")
+        with self.lock:
+            self.misses += 1
+            self.entries[key] = template
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                evicted, _ = self.entries.popitem(last=False)
+                print(f"  템플릿 캐시에서 제외: {os.path.basename(evicted)}")
+        return template
+
+    def trim(self, keep=1):
+        """최근에 쓴 keep개만 남기고 비우기 (메모리 상한 초과 시)"""
+        with self.lock:
+            while len(self.entries) > keep:
+                self.entries.popitem(last=False)
+
+
+def parse_shard_spec(spec):
+    """'--shard i/N' 문자열을 (i, N) 튜플로 변환 (i는 1부터 시작)"""
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", str(spec))
+    if not match:
+        raise ValueError(f"샤드 형식이 잘못되었습니다: {spec} (예: 1/3)")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"샤드 번호 범위 오류: {spec} (1 <= i <= N)")
+    return index, count
+
+
+def shard_of(key, count):
+    """안정 키를 샤드 번호(1..N)로 매핑 - 프로세스/호스트가 달라도 항상 같은 결과"""
+    return zlib.crc32(str(key).encode("utf-8")) % count + 1
+
+
+class ProcessingCancelled(Exception):
+    """사용자 취소로 처리 중단"""
+
+
+class RunEvents:
+    """process_all 실행 이벤트 전달기
+
+    sink(event) 콜백으로 dict 이벤트를 전달한다.
+    - run_started: total (사전 검사 순회에서 센 처리 대상 행 수, 샤드 실행은 그 몫), shard
+    - stage: stage, message
+    - row: index, name, status, done, total, success, failed, rate, eta_sec
+      (min_interval 초 간격으로 묶어서 전달, 마지막 행은 항상 전달)
+    - error: message
+    - run_finished: report
+    """
+
+    def __init__(self, sink=None, min_interval=0.1):
+        self.sink = sink
+        self.min_interval = min_interval
+        self.total = 0
+        self.done = 0
+        self.success = 0
+        self.failed = 0
+        self.start_time = time.perf_counter()
+        self.last_emit = 0.0
+        self.last_row = None
+        self.emitted_done = 0
+
+    def emit(self, kind, **data):
+        """이벤트 즉시 전달 (콜백 오류는 처리를 중단시키지 않음)"""
+        if self.sink is None:
+            return
+        data["kind"] = kind
+        try:
+            self.sink(data)
+        except Exception as e:
+            print(f"  이벤트 처리 실패 ({kind}): {e}")
+
+    def run_started(self, total, shard=None):
+        self.total = total
+        self.start_time = time.perf_counter()
+        self.emit("run_started", total=total, shard=list(shard) if shard else None)
+
+    def stage(self, stage, message):
+        self.emit("stage", stage=stage, message=message)
+
+    def row(self, index, name, status):
+        """행 처리 결과 집계 후 간격 제한에 걸리지 않으면 전달"""
+        self.done += 1
+        if status == "success":
+            self.success += 1
+        elif status == "failed":
+            self.failed += 1
+        self.last_row = (index, name, status)
+
+        now = time.perf_counter()
+        is_last = self.total is not None and self.done >= self.total
+        if not is_last and now - self.last_emit < self.min_interval:
+            return
+        self.emit_row(now)
+
+    def emit_row(self, now=None):
+        """현재 집계를 row 이벤트로 전달"""
+        now = now or time.perf_counter()
+        self.last_emit = now
+        self.emitted_done = self.done
+        index, name, status = self.last_row
+
+        elapsed = now - self.start_time
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total - self.done, 0) if self.total is not None else None
+        self.emit(
+            "row",
+            index=index,
+            name=name,
+            status=status,
+            done=self.done,
+            total=self.total,
+            success=self.success,
+            failed=self.failed,
+            rate=round(rate, 2),
+            eta_sec=round(remaining / rate, 1) if rate > 0 and remaining is not None else None,
+        )
+
+    def error(self, message):
+        self.emit("error", message=message)
+
+    def run_finished(self, report):
+        # 간격 제한으로 전달되지 않은 마지막 집계 반영
+        if self.done and self.emitted_done != self.done:
+            self.emit_row()
+        self.emit("run_finished", report=report)
+
+
+def console_event_sink(event):
+    """CLI용 이벤트 출력 (진행률/처리 속도/남은 시간)"""
+    kind = event["kind"]
+    if kind == "row" and not event["total"]:
+        print(
+            f"[진행] {event['done']}건 처리 "
+            f"성공 {event['success']} 실패 {event['failed']} | {event['rate']:.2f}건/초"
+        )
+    elif kind == "row":
+        eta = event["eta_sec"]
+        eta_text = f"{int(eta // 60):02d}:{int(eta % 60):02d}" if eta is not None else "--:--"
+        print(
+            f"[진행] {event['done']}/{event['total']} "
+            f"({event['done'] / event['total'] * 100:.1f}%) "
+            f"성공 {event['success']} 실패 {event['failed']} | "
+            f"{event['rate']:.2f}건/초 | 남은 시간 {eta_text}"
+        )
+    elif kind == "stage":
+        print(f"[단계] {event['message']}")
+
 
 class ExcelTemplateFiller:
-    def __init__(self, config_path="config.json"):
-        """초기화"""
-        self.config = self.load_config(config_path)
-        self.placeholder_pattern = re.compile(r"\{\{\s*([^}|]+)\s*(\|[^}]*)?\}\}")
+    def __init__(self, config_path="config.json", config=None):
+        """초기화 (이미 만든 FillerConfig를 config로 넘기면 그대로 공유)"""
+        self.config = config if config is not None else self.load_config(config_path)
+        self.placeholder_pattern = PLACEHOLDER_PATTERN
+        # 컴파일된 템플릿 LRU 캐시
+        self.templates = TemplateCache(
+            self.config["photo_placeholder"], self.config.get("template_cache_size", 8)
+        )
+        # 취소 신호 (threading.Event 등 is_set()을 가진 객체) - 처리 중인 행도 중단
+        self.cancel_event = None
+        # 사진 색인 (build_photo_index 결과, None이면 행마다 폴더 검색)
+        self.photo_index = None
+        # Excel 프로세스 시작 알림 콜백 (작업자 감시용, pid 전달)
+        self.on_excel_started = None
+        # 선택된 렌더링 백엔드와 백엔드별 사용 가능 여부 (resolve_backend에서 한 번 결정)
+        self.backend = None
+        self.capabilities = None
+        # 헤드리스 백엔드의 .xlsx zip 압축 정책
+        self.zip_policy = ZipPolicy.from_config(self.config)
+
+    def detect_backends(self):
+        """백엔드별 사용 가능 여부 확인 -> {이름: None(사용 가능) 또는 사용 불가 사유}
+
+        Excel 시작 시도는 비용이 크므로 실행당 한 번만 호출한다.
+        """
+        capabilities = {}
+        try:
+            import openpyxl  # noqa: F401 - 템플릿 컴파일에 모든 백엔드가 사용
+            capabilities["openpyxl"] = None
+            capabilities["ooxml"] = None
+        except ImportError as e:
+            capabilities["openpyxl"] = capabilities["ooxml"] = f"openpyxl 미설치 ({e})"
+
+        if self.config["backend"] in ("auto", "xlwings") or self.config.get("save_pdf", True):
+            try:
+                import xlwings as xw
+            except ImportError as e:
+                capabilities["xlwings"] = f"xlwings 미설치 ({e})"
+            else:
+                try:
+                    app = xw.App(visible=False, add_book=False)
+                    app.quit()
+                    capabilities["xlwings"] = None
+                except Exception as e:
+                    capabilities["xlwings"] = f"Excel 시작 실패 ({e})"
+        else:
+            capabilities["xlwings"] = "확인하지 않음 (backend 설정)"
+        return capabilities
+
+    def resolve_backend(self, capabilities=None, report=True):
+        """backend 설정과 사용 가능 여부로 렌더링 백엔드 결정 (한 번만)
+
+        capabilities: 이미 확인한 결과 (작업자 프로세스는 감시 프로세스의 결과를 재사용)
+        지정한 백엔드를 쓸 수 없으면 RuntimeError
+        """
+        if self.backend is not None:
+            return self.backend
+
+        capabilities = capabilities if capabilities is not None else self.detect_backends()
+        policy = self.config["backend"]
+        if policy == "auto":
+            available = [name for name in BACKEND_PREFERENCE if capabilities.get(name) is None]
+            if not available:
+                raise RuntimeError("사용 가능한 렌더링 백엔드가 없습니다: " + ", ".join(
+                    f"{name}: {capabilities.get(name)}" for name in BACKEND_PREFERENCE
+                ))
+            backend = available[0]
+        elif capabilities.get(policy) is not None:
+            raise RuntimeError(f"backend '{policy}'를 사용할 수 없습니다: {capabilities[policy]}")
+        else:
+            backend = policy
+
+        self.backend = backend
+        self.capabilities = capabilities
+        if report:
+            print(f"렌더링 백엔드: {backend} (설정: {policy})")
+            print(f"  손실: {BACKEND_FIDELITY[backend]}")
+            for name in BACKEND_PREFERENCE:
+                if capabilities.get(name) is not None and name != backend:
+                    print(f"  {name} 사용 불가: {capabilities[name]}")
+            if self.config.get("save_pdf", True) and not self.pdf_available():
+                print("  PDF 저장 불가 (Excel 필요) - PDF는 건너뜁니다")
+        return backend
+
+    def pdf_available(self):
+        """PDF 저장(Excel) 가능 여부 - 백엔드를 결정하기 전이면 시도해 봄"""
+        return self.capabilities is None or self.capabilities.get("xlwings") is None
+
+    def start_excel_app(self):
+        """Excel 애플리케이션 시작 (백그라운드) - 감시 프로세스에 pid 알림"""
+        import xlwings as xw
+        
+        app = xw.App(visible=False, add_book=False)
+        if self.on_excel_started is not None:
+            try:
+                self.on_excel_started(app.pid)
+            except Exception as e:
+                print(f"  Excel pid 알림 실패: {e}")
+        return app
+
+    def check_cancelled(self):
+        """취소 신호가 설정되어 있으면 ProcessingCancelled 발생"""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ProcessingCancelled("사용자가 처리를 취소했습니다.")
         
     def load_config(self, config_path):
-        """설정 파일 로드"""
-        if not os.path.exists(config_path):
-            # 기본 설정 파일 생성
-            default_config = {
-                "template_file": "../templates/application_template.xlsx",
-                "raw_data_file": "../raw_data/applicants.xlsx", 
-                "raw_data_sheet": "공고별 지원자 관리",
-                "output_dir": "../output",
-                "filename_pattern": "{이름}_입사지원서.xlsx",
-                "save_pdf": True,  # PDF 저장 옵션 추가
-                "encoding": "utf-8",
-                # 지원자 사진 관련 설정
-                "images_dir": "../images",  # 지원자 사진 폴더
-                "photo_field": "수험번호",  # 사진 파일명의 기준 필드
-                "photo_extensions": [".png", ".jpg", ".jpeg"],  # 지원 이미지 형식
-                "photo_placeholder": "{{사진}}",  # 템플릿에서 사진 위치 지정
-                "photo_width": 121,   # 사진 너비 (픽셀) - 열너비 17.25 * 7
-                "photo_height": 156   # 사진 높이 (픽셀) - 행높이와 동일
-            }
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(default_config, f, ensure_ascii=False, indent=2)
-            print(f"기본 설정 파일을 생성했습니다: {config_path}")
-            return default_config
-        
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-            
-        # 새로운 옵션이 없으면 기본값 추가
-        if "save_pdf" not in config:
-            config["save_pdf"] = True
-            
-        # 이미지 관련 기본값 추가
-        if "images_dir" not in config:
-            config["images_dir"] = "../images"
-        if "photo_field" not in config:
-            config["photo_field"] = "수험번호"
-        if "photo_extensions" not in config:
-            config["photo_extensions"] = [".png", ".jpg", ".jpeg"]
-        if "photo_placeholder" not in config:
-            config["photo_placeholder"] = "{{사진}}"
-        if "photo_width" not in config:
-            config["photo_width"] = 121
-        if "photo_height" not in config:
-            config["photo_height"] = 156
-            
-        return config
+        """설정 파일 로드 (모듈 수준 load_config 사용, 같은 파일은 한 번만 검증)"""
+        return load_config(config_path)
     
     def apply_transforms(self, value, pipe_spec, context=None):
-        """파이프라인 변환 적용"""
-        if value is None or pd.isna(value):
+        """파이프라인 변환 적용 (파이프는 compile_pipe로 한 번만 해석)"""
+        if is_missing(value):
             value = ""
         
         s = str(value).strip()
@@ -98,155 +746,123 @@ class ExcelTemplateFiller:
         if not pipe_spec:
             return s
             
-        # 파이프 구분하여 변환 단계별 적용
-        steps = [p.strip() for p in pipe_spec.strip("|").split("|") if p.strip()]
-        
-        for step in steps:
-            if step == "trim":
-                s = s.strip()
-            elif step == "upper":
-                s = s.upper()
-            elif step == "lower":
-                s = s.lower()
-            elif step.startswith("zfill:"):
-                try:
-                    n = int(step.split(":")[1])
-                    s = s.zfill(n)
-                except:
-                    pass
-            elif step == "digits":
-                s = re.sub(r"\D+", "", s)
-            elif step.startswith("date:"):
-                # date:%Y-%m-%d->%Y.%m.%d
-                try:
-                    spec = step.split(":", 1)[1]
-                    if "->" in spec:
-                        src_fmt, dst_fmt = spec.split("->")
-                        dt = datetime.datetime.strptime(s, src_fmt)
-                        s = dt.strftime(dst_fmt)
-                except Exception as e:
-                    print(f"날짜 변환 실패: {s} -> {step}, 오류: {e}")
-                    pass
-            elif step.startswith("map:"):
-                # map:남=Male,여=Female
+        # 변환 단계별 적용 (형식이 잘못된 단계는 건너뜀 - check 명령으로 사전 확인)
+        for name, param, error in compile_pipe(pipe_spec):
+            if error:
+                continue
+            s = self.apply_step(s, name, param, context)
+        
+        return s
+    
+    def apply_step(self, s, name, param, context=None):
+        """compile_pipe로 해석한 변환 단계 하나 적용"""
+        if name == "trim":
+            s = s.strip()
+        elif name == "upper":
+            s = s.upper()
+        elif name == "lower":
+            s = s.lower()
+        elif name == "zfill":
+            s = s.zfill(param)
+        elif name == "digits":
+            s = re.sub(r"\D+", "", s)
+        elif name == "date":
+            # date:%Y-%m-%d->%Y.%m.%d (빈 값은 그대로 둠)
+            if s:
                 try:
-                    pairs = step.split(":", 1)[1]
-                    mapping = {}
-                    for pair in pairs.split(","):
-                        if "=" in pair:
-                            key, val = pair.split("=", 1)
-                            mapping[key.strip()] = val.strip()
-                    s = mapping.get(s, s)
+                    src_fmt, dst_fmt = param
+                    dt = datetime.datetime.strptime(s, src_fmt)
+                    s = dt.strftime(dst_fmt)
                 except Exception as e:
-                    print(f"매핑 변환 실패: {s} -> {step}, 오류: {e}")
-                    pass
-            elif step.startswith("default:"):
-                # 값이 비어있으면 기본값 사용
-                try:
-                    default_val = step.split(":", 1)[1]
-                    if s.strip() == "":
-                        s = default_val
-                except:
-                    pass
-            elif step.startswith("prefix:"):
-                try:
-                    prefix = step.split(":", 1)[1]
-                    s = prefix + s
-                except:
-                    pass
-            elif step.startswith("suffix:"):
-                try:
-                    suffix = step.split(":", 1)[1]
-                    s = s + suffix
-                except:
-                    pass
-            elif step == "extract_age":
-                # "만 31세(32)" -> "만 31세(32)"
-                try:
-                    import re
-                    # 전체 패턴 매칭하여 닫는 괄호까지 포함
-                    match = re.search(r'만 \d+세\(\d+\)', s)
+                    print(f"날짜 변환 실패: {s} -> date:{'->'.join(param)}, 오류: {e}")
+        elif name == "map":
+            # map:남=Male,여=Female
+            s = param.get(s, s)
+        elif name == "default":
+            # 값이 비어있으면 기본값 사용
+            if s.strip() == "":
+                s = param
+        elif name == "prefix":
+            s = param + s
+        elif name == "suffix":
+            s = s + param
+        elif name == "extract_age":
+            # "만 31세(32)" -> "만 31세(32)"
+            # 전체 패턴 매칭하여 닫는 괄호까지 포함
+            match = re.search(r'만 \d+세\(\d+\)', s)
+            if match:
+                s = match.group(0)
+            else:
+                # 닫는 괄호가 없는 경우 추가
+                match = re.search(r'만 \d+세\(\d+', s)
+                if match:
+                    s = match.group(0) + ")"
+                else:
+                    # 기본 패턴으로 시도
+                    match = re.search(r'(만 \d+세)', s)
                     if match:
-                        s = match.group(0)
-                    else:
-                        # 닫는 괄호가 없는 경우 추가
-                        match = re.search(r'만 \d+세\(\d+', s)
-                        if match:
-                            s = match.group(0) + ")"
-                        else:
-                            # 기본 패턴으로 시도
-                            match = re.search(r'(만 \d+세)', s)
-                            if match:
-                                s = match.group(1)
-                except:
-                    pass
-            elif step.startswith("split_line:"):
-                # split_line:0 (첫 번째 줄), split_line:1 (두 번째 줄), split_line:2 (세 번째 줄)
-                try:
-                    line_index = int(step.split(":")[1])
-                    # 줄바꿈으로 분리 (Windows \r\n, Unix \n 모두 처리)
-                    lines = s.replace('\r\n', '\n').split('\n')
-                    if line_index < len(lines):
-                        s = lines[line_index].strip()
-                        print(f"  split_line:{line_index} -> '{s}'")  # 디버그
-                    else:
-                        s = ""  # 해당 줄이 없으면 빈 값
-                        print(f"  split_line:{line_index} -> 빈 값 (줄 없음)")  # 디버그
-                except Exception as e:
-                    print(f"split_line 변환 실패: {s} -> {step}, 오류: {e}")
-                    pass
-            elif step.startswith("combine:"):
-                # combine:복무종료일,~,%Y-%m-%d->%y.%m.%d
+                        s = match.group(1)
+        elif name == "split_line":
+            # split_line:0 (첫 번째 줄), split_line:1 (두 번째 줄), split_line:2 (세 번째 줄)
+            # 줄바꿈으로 분리 (Windows \r\n, Unix \n 모두 처리)
+            lines = s.replace('\r\n', '\n').split('\n')
+            if 0 <= param < len(lines):
+                s = lines[param].strip()
+            else:
+                s = ""  # 해당 줄이 없으면 빈 값
+        elif name == "combine":
+            # combine:복무종료일,~,%Y-%m-%d->%y.%m.%d
+            other_field, separator, third = param
+            
+            # 다른 필드 값 가져오기
+            other_value = str((context or {}).get(other_field, "")).strip()
+            
+            # 세 번째 파라미터가 있으면 변환 또는 날짜 포맷으로 처리
+            if third and third[0] == "date":
+                src_fmt, dst_fmt = third[1]
                 try:
-                    spec = step.split(":", 1)[1]
-                    parts = spec.split(",")
-                    if len(parts) >= 2:
-                        other_field = parts[0].strip()
-                        separator = parts[1].strip()
-                        
-                        # 다른 필드 값 가져오기
-                        other_value = str(context.get(other_field, "")).strip()
-                        
-                        # 세 번째 파라미터가 있으면 변환 또는 날짜 포맷으로 처리
-                        if len(parts) >= 3:
-                            third_param = parts[2].strip()
-                            
-                            # 날짜 포맷인지 확인 (-> 포함 여부)
-                            if "->" in third_param:
-                                # 날짜 포맷 변환
-                                src_fmt, dst_fmt = third_param.split("->")
-                                try:
-                                    # 시작일 변환
-                                    if s:
-                                        start_dt = datetime.datetime.strptime(s, src_fmt)
-                                        s = start_dt.strftime(dst_fmt)
-                                    # 종료일 변환  
-                                    if other_value:
-                                        end_dt = datetime.datetime.strptime(other_value, src_fmt)
-                                        other_value = end_dt.strftime(dst_fmt)
-                                except Exception as e:
-                                    print(f"combine 날짜 변환 실패: {s}, {other_value} -> {third_param}, 오류: {e}")
-                            else:
-                                # 변환 이름인 경우 (extract_age 등)
-                                other_value = self.apply_transforms(other_value, "|" + third_param, context)
-                        
-                        # 결합
-                        if s and other_value:
-                            s = f"{s}{separator}{other_value}"
-                            print(f"  combine 결합: '{s}' + '{separator}' + '{other_value}' = '{s}'")  # 디버그
-                        elif s:
-                            s = s  # 시작일만 있는 경우
-                        elif other_value:
-                            s = other_value  # 종료일만 있는 경우
-                        else:
-                            s = ""  # 둘 다 없는 경우
-                
+                    # 시작일 변환
+                    if s:
+                        start_dt = datetime.datetime.strptime(s, src_fmt)
+                        s = start_dt.strftime(dst_fmt)
+                    # 종료일 변환  
+                    if other_value:
+                        end_dt = datetime.datetime.strptime(other_value, src_fmt)
+                        other_value = end_dt.strftime(dst_fmt)
                 except Exception as e:
-                    print(f"combine 변환 실패: {s} -> {step}, 오류: {e}")
-                    pass
-        
+                    print(f"combine 날짜 변환 실패: {s}, {other_value} -> {src_fmt}->{dst_fmt}, 오류: {e}")
+            elif third:
+                # 변환 이름인 경우 (extract_age 등)
+                other_value = self.apply_transforms(other_value, third[1], context)
+            
+            # 결합 (한쪽만 있으면 있는 값 사용)
+            if s and other_value:
+                s = f"{s}{separator}{other_value}"
+            elif other_value:
+                s = other_value  # 종료일만 있는 경우
         return s
     
+    def render_segments(self, segments, context, rendered=None):
+        """compile_text 세그먼트를 문자열로 렌더링
+
+        rendered: (필드, 파이프) -> 결과 캐시. 한 행의 여러 템플릿이 같은 dict를
+        공유하면 동일한 플레이스홀더 변환을 한 번만 계산한다.
+        """
+        parts = []
+        for seg in segments:
+            if isinstance(seg, str):
+                parts.append(seg)
+                continue
+            if rendered is not None and seg in rendered:
+                parts.append(rendered[seg])
+                continue
+            field, pipe = seg
+            value = self.apply_transforms(context.get(field, ""), pipe, context)
+            if rendered is not None:
+                rendered[seg] = value
+            parts.append(value)
+        return "".join(parts)
+    
     def replace_placeholders_in_cell(self, cell, context):
         """셀의 플레이스홀더를 실제 값으로 치환"""
         if not isinstance(cell.value, str):
@@ -293,6 +909,15 @@ class ExcelTemplateFiller:
         if not exam_number:
             return None
         
+        # 사진 색인이 있으면 폴더를 다시 검색하지 않음
+        if self.photo_index is not None:
+            photo_path = self.photo_index.get(exam_number)
+            if photo_path:
+                print(f"  지원자 사진 발견: {os.path.basename(photo_path)}")
+            else:
+                print(f"  지원자 사진 없음: {exam_number}_*")
+            return photo_path
+        
         # images 디렉토리에서 해당 수험번호로 시작하는 파일 찾기
         images_path = Path(images_dir)
         if not images_path.exists():
@@ -312,6 +937,34 @@ class ExcelTemplateFiller:
         print(f"  지원자 사진 없음: {exam_number}_*")
         return None
 
+    def build_photo_index(self):
+        """images_dir를 한 번 스캔해 {수험번호: 사진 절대 경로} 색인 생성
+
+        find_applicant_photo와 같은 규칙: '수험번호_*.확장자', photo_extensions 순서 우선.
+        """
+        images_path = Path(self.config["images_dir"])
+        if not images_path.exists():
+            return {}
+        
+        extensions = [ext.lower() for ext in self.config["photo_extensions"]]
+        candidates = {}  # 수험번호 -> (확장자 순위, 파일명, 경로)
+        for entry in os.scandir(images_path):
+            if not entry.is_file():
+                continue
+            stem, ext = os.path.splitext(entry.name)
+            if ext.lower() not in extensions:
+                continue
+            rank = extensions.index(ext.lower())
+            # '수험번호_*' 이므로 '_' 앞의 모든 접두어가 후보 (수험번호에 '_'가 있어도 대응)
+            for pos, char in enumerate(stem):
+                if char != "_" or pos == 0:
+                    continue
+                key = stem[:pos]
+                candidate = (rank, entry.name, os.path.abspath(entry.path))
+                if key not in candidates or candidate < candidates[key]:
+                    candidates[key] = candidate
+        return {key: candidate[2] for key, candidate in candidates.items()}
+
     def insert_photo_xlwings(self, sheet, photo_path, target_cell):
         """xlwings를 사용하여 지원자 사진을 병합된 셀 범위에 맞춰 삽입 (개선된 버전)"""
         try:
@@ -340,35 +993,36 @@ class ExcelTemplateFiller:
             # 사진 파일의 원본 크기 확인 시도
             try:
                 from PIL import Image
-                with Image.open(photo_path) as img: # 이미지 파일을 열어서 Image 객체 생성
+                # 크기만 읽고 바로 닫음 (대량 배치에서 이미지 파일 핸들/버퍼가 남지 않도록)
+                with Image.open(photo_path) as img:
                     original_width, original_height = img.size
-                    print(f"    원본 사진 크기: {original_width} x {original_height} 픽셀")
-                    
-                    # 비율 유지하면서 셀 크기에 맞춤
-                    width_ratio = cell_width / original_width
-                    height_ratio = cell_height / original_height
-                    scale_ratio = min(width_ratio, height_ratio)  # 작은 비율 선택 (셀을 벗어나지 않도록)
-                    
-                    final_width = original_width * scale_ratio
-                    final_height = original_height * scale_ratio
-                    
-                    print(f"    조정된 사진 크기: {final_width:.1f} x {final_height:.1f} 픽셀 (비율: {scale_ratio:.3f})")
-                    
-                    # 중앙 정렬을 위한 오프셋 계산
-                    left_offset = (cell_width - final_width) / 2
-                    top_offset = (cell_height - final_height) / 2
-                    
-                    # 이미지 삽입 (병합된 셀 범위에 중앙 정렬)
-                    picture = sheet.pictures.add(
-                        photo_path,
-                        left=insert_left + left_offset,
-                        top=insert_top + top_offset,
-                        width=final_width,
-                        height=final_height
-                    )
-                    
-                    print(f"    사진 삽입 완료: {os.path.basename(photo_path)} -> {target_cell} (중앙 정렬)")
-                    return True
+                print(f"    원본 사진 크기: {original_width} x {original_height} 픽셀")
+                
+                # 비율 유지하면서 셀 크기에 맞춤
+                width_ratio = cell_width / original_width
+                height_ratio = cell_height / original_height
+                scale_ratio = min(width_ratio, height_ratio)  # 작은 비율 선택 (셀을 벗어나지 않도록)
+                
+                final_width = original_width * scale_ratio
+                final_height = original_height * scale_ratio
+                
+                print(f"    조정된 사진 크기: {final_width:.1f} x {final_height:.1f} 픽셀 (비율: {scale_ratio:.3f})")
+                
+                # 중앙 정렬을 위한 오프셋 계산
+                left_offset = (cell_width - final_width) / 2
+                top_offset = (cell_height - final_height) / 2
+                
+                # 이미지 삽입 (병합된 셀 범위에 중앙 정렬)
+                picture = sheet.pictures.add(
+                    photo_path,
+                    left=insert_left + left_offset,
+                    top=insert_top + top_offset,
+                    width=final_width,
+                    height=final_height
+                )
+                
+                print(f"    사진 삽입 완료: {os.path.basename(photo_path)} -> {target_cell} (중앙 정렬)")
+                return True
                     
             except ImportError:
                 print("    PIL(Pillow) 라이브러리가 없어 기본 크기로 삽입합니다.")
@@ -408,7 +1062,7 @@ class ExcelTemplateFiller:
             print(f"  PDF 경로: {pdf_path_abs}")
             
             # Excel 애플리케이션 시작 (백그라운드)
-            app = xw.App(visible=False, add_book=False)
+            app = self.start_excel_app()
             
             # Excel 파일 열기
             wb = app.books.open(excel_path_abs)
@@ -436,7 +1090,7 @@ class ExcelTemplateFiller:
             if app:
                 app.quit()
 
-    def fill_workbook_xlwings(self, template_path, context, output_path):
+    def fill_workbook_xlwings(self, template_path, context, output_path, rendered=None):
         """xlwings를 사용한 완벽한 이미지 보존 방식 + PDF 저장"""
         print(f"\n템플릿 처리 (xlwings - 이미지 보존): {template_path}")
         
@@ -467,7 +1121,7 @@ class ExcelTemplateFiller:
         wb = None
         try:
             # Excel 애플리케이션 시작 (백그라운드, 이미지 보존 설정)
-            app = xw.App(visible=False, add_book=False)
+            app = self.start_excel_app()
             print("  Excel 애플리케이션 시작 (이미지 보존 모드)")
             
             # 복사된 파일 열기 (읽기/쓰기 모드) - 안전하게 시도
@@ -497,47 +1151,37 @@ class ExcelTemplateFiller:
             # 지원자 사진 파일 찾기 (한 번만 실행)
             photo_path = self.find_applicant_photo(context)
             
-            # 모든 시트에서 플레이스홀더 치환
-            for sheet in wb.sheets:
-                print(f"  시트 처리: {sheet.name}")
-                placeholder_count = 0
-                photo_inserted = False
-                
-                # 사용된 범위 가져오기
-                used_range = sheet.used_range
-                if used_range is None:
-                    continue
+            # 컴파일된 템플릿의 플레이스홀더 위치만 방문 (전체 셀 스캔 없음)
+            template = self.templates.get(template_path)
+            placeholder_count = 0
+            photo_inserted = False
+            
+            for sheet_name, row, col, original_value, segments in template.cells:
+                self.check_cancelled()
+                sheet = wb.sheets[sheet_name]
+                cell = sheet.range(row, col)
                 
-                # 모든 셀 검사
-                for row in range(1, used_range.last_cell.row + 1):
-                    for col in range(1, used_range.last_cell.column + 1):
-                        cell = sheet.range(row, col)
-                        cell_value = cell.value
+                # {{사진}} 플레이스홀더 처리 (특별 처리)
+                if self.config["photo_placeholder"] in original_value:
+                    if photo_path and not photo_inserted:
+                        # 사진 삽입 (셀 위치 직접 사용)
+                        if self.insert_photo_xlwings(sheet, photo_path, f"{row},{col}"):
+                            photo_inserted = True
+                            placeholder_count += 1
+                            print(f"    사진 삽입: {original_value} -> 이미지 파일")
                         
-                        if cell_value and isinstance(cell_value, str) and '{{' in cell_value:
-                            original_value = cell_value
-                            
-                            # {{사진}} 플레이스홀더 처리 (특별 처리)
-                            if self.config["photo_placeholder"] in original_value:
-                                if photo_path and not photo_inserted:
-                                    # 사진 삽입 (셀 위치 직접 사용)
-                                    if self.insert_photo_xlwings(sheet, photo_path, f"{row},{col}"):
-                                        photo_inserted = True
-                                        placeholder_count += 1
-                                        print(f"    사진 삽입: {original_value} -> 이미지 파일")
-                                    
-                                # 플레이스홀더 텍스트 제거
-                                cell.value = ""
-                            else:
-                                # 일반 플레이스홀더 처리
-                                new_value = self.replace_placeholders_in_string(original_value, context)
-                                
-                                if new_value != original_value:
-                                    cell.value = new_value
-                                    placeholder_count += 1
-                                    print(f"    치환 {placeholder_count}: {original_value[:30]}... -> {new_value[:30]}...")
-                
-                print(f"  {sheet.name} 시트: {placeholder_count}개 플레이스홀더 처리 완료")
+                    # 플레이스홀더 텍스트 제거
+                    cell.value = ""
+                else:
+                    # 일반 플레이스홀더 처리
+                    new_value = self.render_segments(segments, context, rendered)
+                    
+                    if new_value != original_value:
+                        cell.value = new_value
+                        placeholder_count += 1
+                        print(f"    치환 {placeholder_count}: {original_value[:30]}... -> {new_value[:30]}...")
+            
+            print(f"  {placeholder_count}개 플레이스홀더 처리 완료")
             
             # 3단계: Excel 저장 (이미지 보존 확인)
             wb.save()
@@ -605,84 +1249,92 @@ class ExcelTemplateFiller:
             if app:
                 app.quit()
 
-    def fill_workbook(self, template_path, context, output_path):
-        """기본 fill_workbook - xlwings 강제 사용 (이미지 보존)"""
+    def fill_workbook(self, template_path, context, output_path, rendered=None):
+        """설정된 백엔드로 템플릿 채우기 (대화형 선택 없음 - 백엔드는 실행당 한 번 결정)
+
+        rendered: 같은 행의 여러 템플릿이 공유하는 플레이스홀더 결과 캐시
+        """
+        backend = self.resolve_backend()
+        if backend == "xlwings":
+            self.fill_workbook_xlwings(template_path, context, output_path, rendered)
+        elif backend == "ooxml":
+            self.fill_workbook_ooxml(template_path, context, output_path, rendered)
+        else:
+            self.fill_workbook_openpyxl(template_path, context, output_path, rendered)
+
+    def fill_workbook_ooxml(self, template_path, context, output_path, rendered=None, save_pdf=None):
+        """시트 XML의 플레이스홀더 셀만 직접 바꿔 쓰는 방식 (Excel 불필요, 템플릿 이미지/서식 유지)
+
+        save_pdf: None이면 설정(save_pdf)을 따름 (PDF는 Excel이 있어야 저장)
+        """
+        print(f"\n템플릿 처리 (ooxml): {template_path}")
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        
+        template = self.templates.get(template_path)
+        values = {}
+        for sheet_name, row, col, original_value, segments in template.cells:
+            self.check_cancelled()
+            # 사진은 삽입할 수 없으므로 플레이스홀더만 비움 (xlwings 방식과 같은 결과 셀)
+            if self.config["photo_placeholder"] in original_value:
+                values[(sheet_name, row, col)] = ""
+            else:
+                values[(sheet_name, row, col)] = self.render_segments(segments, context, rendered)
+        
         try:
-            # xlwings 방식 우선 시도 (완벽한 이미지 보존)
-            print("이미지 보존을 위해 xlwings 사용")
-            self.fill_workbook_xlwings(template_path, context, output_path)
-        except Exception as e:
-            print(f"xlwings 실패: {e}")
-            print("이미지 보존이 중요한 경우 Excel이 설치된 환경에서 실행해주세요.")
-            
-            # 사용자에게 선택권 제공
-            print("\n어떻게 처리하시겠습니까?")
-            print("1. openpyxl로 대체 (이미지 손실 가능)")
-            print("2. 중단 (Excel 환경에서 다시 실행)")
-            
+            template.ooxml().render(values, output_path, self.zip_policy)
+        except Exception:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise
+        print(f"  {len(values)}개 플레이스홀더 처리 완료")
+        print(f"Excel 저장 완료: {output_path}")
+        
+        save_pdf_option = self.config.get("save_pdf", True) if save_pdf is None else save_pdf
+        if save_pdf_option and self.pdf_available():
+            pdf_path = output_path.replace('.xlsx', '.pdf')
             try:
-                choice = input("선택 (1 또는 2): ").strip()
-                if choice == "2":
-                    print("실행 중단. Excel이 설치된 환경에서 다시 실행해주세요.")
-                    raise Exception("사용자가 실행을 중단했습니다.")
-                elif choice == "1":
-                    print("openpyxl로 대체 (이미지가 손실될 수 있습니다)")
-                    self.fill_workbook_openpyxl(template_path, context, output_path)
-                else:
-                    print("잘못된 선택. openpyxl로 대체합니다.")
-                    self.fill_workbook_openpyxl(template_path, context, output_path)
-            except (EOFError, KeyboardInterrupt):
-                print("입력 없음. openpyxl로 대체합니다.")
-                self.fill_workbook_openpyxl(template_path, context, output_path)
-
-    def fill_workbook_openpyxl(self, template_path, context, output_path):
-        """openpyxl을 사용한 기본 방식 (백업용)"""
+                self.save_as_pdf_xlwings(output_path, pdf_path)
+            except Exception as e:
+                print(f"PDF 저장 실패 (Excel 필요): {e}")
+
+    def fill_workbook_openpyxl(self, template_path, context, output_path, rendered=None, save_pdf=None):
+        """openpyxl을 사용한 기본 방식 (백업용)
+
+        캐시된 컴파일 템플릿으로 새 워크북을 만들어 플레이스홀더 셀만 값을 바꿔 저장한다.
+        save_pdf: None이면 설정(save_pdf)을 따름
+        """
         print(f"\n템플릿 처리 (openpyxl): {template_path}")
         
         # 출력 디렉토리 생성
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
         
-        # 1단계: 템플릿 파일을 출력 위치로 직접 복사
-        try:
-            shutil.copy2(template_path, output_path)
-            print(f"  템플릿 복사 완료: {output_path}")
-        except Exception as e:
-            print(f"  템플릿 복사 실패: {e}")
-            raise
+        template = self.templates.get(template_path)
         
-        # 2단계: 복사된 파일을 열어서 플레이스홀더만 치환
         try:
-            wb = load_workbook(output_path, data_only=False)
-            print("  복사된 파일 로드 완료")
+            # 렌더링마다 새 워크북 (스레드 간 공유 없음, 이미지 데이터도 렌더링마다 새로 읽음)
+            wb = template.new_workbook()
+            placeholder_count = 0
+            for sheet_name, row, col, original_value, segments in template.cells:
+                self.check_cancelled()
+                cell = wb[sheet_name].cell(row=row, column=col)
+                cell.value = self.render_segments(segments, context, rendered)
+                placeholder_count += 1
+                if original_value != cell.value:
+                    print(f"    치환 {placeholder_count}: {original_value[:50]}... -> {cell.value[:50]}...")
             
-            # 모든 시트에서 플레이스홀더 치환
-            for sheet_name in wb.sheetnames:
-                ws = wb[sheet_name]
-                print(f"  시트 처리: {sheet_name}")
-                
-                placeholder_count = 0
-                
-                # 플레이스홀더 치환
-                for row in ws.iter_rows():
-                    for cell in row:
-                        if cell.value and isinstance(cell.value, str) and '{{' in cell.value:
-                            original_value = cell.value
-                            self.replace_placeholders_in_cell(cell, context)
-                            placeholder_count += 1
-                            if original_value != cell.value:
-                                print(f"    치환 {placeholder_count}: {original_value[:50]}... -> {cell.value[:50]}...")
-                
-                print(f"  {sheet_name} 시트: {placeholder_count}개 플레이스홀더 처리 완료")
+            print(f"  {placeholder_count}개 플레이스홀더 처리 완료")
             
-            # 3단계: Excel 저장
-            wb.save(output_path)
+            # 3단계: Excel 저장 (항목별 압축 정책 적용)
+            save_workbook(wb, output_path, self.zip_policy)
             print(f"Excel 저장 완료: {output_path}")
             
             # 4단계: PDF 저장 시도 (xlwings 사용)
-            save_pdf_option = self.config.get("save_pdf", True)
+            save_pdf_option = self.config.get("save_pdf", True) if save_pdf is None else save_pdf
             print(f"  PDF 저장 설정: {save_pdf_option}")
             
-            if save_pdf_option:
+            if save_pdf_option and not self.pdf_available():
+                print("  PDF 저장 건너뛰기 (Excel 없음)")
+            elif save_pdf_option:
                 pdf_path = output_path.replace('.xlsx', '.pdf')
                 try:
                     self.save_as_pdf_xlwings(output_path, pdf_path)
@@ -695,7 +1347,7 @@ class ExcelTemplateFiller:
             
         except Exception as e:
             print(f"데이터 처리 실패: {e}")
-            # 복사된 파일 삭제 (실패 시)
+            # 저장 중이던 파일 삭제 (실패 시)
             if os.path.exists(output_path):
                 os.remove(output_path)
             raise
@@ -706,115 +1358,878 @@ class ExcelTemplateFiller:
     # 더 이상 사용하지 않음 - 파일 복사 방식으로 변경  
     # def restore_images(self, worksheet, images_info):
     
-    def process_all(self):
-        """전체 처리 실행"""
+    def render_row(self, index, context, output_dir, outputs=None, jobs=None):
+        """한 행의 모든 템플릿 렌더링 - 출력 경로 목록 반환
+
+        outputs: 전달하면 렌더링 전에 출력 경로를 차례로 추가 (실패해도 어느 파일까지 시도했는지 남음)
+        jobs: (템플릿 경로, 출력 경로) 목록 - 충돌 검사에서 파일명을 바꾼 경우 (None이면 get_row_outputs)
+        """
+        outputs = outputs if outputs is not None else []
+        # 행 하나의 모든 템플릿이 같은 컨텍스트/변환 결과를 공유
+        rendered = {}
+        if jobs is None:
+            jobs = self.get_row_outputs(context, index, output_dir)
+        for template_path, output_path in jobs:
+            outputs.append(os.path.abspath(output_path))
+            
+            # 템플릿 채우기
+            self.fill_workbook(template_path, context, output_path, rendered)
+        return outputs
+
+    def render_rows_inline(self, tasks, output_dir, total_rows=None):
+        """현재 프로세스에서 차례로 렌더링
+
+        tasks: (행 번호, 키, 컨텍스트, 출력 목록 또는 None) 반복자
+        반환: (행 번호, 키, 컨텍스트, 상태, 출력 경로 목록, 오류, 렌더링 ms) 반복자
+        """
+        for index, shard_key, context, jobs in tasks:
+            outputs = []
+            start = time.perf_counter()
+            try:
+                print(f"\n 행 {index+1}/{total_rows or '?'} 처리 중...")
+                print(f"  대상: {context.get('이름', 'Unknown')}")
+                
+                self.render_row(index, context, output_dir, outputs, jobs)
+                status, error = "success", None
+                
+            except ProcessingCancelled as e:
+                print(f" 행 {index+1} 처리 취소: {e}")
+                status, error = "cancelled", str(e)
+            except Exception as e:
+                print(f" 행 {index+1} 처리 실패: {e}")
+                status, error = "failed", str(e)
+            yield index, shard_key, context, status, outputs, error, (time.perf_counter() - start) * 1000
+            if status == "cancelled":
+                return
+
+    def relieve_memory(self, state, supervisor=None):
+        """메모리 상한 모드에서 샘플마다 호출 - 순환 참조 정리, 상한 초과 시 캐시 정리/작업자 축소"""
+        gc.collect()
+        if state == "over":
+            self.templates.trim(1)
+            compile_pipe.cache_clear()
+            gc.collect()
+        if supervisor is not None:
+            supervisor.throttle(state)
+
+    def get_template_paths(self):
+        """설정에서 참조하는 모든 템플릿 경로 (기본 템플릿 + 규칙별 템플릿)"""
+        paths = [self.config["template_file"]]
+        for rule in self.config.get("template_rules", []):
+            for spec in rule.get("templates", []):
+                path = spec["file"] if isinstance(spec, dict) else spec
+                if path not in paths:
+                    paths.append(path)
+        return paths
+
+    def select_templates(self, context):
+        """행 값에 맞는 템플릿 목록 선택 -> [(템플릿 경로, 파일명 패턴 또는 None)]
+
+        template_rules 예시 (첫 번째로 일치하는 규칙 사용, 없으면 template_file):
+          {"when": {"공고": ["P1", "P2"]},
+           "templates": ["../templates/cover.xlsx",
+                         {"file": "../templates/application_p1.xlsx",
+                          "filename_pattern": "{이름}_P1_입사지원서.xlsx"}]}
+        """
+        for rule in self.config.get("template_rules", []):
+            conditions = rule.get("when", {})
+            matched = True
+            for field, expected in conditions.items():
+                allowed = expected if isinstance(expected, list) else [expected]
+                if str(context.get(field, "")).strip() not in [str(v) for v in allowed]:
+                    matched = False
+                    break
+            if matched:
+                return [
+                    (spec["file"], spec.get("filename_pattern")) if isinstance(spec, dict) else (spec, None)
+                    for spec in rule.get("templates", [])
+                ]
+        return [(self.config["template_file"], None)]
+
+    def get_row_outputs(self, context, index, output_dir):
+        """행의 (템플릿 경로, 출력 경로) 목록
+
+        템플릿이 여러 개인데 전용 파일명 패턴이 없으면 기본 파일명에 템플릿 이름을 붙인다.
+        """
+        selected = self.select_templates(context)
+        outputs = []
+        for template_path, pattern in selected:
+            # 파일명 생성
+            try:
+                filename = (pattern or self.config["filename_pattern"]).format(**context)
+            except (KeyError, IndexError, ValueError) as e:
+                print(f"  행 {index+1}: 파일명 패턴에 필요한 필드 없음 {e}")
+                filename = f"application_{index+1}.xlsx"
+            if len(selected) > 1 and not pattern:
+                stem, ext = os.path.splitext(filename)
+                filename = f"{stem}_{Path(template_path).stem}{ext}"
+            outputs.append((template_path, os.path.join(output_dir, filename)))
+        return outputs
+
+    def plan_collisions(self, rows, output_dir):
+        """출력 경로 충돌/키 중복 사전 검사 (경로/키 해시 색인으로 한 번 순회)
+
+        rows: (행 번호, 컨텍스트) 반복자
+        collision_policy에 따라 뒤에 나온 행을 처리:
+          suffix - 충돌한 파일명에 _2, _3 ... 을 붙임 (키 중복은 보고만)
+          skip   - 뒤 행은 렌더링하지 않음
+          fail   - 충돌이 하나라도 있으면 렌더링을 시작하지 않음
+        반환: (행 번호 -> 바꾼 출력 목록, 행 번호 -> 건너뛰는 사유, 보고서용 요약)
+
+        행마다 남기는 것은 출력 경로 다이제스트(16바이트)/키와 처음 나온 행 번호뿐이고,
+        행 번호 목록과 경로 문자열은 실제로 충돌한 경로/키만 보관한다.
+        memory_limit_mb를 설정하면 행마다 남기는 색인도 임시 SQLite 파일에 둔다 (DiskIndex).
+        """
+        policy = self.config["collision_policy"]
+        key_field = self.config["photo_field"]
+        # 메모리 제한 모드면 행마다 늘어나는 색인을 임시 SQLite 파일에 보관
+        bounded = self.config.get("memory_limit_mb", 0) > 0
+        if bounded:
+            from memory_guard import DiskIndex
+            paths = DiskIndex(self.get_report_dir())
+            keys = DiskIndex(self.get_report_dir())
+        else:
+            # 처음 나온 행은 순회의 행 인덱스 객체를 그대로 보관 (행마다 새 정수를 만들지 않음)
+            paths = {}  # 정규화한 출력 경로 다이제스트 -> 처음 나온 행 인덱스
+            keys = {}   # 키 값 -> 처음 나온 행 인덱스
+        path_collisions = {}  # 충돌한 경로 다이제스트 -> [경로, 행 번호 목록]
+        key_collisions = {}   # 중복된 키 -> 행 번호 목록
+        overrides = {}
+        skipped = {}
+
+        def digest(path):
+            normalized = os.path.normcase(os.path.abspath(path))
+            return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
+        try:
+            for index, context in rows:
+                jobs = self.get_row_outputs(context, index, output_dir)
+                key = str(context.get(key_field, "")).strip()
+                first = keys.get(key) if key else None
+                duplicate_key = first is not None
+                if duplicate_key:
+                    key_collisions.setdefault(key, [first + 1]).append(index + 1)
+                elif key:
+                    keys[key] = index
+                colliding = []
+                for _, path in jobs:
+                    path_digest = digest(path)
+                    first = paths.get(path_digest)
+                    if first is not None:
+                        colliding.append(path)
+                        normalized = os.path.normcase(os.path.abspath(path))
+                        path_collisions.setdefault(path_digest, [normalized, [first + 1]])[1].append(index + 1)
+                    else:
+                        paths[path_digest] = index
+
+                if policy == "skip" and (colliding or duplicate_key):
+                    reasons = [f"출력 경로 중복: {os.path.basename(p)}" for p in colliding]
+                    if duplicate_key:
+                        reasons.append(f"{key_field} 중복: {key}")
+                    skipped[index] = ", ".join(reasons)
+                elif policy == "suffix" and colliding:
+                    renamed = []
+                    for template_path, path in jobs:
+                        if path in colliding:
+                            stem, ext = os.path.splitext(path)
+                            number = 2
+                            while digest(f"{stem}_{number}{ext}") in paths:
+                                number += 1
+                            path = f"{stem}_{number}{ext}"
+                            paths[digest(path)] = index
+                        renamed.append((template_path, path))
+                    overrides[index] = renamed
+        finally:
+            if bounded:
+                paths.close()
+                keys.close()
+
+        summary = {
+            "policy": policy,
+            "paths": [{"path": path, "rows": rows_} for path, rows_ in path_collisions.values()],
+            "keys": [{"key": key, "rows": rows_} for key, rows_ in key_collisions.items()],
+            "renamed": len(overrides),
+            "skipped": len(skipped),
+        }
+        return overrides, skipped, summary
+
+    def print_collisions(self, collisions):
+        """plan_collisions 요약 출력 - 충돌/키 중복이 있으면 True"""
+        if not (collisions["paths"] or collisions["keys"]):
+            return False
+        print(f"출력 경로 충돌 {len(collisions['paths'])}건, "
+              f"{self.config['photo_field']} 중복 {len(collisions['keys'])}건 (정책: {collisions['policy']})")
+        for item in collisions["paths"][:10]:
+            print(f"  - {os.path.basename(item['path'])}: 행 {item['rows']}")
+        for item in collisions["keys"][:10]:
+            print(f"  - {self.config['photo_field']} {item['key']}: 행 {item['rows']}")
+        return True
+
+    def get_shard_key(self, context, index):
+        """샤드 분배용 안정 키 (기본: 수험번호, 값이 없으면 행 번호)"""
+        key_field = self.config.get("shard_key_field") or self.config["photo_field"]
+        key = str(context.get(key_field, "")).strip()
+        return key if key else f"row-{index + 1}"
+
+    def get_report_dir(self):
+        """실행 보고서/매니페스트 저장 폴더"""
+        return self.config.get("report_dir") or os.path.join(self.config["output_dir"], "_runs")
+
+    def get_catalog_path(self):
+        """출력 카탈로그 파일 경로"""
+        return self.config.get("catalog_file") or os.path.join(self.get_report_dir(), "catalog.sqlite")
+
+    def write_run_report(self, report, manifest, shard=None):
+        """실행 보고서와 매니페스트를 JSON으로 저장 (샤드별 파일 분리)"""
+        report_dir = self.get_report_dir()
+        os.makedirs(report_dir, exist_ok=True)
+
+        suffix = f"_shard-{shard[0]}-of-{shard[1]}" if shard else ""
+        report_path = os.path.join(report_dir, f"report{suffix}.json")
+        manifest_path = os.path.join(report_dir, f"manifest{suffix}.json")
+
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            if isinstance(manifest, ManifestSpool):
+                manifest.write_json(f)
+            else:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        print(f"실행 보고서 저장: {report_path}")
+        return report_path, manifest_path
+
+    def process_all(self, shard=None, events=None, cancel_event=None):
+        """전체 처리 실행
+
+        shard: (i, N) 튜플이면 안정 키 기준으로 N개 중 i번째 몫의 행만 처리
+        events: 이벤트 콜백 sink(event) - RunEvents 참고 (GUI/CLI 진행률 표시용)
+        cancel_event: is_set()을 가진 취소 신호 (threading.Event 등)
+        """
+        run_events = RunEvents(events)
+        if cancel_event is not None:
+            self.cancel_event = cancel_event
+
         print("=" * 60)
         print("입사지원서 자동 작성 도구 시작")
+        if shard:
+            print(f"샤드 실행: {shard[0]}/{shard[1]}")
         print("=" * 60)
         
         # 파일 경로 확인
-        template_path = self.config["template_file"]
+        run_events.stage("check", "파일 확인 중...")
         raw_data_path = self.config["raw_data_file"]
         
-        if not os.path.exists(template_path):
-            print(f"템플릿 파일이 없습니다: {template_path}")
-            return
+        for path in self.get_template_paths():
+            if not os.path.exists(path):
+                print(f"템플릿 파일이 없습니다: {path}")
+                run_events.error(f"템플릿 파일이 없습니다: {path}")
+                return
             
         if not os.path.exists(raw_data_path):
             print(f"원천 데이터 파일이 없습니다: {raw_data_path}")
+            run_events.error(f"원천 데이터 파일이 없습니다: {raw_data_path}")
+            return
+        
+        # 렌더링 전 사전 검사 (필드 누락/잘못된 변환이면 시작하지 않음)
+        if self.config.get("preflight", True):
+            run_events.stage("check", "템플릿/데이터 사전 검사 중...")
+            problems = self.preflight()
+            if problems:
+                print(f"사전 검사 실패: {len(problems)}건 (python excel_template_filler.py check 로 확인)")
+                for problem in problems:
+                    print(f"  - {problem}")
+                run_events.error("사전 검사 실패:\n" + "\n".join(problems[:10]))
+                return
+        
+        # 렌더링 백엔드 결정 (Excel 확인은 여기서 한 번만, 행마다 다시 시도하지 않음)
+        try:
+            self.resolve_backend()
+        except RuntimeError as e:
+            print(e)
+            run_events.error(str(e))
             return
         
-        # 원천 데이터 로드
+        # 원천 데이터 열기 (CSV/JSONL/SQLite는 한 행씩 스트리밍)
+        # 스트리밍 원본은 사전 검사 순회와 렌더링에서 두 번 읽음 (작업자 모드는 공유 행 테이블을 만들 때 한 번)
         print(f"\n원천 데이터 로드: {raw_data_path}")
+        run_events.stage("load", "데이터 로드 중...")
         try:
-            df = pd.read_excel(
-                raw_data_path, 
-                sheet_name=self.config["raw_data_sheet"],
-                dtype=str  # 모든 컬럼을 문자열로 읽기
-            ).fillna("")
+            source = open_row_source(self.config, fields=self.projected_fields())
+            columns = source.columns()
             
-            print(f"데이터 로드 완료: {len(df)}행, {len(df.columns)}개 컬럼")
-            print(f"컬럼 목록: {list(df.columns)}")
+            print(f"데이터 원본: {source.describe()}")
+            loaded = source.selected(columns)
+            print(f"컬럼 {len(loaded)}/{len(columns)}개 로드")
+            print(f"컬럼 목록: {loaded}")
             
         except Exception as e:
             print(f"데이터 로드 실패: {e}")
+            run_events.error(f"데이터 로드 실패: {e}")
             return
         
+        # 작업자 모드는 읽은 행을 공유 메모리 테이블에 한 번 올리고 작업자에게는 행 번호만 전달
+        table = None
+        if self.config.get("workers", 0) > 0:
+            try:
+                from shared_rows import SharedRowTable
+                table = SharedRowTable.create(source.iter_rows())
+                print(f"공유 행 테이블: {table.rows}행, {table.size_mb:.1f}MB")
+            except Exception as e:
+                print(f"데이터 로드 실패: {e}")
+                run_events.error(f"데이터 로드 실패: {e}")
+                return
+        
+        def iter_source():
+            return source.iter_rows() if table is None else table.iter_rows()
+        
         # 출력 디렉토리 생성
         output_dir = self.config["output_dir"]
         os.makedirs(output_dir, exist_ok=True)
         
+        # 렌더링 전 사전 검사 - 전체 행을 한 번 훑으며 행 수, 출력 경로 충돌/키 중복(샤드와 무관하게 같은 결과),
+        # 데이터 품질(날짜 형식/자릿수/줄 수 - 샤드 실행은 자기 몫의 행만, merge에서 샤드별 결과를 합침)을 함께 확인
+        run_events.stage("check", "출력 경로 충돌/데이터 품질 검사 중...")
+        quality_check = None
+        if self.config.get("data_quality", "warn") != "off":
+            try:
+                from data_quality import QualityCheck
+                quality_check = QualityCheck(self)
+            except Exception as e:
+                print(f"데이터 품질 검사 실패: {e}")
+        scanned = {"rows": 0, "selected": 0, "quality": quality_check}
+        
+        def scan():
+            for index, context in enumerate(iter_source()):
+                scanned["rows"] += 1
+                if not shard or shard_of(self.get_shard_key(context, index), shard[1]) == shard[0]:
+                    scanned["selected"] += 1
+                    if scanned["quality"] is not None:
+                        try:
+                            scanned["quality"].add(index, context)
+                        except Exception as e:
+                            print(f"데이터 품질 검사 실패: {e}")
+                            scanned["quality"] = None
+                yield index, context
+        
+        try:
+            overrides, skipped, collisions = self.plan_collisions(scan(), output_dir)
+        except Exception as e:
+            print(f"원천 데이터 사전 검사 실패: {e}")
+            run_events.error(f"원천 데이터 사전 검사 실패: {e}")
+            if table is not None:
+                table.close()
+            return
+        total_rows = scanned["selected"]
+        print(f"원천 데이터 {scanned['rows']}행" + (f", 샤드 몫 {total_rows}행" if shard else ""))
+        if self.print_collisions(collisions):
+            if collisions["policy"] == "fail":
+                message = (f"출력 경로 충돌 {len(collisions['paths'])}건 / 키 중복 {len(collisions['keys'])}건 - "
+                           "collision_policy가 fail이므로 시작하지 않습니다")
+                print(message)
+                run_events.error(message)
+                if table is not None:
+                    table.close()
+                return
+        
+        # 데이터 품질 검사 결과 (잘못된 지원서가 만들어지기 전에 보고)
+        quality = None
+        if scanned["quality"] is not None:
+            try:
+                quality = scanned["quality"].finish(shard=shard)
+            except Exception as e:
+                print(f"데이터 품질 검사 실패: {e}")
+            if quality and quality["rows_with_issues"] and self.config["data_quality"] == "fail":
+                message = (f"데이터 품질 문제 {quality['rows_with_issues']}행 - "
+                           f"data_quality가 fail이므로 시작하지 않습니다 ({quality['file']})")
+                print(message)
+                run_events.error(message)
+                if table is not None:
+                    table.close()
+                return
+        
         # 각 행별로 지원서 생성
         print(f"\n지원서 생성 시작...")
-        success_count = 0
+        run_events.stage("render", "지원서 생성 중...")
+        run_events.run_started(total_rows, shard)
+        started_at = datetime.datetime.now()
+        start_time = time.perf_counter()
+        # memory_limit_mb가 있으면 매니페스트를 임시 파일에 기록 (행 수와 관계없이 메모리 일정)
+        bounded = self.config.get("memory_limit_mb", 0) > 0
+        manifest = ManifestSpool(self.get_report_dir()) if bounded else []
+        status_counts = {"success": 0, "failed": 0, "skipped": 0, "cancelled": 0}
+        memory = MemoryGuard(self.config.get("memory_limit_mb", 0), self.config.get("memory_sample_rows", 100))
         
-        for index, row in df.iterrows():
-            try:
-                # 컨텍스트 생성 (행 데이터를 딕셔너리로 변환)
-                context = row.to_dict()
-                
-                # 파일명 생성
-                try:
-                    filename = self.config["filename_pattern"].format(**context)
-                except KeyError as e:
-                    print(f"  행 {index+1}: 파일명 패턴에 필요한 필드 없음 {e}")
-                    filename = f"application_{index+1}.xlsx"
-                
-                output_path = os.path.join(output_dir, filename)
-                
-                print(f"\n 행 {index+1}/{len(df)} 처리 중...")
-                print(f"  대상: {context.get('이름', 'Unknown')}")
-                
-                # 템플릿 채우기
-                self.fill_workbook(template_path, context, output_path)
-                success_count += 1
+        seen = [0]
+        
+        def tasks():
+            """처리 대상 행 (샤드 지정 시 해당 몫만) - 원본에서 한 행씩 읽음"""
+            for index, context in enumerate(iter_source()):
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    print("\n사용자 취소로 처리를 중단합니다.")
+                    return
+                seen[0] += 1
                 
+                # 다른 샤드 몫의 행은 건너뛰기
+                shard_key = self.get_shard_key(context, index)
+                if shard and shard_of(shard_key, shard[1]) != shard[0]:
+                    continue
+                if index in skipped:
+                    # 충돌 정책(skip)으로 건너뛰는 행 - 렌더링 없이 매니페스트에만 기록
+                    print(f"\n 행 {index+1} 건너뜀: {skipped[index]}")
+                    manifest.append({
+                        "row": index + 1, "key": shard_key, "name": context.get('이름', ''),
+                        "outputs": [], "status": "skipped", "error": skipped[index],
+                    })
+                    status_counts["skipped"] += 1
+                    run_events.row(index, context.get('이름', ''), "skipped")
+                    continue
+                yield index, shard_key, context, overrides.get(index)
+        
+        # workers > 0 이면 감시되는 작업 프로세스에서 렌더링 (행별 제한 시간, 작업자 재활용)
+        supervisor = None
+        if self.config.get("workers", 0) > 0:
+            from render_workers import WorkerSupervisor
+            supervisor = WorkerSupervisor(self, self.cancel_event, table)
+            results = supervisor.run(tasks(), output_dir)
+        else:
+            results = self.render_rows_inline(tasks(), output_dir, total_rows)
+        
+        # 묶음 PDF (PDF가 만들어지는 대로 이어 붙임)
+        bundler = None
+        if self.config.get("pdf_bundle") and self.config.get("save_pdf", True):
+            if self.pdf_available():
+                from pdf_bundle import PdfBundler
+                bundler = PdfBundler(
+                    output_dir,
+                    self.config["pdf_bundle_file"],
+                    self.config.get("pdf_bundle_group_field", ""),
+                    suffix=f"_shard-{shard[0]}-of-{shard[1]}" if shard else "",
+                )
+            else:
+                print("  PDF를 저장할 수 없어 묶음 PDF를 만들지 않습니다 (Excel 필요)")
+        
+        # 출력 카탈로그 (실패해도 렌더링은 계속, 기록하지 못한 출력 수는 보고서에 남김)
+        catalog = None
+        catalog_missed = 0
+        run_id = f"{started_at.isoformat(timespec='seconds')}_{socket.gethostname()}_{os.getpid()}"
+        if self.config.get("catalog", True):
+            try:
+                from output_catalog import OutputCatalog
+                catalog = OutputCatalog(self.get_catalog_path())
             except Exception as e:
-                print(f" 행 {index+1} 처리 실패: {e}")
-                continue
+                print(f"  카탈로그를 열 수 없습니다: {e}")
+        
+        try:
+            for index, shard_key, context, status, outputs, error, render_ms in results:
+                if bundler is not None and status == "success":
+                    for output_path in outputs:
+                        # 책갈피 이름은 filename_pattern으로 만든 파일명
+                        title = os.path.splitext(os.path.basename(output_path))[0]
+                        bundler.add(output_path.replace('.xlsx', '.pdf'), title, context)
+                entry = {
+                    "row": index + 1,
+                    "key": shard_key,
+                    "name": context.get('이름', ''),
+                    "outputs": outputs,
+                    "status": status,
+                    "error": error,
+                }
+                manifest.append(entry)
+                status_counts[status] += 1
+                if status == "success" and catalog is not None:
+                    try:
+                        catalog.add(run_id, entry, row_fingerprint(context), render_ms, self.backend)
+                    except Exception as e:
+                        # 잠금 외의 DB 오류 (손상 등) - 보류 중이던 기록과 이후 행은 기록하지 못함
+                        print(f"  카탈로그 기록 실패 - 이후 행은 카탈로그에 기록하지 않습니다: {e}")
+                        catalog_missed += catalog.unrecorded()
+                        catalog = None
+                elif status == "success" and self.config.get("catalog", True):
+                    catalog_missed += len(outputs)
+                run_events.row(index, entry["name"], status)
+                
+                # N행마다 메모리 기록 (상한 근처면 정리/작업자 축소)
+                if memory.due(run_events.done):
+                    extra_mb = supervisor.worker_rss_mb() if supervisor is not None else 0.0
+                    state = memory.sample(run_events.done, extra_mb)
+                    if bounded:
+                        self.relieve_memory(state, supervisor)
+                del entry, context, outputs
+        finally:
+            # 작업자를 모두 종료한 뒤 공유 행 테이블 삭제
+            results.close()
+            if table is not None:
+                table.close()
         
+        # 작업자는 끝나는 순서대로 결과를 돌려주므로 행 순서로 정렬 (ManifestSpool은 저장할 때 정렬)
+        if not bounded:
+            manifest.sort(key=lambda e: e["row"])
+        
+        report = {
+            "shard": list(shard) if shard else None,
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "finished_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "elapsed_sec": round(time.perf_counter() - start_time, 3),
+            "output_dir": os.path.abspath(output_dir),
+            "total_rows": seen[0],
+            "selected_rows": len(manifest),
+            "success": status_counts["success"],
+            "failed": status_counts["failed"],
+            "skipped": status_counts["skipped"],
+            "cancelled": status_counts["cancelled"] > 0,
+            "backend": self.backend,
+            "collisions": collisions,
+        }
+        if quality is not None:
+            report["data_quality"] = {key: value for key, value in quality.items() if key != "row_issues"}
+        if memory.samples or bounded or not memory.rss_available:
+            report["memory"] = memory.summary()
+        if supervisor is not None:
+            report["workers"] = supervisor.stats
+        if bundler is not None:
+            report["pdf_bundles"] = bundler.close()
+        if catalog is not None:
+            try:
+                catalog_missed += catalog.finish_run(run_id, report)
+                catalog.close()
+                report["catalog"] = os.path.abspath(self.get_catalog_path())
+            except Exception as e:
+                print(f"  카탈로그 저장 실패: {e}")
+                catalog_missed += catalog.unrecorded()
+        if catalog_missed:
+            print(f"  경고: 출력 {catalog_missed}건을 카탈로그에 기록하지 못했습니다 (find 검색에서 빠짐)")
+            report["catalog_unrecorded"] = catalog_missed
+        run_events.stage("report", "실행 보고서 저장 중...")
+        self.write_run_report(report, manifest, shard)
+        if bounded:
+            manifest.close()
+
         print("\n" + "=" * 60)
-        print(f"처리 완료! 총 {success_count}/{len(df)}개 파일 생성")
+        print(f"처리 완료! 총 {status_counts['success']}/{len(manifest)}개 파일 생성")
         print(f"출력 폴더: {os.path.abspath(output_dir)}")
         print("=" * 60)
+        run_events.run_finished(report)
+        return report
+
+    def merge_run_reports(self, report_dir=None):
+        """샤드별 실행 보고서와 매니페스트를 하나로 병합"""
+        report_dir = report_dir or self.get_report_dir()
+        report_files = sorted(Path(report_dir).glob("report_shard-*-of-*.json"))
+        if not report_files:
+            print(f"병합할 샤드 보고서가 없습니다: {report_dir}")
+            return None
+
+        reports = []
+        manifest = []
+        for report_file in report_files:
+            with open(report_file, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+            manifest_file = report_file.with_name(report_file.name.replace("report_", "manifest_", 1))
+            if manifest_file.exists():
+                with open(manifest_file, 'r', encoding='utf-8') as f:
+                    manifest.extend(json.load(f))
+            else:
+                print(f"  매니페스트 없음: {manifest_file.name}")
+            reports.append(report)
+
+        # 샤드 구성 확인 (N이 모두 같고 1..N이 모두 있어야 완전한 실행)
+        counts = {r["shard"][1] for r in reports}
+        if len(counts) > 1:
+            print(f"  경고: 서로 다른 샤드 수가 섞여 있습니다: {sorted(counts)}")
+        shard_count = max(counts)
+        present = {r["shard"][0] for r in reports if r["shard"][1] == shard_count}
+        missing = [i for i in range(1, shard_count + 1) if i not in present]
+        if missing:
+            print(f"  경고: 누락된 샤드: {missing}")
+
+        # 같은 출력 경로를 여러 행이 사용한 경우 (덮어쓰기 발생)
+        outputs = {}
+        for entry in manifest:
+            for path in entry.get("outputs", []):
+                outputs.setdefault(path, []).append(entry["row"])
+        collisions = {path: rows for path, rows in outputs.items() if len(rows) > 1}
+
+        manifest.sort(key=lambda e: e["row"])
+        merged = {
+            "shard_count": shard_count,
+            "shards": sorted(present),
+            "missing_shards": missing,
+            "hosts": sorted({r["host"] for r in reports}),
+            "started_at": min(r["started_at"] for r in reports),
+            "finished_at": max(r["finished_at"] for r in reports),
+            "max_elapsed_sec": max(r["elapsed_sec"] for r in reports),
+            "total_rows": max(r["total_rows"] for r in reports),
+            "selected_rows": sum(r["selected_rows"] for r in reports),
+            "success": sum(r["success"] for r in reports),
+            "failed": sum(r["failed"] for r in reports),
+            "output_collisions": collisions,
+        }
+        # 샤드별 데이터 품질 검사 결과 병합 (data_quality.json)
+        from data_quality import merge_data_quality
+        quality = merge_data_quality(report_dir, shard_count)
+        if quality is not None:
+            merged["data_quality"] = {key: value for key, value in quality.items() if key != "row_issues"}
+        self.write_run_report(merged, manifest)
+
+        print(f"샤드 {len(reports)}개 병합 완료: 성공 {merged['success']}/{merged['selected_rows']}건")
+        if merged["selected_rows"] != merged["total_rows"]:
+            print(f"  경고: 처리 대상 {merged['selected_rows']}행 != 전체 {merged['total_rows']}행")
+        if collisions:
+            print(f"  경고: 출력 경로 충돌 {len(collisions)}건")
+        return merged
     
+
+    def read_raw_columns(self):
+        """원천 데이터의 컬럼 목록만 읽기 (헤더만 읽음, 전체 로드 없음)"""
+        return open_row_source(self.config).columns()
+
+    def collect_field_references(self):
+        """템플릿/설정이 참조하는 필드와 변환 오류 수집
+
+        반환: (references, problems)
+          references: [(필드, 위치)] - 원천 데이터에 있어야 하는 필드
+          problems: [문자열] - 알 수 없는 변환, 잘못된 인자, 템플릿 로드 실패
+        """
+        from openpyxl.utils import get_column_letter
+        
+        references = []
+        problems = []
+        # 사진 플레이스홀더({{사진}})는 데이터 컬럼이 아님
+        photo_fields = {
+            seg[0] for seg in compile_text(self.config["photo_placeholder"]) if isinstance(seg, tuple)
+        }
+
+        def add_pipe(pipe, where):
+            for name, param, error in compile_pipe(pipe):
+                if error:
+                    problems.append(f"{where}: {error}")
+                elif name == "combine":
+                    other_field, _, third = param
+                    references.append((other_field, f"{where} (combine 인자)"))
+                    if third and third[0] == "pipe":
+                        add_pipe(third[1], where)
+
+        for template_path in self.get_template_paths():
+            if not os.path.exists(template_path):
+                problems.append(f"템플릿 파일이 없습니다: {template_path}")
+                continue
+            try:
+                template = self.templates.get(template_path)
+            except Exception as e:
+                problems.append(f"템플릿 로드 실패: {template_path} ({e})")
+                continue
+            name = os.path.basename(template_path)
+            for sheet_name, row, col, _, segments in template.cells:
+                where = f"{name}:{sheet_name}!{get_column_letter(col)}{row}"
+                for seg in segments:
+                    if not isinstance(seg, tuple):
+                        continue
+                    field, pipe = seg
+                    if field not in photo_fields:
+                        references.append((field, where))
+                    add_pipe(pipe, where)
+
+        patterns = [("filename_pattern", self.config["filename_pattern"])]
+        for i, rule in enumerate(self.config.get("template_rules", [])):
+            for field in rule.get("when", {}):
+                references.append((field, f"template_rules[{i}].when"))
+            for spec in rule.get("templates", []):
+                if isinstance(spec, dict) and spec.get("filename_pattern"):
+                    patterns.append((f"template_rules[{i}].filename_pattern", spec["filename_pattern"]))
+        for where, pattern in patterns:
+            try:
+                for _, field, _, _ in string.Formatter().parse(pattern):
+                    if field:
+                        references.append((field, where))
+            except ValueError as e:
+                problems.append(f"{where}: 형식 오류 ({e})")
+
+        references.append((self.config["photo_field"], "photo_field"))
+        if self.config.get("pdf_bundle") and self.config.get("pdf_bundle_group_field"):
+            references.append((self.config["pdf_bundle_group_field"], "pdf_bundle_group_field"))
+        if self.config.get("shard_key_field"):
+            references.append((self.config["shard_key_field"], "shard_key_field"))
+        return references, problems
+
+    def projected_fields(self):
+        """원천 데이터에서 읽을 컬럼 집합 (column_projection이 꺼져 있으면 None = 전체)
+
+        플레이스홀더, combine 인자, 파일명 패턴, 템플릿 규칙, photo_field, shard_key_field가
+        참조하는 필드와 진행 표시에 쓰는 '이름'
+        """
+        if not self.config.get("column_projection", True):
+            return None
+        references, _ = self.collect_field_references()
+        return {field for field, _ in references} | {"이름"}
+
+    def preflight(self):
+        """렌더링 전 템플릿/데이터 정합성 검사 - 문제 목록 반환 (빈 목록이면 통과)"""
+        problems = []
+        raw_data_path = self.config["raw_data_file"]
+        
+        references, reference_problems = self.collect_field_references()
+        problems.extend(reference_problems)
+        
+        if not os.path.exists(raw_data_path):
+            problems.append(f"원천 데이터 파일이 없습니다: {raw_data_path}")
+            return problems
+        try:
+            columns = set(self.read_raw_columns())
+        except Exception as e:
+            problems.append(f"원천 데이터 헤더 읽기 실패: {e}")
+            return problems
+        
+        # 없는 컬럼별로 참조 위치를 모아서 보고 (1:N 조인 필드는 '경력[3].회사' -> '경력[0].회사'로 확인)
+        missing = OrderedDict()
+        for field, where in references:
+            if field not in columns and re.sub(r"\[\d+\]\.", "[0].", field) not in columns:
+                missing.setdefault(field, []).append(where)
+        for field, places in missing.items():
+            shown = ", ".join(places[:5]) + (f" 외 {len(places) - 5}곳" if len(places) > 5 else "")
+            problems.append(f"원천 데이터에 없는 필드 '{field}': {shown}")
+        return problems
+
+    def run_check(self):
+        """check 명령 - 검사 결과 출력, 통과 여부 반환"""
+        print("템플릿/데이터 사전 검사 중...")
+        problems = self.preflight()
+        if problems:
+            print(f"\n검사 실패: {len(problems)}건")
+            for problem in problems:
+                print(f"  - {problem}")
+            return False
+        print("검사 통과: 모든 참조 필드와 변환이 유효합니다.")
+        
+        if self.config.get("data_quality", "warn") == "off":
+            return True
+        from data_quality import check_data_quality
+        print("\n데이터 품질 검사 중...")
+        source = open_row_source(self.config, fields=self.projected_fields())
+        quality = check_data_quality(self, enumerate(source.iter_rows()))
+        # 품질 문제는 data_quality가 fail일 때만 검사 실패로 처리
+        return not (quality["rows_with_issues"] and self.config["data_quality"] == "fail")
+
     def show_sample_data(self, rows=3):
-        """원천 데이터 샘플 출력"""
+        """원천 데이터 샘플 출력 (profile 명령과 같은 내용, 앞 rows행)"""
         raw_data_path = self.config["raw_data_file"]
         
         if not os.path.exists(raw_data_path):
             print(f"원천 데이터 파일이 없습니다: {raw_data_path}")
             return
-            
-        df = pd.read_excel(raw_data_path, sheet_name=self.config["raw_data_sheet"])
-        print(f"\n원천 데이터 샘플 ({raw_data_path}):")
-        print("-" * 50)
-        print(f"총 {len(df)}행, {len(df.columns)}개 컬럼")
-        print(f"컬럼: {list(df.columns)}")
-        print(f"\n상위 {rows}행:")
-        print(df.head(rows).to_string(index=False))
+        
+        from data_profile import run_profile
+        run_profile(self, head=rows)
+
+
+def pop_option(args, name):
+    """명령행 인자 목록에서 '--name 값' 또는 '--name=값' 옵션을 꺼내 반환"""
+    for i, arg in enumerate(args):
+        if arg == name and i + 1 < len(args):
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        if arg.startswith(name + "="):
+            del args[i]
+            return arg.split("=", 1)[1]
+    return None
 
 
 def main():
     """메인 실행 함수"""
-    filler = ExcelTemplateFiller()
+    try:
+        filler = ExcelTemplateFiller()
+    except ConfigError as e:
+        print(e)
+        sys.exit(2)
     
     # 명령행 인자 처리
-    import sys
+    args = sys.argv[1:]
     
-    if len(sys.argv) > 1:
-        command = sys.argv[1].lower()
+    shard_spec = pop_option(args, "--shard")
+    shard = None
+    if shard_spec:
+        try:
+            shard = parse_shard_spec(shard_spec)
+        except ValueError as e:
+            print(e)
+            sys.exit(2)
+    
+    if args:
+        command = args[0].lower()
         if command == "sample":
             filler.show_sample_data()
             return
+        elif command == "profile":
+            # python excel_template_filler.py profile [--refresh]
+            if not os.path.exists(filler.config["raw_data_file"]):
+                print(f"원천 데이터 파일이 없습니다: {filler.config['raw_data_file']}")
+                sys.exit(1)
+            from data_profile import run_profile
+            run_profile(filler, refresh="--refresh" in args)
+            return
         elif command == "config":
             print("현재 설정:")
             print(json.dumps(filler.config, ensure_ascii=False, indent=2))
             return
+        elif command == "check":
+            # 렌더링 없이 템플릿/데이터 정합성만 검사 (실패 시 종료 코드 1)
+            sys.exit(0 if filler.run_check() else 1)
+        elif command == "watch":
+            # 입력 변경 시 영향받은 지원자만 재생성 (Ctrl+C로 종료)
+            from watch_mode import watch
+            watch()
+            return
+        elif command == "serve":
+            # 템플릿을 메모리에 유지한 로컬 렌더링 서비스 (POST /render)
+            from render_service import serve
+            serve()
+            return
+        elif command == "preview":
+            # python excel_template_filler.py preview <행 번호 또는 키> [--no-open]
+            open_file = "--no-open" not in args
+            selector = " ".join(arg for arg in args[1:] if arg != "--no-open").strip()
+            if not selector:
+                print("사용법: python excel_template_filler.py preview <행 번호 또는 키> [--no-open]")
+                sys.exit(2)
+            from preview import preview_row
+            sys.exit(0 if preview_row(filler, selector, open_file) else 1)
+        elif command == "bench":
+            # python excel_template_filler.py bench [행 수] | bench --synthetic <행 수>
+            from bench import run_bench, run_synthetic
+            synthetic = "--synthetic" in args
+            rest = [arg for arg in args[1:] if arg != "--synthetic"]
+            try:
+                rows = int(rest[0]) if rest else (100000 if synthetic else 20)
+            except ValueError:
+                print("사용법: python excel_template_filler.py bench [행 수] | bench --synthetic <행 수>")
+                sys.exit(2)
+            if synthetic:
+                sys.exit(0 if run_synthetic(filler, rows) else 1)
+            sys.exit(0 if run_bench(filler, rows) else 1)
+        elif command == "find":
+            # python excel_template_filler.py find <수험번호 또는 이름> [--open]
+            open_first = "--open" in args
+            query = " ".join(arg for arg in args[1:] if arg != "--open").strip()
+            if not query:
+                print("사용법: python excel_template_filler.py find <수험번호 또는 이름> [--open]")
+                sys.exit(2)
+            from output_catalog import run_find
+            sys.exit(0 if run_find(filler.get_catalog_path(), query, open_first) else 1)
+        elif command == "merge":
+            # python excel_template_filler.py merge [보고서 폴더]
+            merged = filler.merge_run_reports(args[1] if len(args) > 1 else None)
+            if merged is None or merged["missing_shards"]:
+                sys.exit(1)
+            return
     
-    # 기본 실행
-    filler.process_all()
-
+    # 기본 실행 (--shard i/N 지정 시 해당 샤드만 처리)
+    report = filler.process_all(shard=shard, events=console_event_sink)
+    if report is None:
+        # 파일 누락/사전 검사 실패 등으로 렌더링을 시작하지 못함
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
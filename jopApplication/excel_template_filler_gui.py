@@ -4,21 +4,25 @@
 
 import os
 import sys
+import queue
 import threading
 import time
 import subprocess
 from pathlib import Path
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog
+
+# 핵심 로직(excel_template_filler)은 창을 띄운 뒤 백그라운드 스레드에서 임포트
+
+# 작업 스레드 이벤트를 화면에 반영하는 주기 (약 30fps)
+UI_FRAME_MS = 33
 
-# 핵심 로직이 작성된 스크립트 임포트
-from excel_template_filler import ExcelTemplateFiller
 
 class ProgressGUI:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("입사지원서 자동 작성 도구")
-        self.root.geometry("400x200")
+        self.root.geometry("580x200")
         self.root.resizable(False, False)
         
         # 윈도우를 화면 중앙에 배치
@@ -31,6 +35,15 @@ class ProgressGUI:
         self.current_step = 0
         self.total_steps = 0
         self.is_running = False
+        self.engine = None  # 백그라운드에서 로드한 excel_template_filler 모듈
+        self.config = None  # 엔진과 공유하는 검증된 설정 객체
+        self.preview_filler = None    # 미리보기용 엔진 (컴파일된 템플릿 재사용)
+        self.preview_snapshot = None  # 미리보기용 원천 데이터 스냅샷
+        
+        # 작업 스레드 -> Tk 메인 루프 이벤트 큐 (위젯은 메인 루프에서만 갱신)
+        self.event_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.root.after(UI_FRAME_MS, self.drain_events)
         
     def center_window(self):
         """윈도우를 화면 중앙에 배치"""
@@ -103,33 +116,108 @@ class ProgressGUI:
             width=12,
             state="disabled"
         )
-        self.cancel_button.grid(row=0, column=1, padx=(10, 0))
+        self.cancel_button.grid(row=0, column=1, padx=(10, 10))
+        
+        # 지원서 찾기 버튼 (출력 카탈로그 검색)
+        self.find_button = ttk.Button(
+            button_frame,
+            text="지원서 찾기",
+            command=self.show_find_dialog,
+            width=12,
+            state="disabled"
+        )
+        self.find_button.grid(row=0, column=2, padx=(0, 10))
+        
+        # 미리보기 버튼 (지원자 한 명만 렌더링해 열기)
+        self.preview_button = ttk.Button(
+            button_frame,
+            text="미리보기",
+            command=self.start_preview,
+            width=10,
+            state="disabled"
+        )
+        self.preview_button.grid(row=0, column=3)
         
         # 그리드 가중치 설정
         main_frame.columnconfigure(0, weight=1)
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
         
+    def post_event(self, kind, *args):
+        """작업 스레드에서 UI 이벤트 전달 (어느 스레드에서든 호출 가능)"""
+        self.event_queue.put((kind, args))
+
+    def drain_events(self):
+        """큐에 쌓인 이벤트를 한 프레임에 모아 반영 (메인 루프 타이머)"""
+        latest_status = None
+        latest_progress = None
+        try:
+            while True:
+                kind, args = self.event_queue.get_nowait()
+                # 상태/진행률은 마지막 값만 반영하고 나머지 이벤트는 순서대로 처리
+                if kind == "status":
+                    latest_status = args[0]
+                elif kind == "progress":
+                    latest_progress = args
+                else:
+                    if latest_status is not None:
+                        self.update_status(latest_status)
+                        latest_status = None
+                    if latest_progress is not None:
+                        self.update_progress(*latest_progress)
+                        latest_progress = None
+                    self.handle_event(kind, args)
+        except queue.Empty:
+            pass
+
+        if latest_status is not None:
+            self.update_status(latest_status)
+        if latest_progress is not None:
+            self.update_progress(*latest_progress)
+
+        self.root.after(UI_FRAME_MS, self.drain_events)
+
+    def handle_event(self, kind, args):
+        """상태/진행률 이외의 이벤트 처리"""
+        if kind == "error":
+            messagebox.showerror("오류", f"처리 중 오류가 발생했습니다:\n\n{args[0]}")
+        elif kind == "completed":
+            self.show_completion_dialog(*args)
+        elif kind == "finished":
+            self.is_running = False
+            self.reset_ui()
+        elif kind == "engine_ready":
+            message, ready = args
+            self.status_label.config(text=message)
+            self.start_button.config(state="normal" if ready else "disabled")
+            self.find_button.config(state="normal" if self.config is not None else "disabled")
+            self.preview_button.config(state="normal" if ready else "disabled")
+        elif kind == "preview_done":
+            self.preview_button.config(state="normal")
+
+    def report_status(self, message):
+        """작업 스레드용 상태 메시지 전달"""
+        print(f"{message}")  # 콘솔에만 로그 출력
+        self.post_event("status", message)
+
     def update_status(self, message):
-        """상태 메시지 업데이트"""
+        """상태 메시지 업데이트 (메인 루프 전용)"""
         self.status_label.config(text=message)
-        print(f"{message}")  # 콘솔에만 로그 출력
         
     def update_progress(self, current, total, message=""):
-        """진행률 업데이트"""
+        """진행률 업데이트 (메인 루프 전용)"""
         if total > 0:
             progress = (current / total) * 100
             self.progress_var.set(progress)
-            self.progress_text.config(text=f"{progress:.1f}% ({current}/{total})")
+            self.progress_text.config(text=f"{progress:.1f}% ({current:.0f}/{total})")
             
             if message:
                 self.update_status(message)
         
-        self.root.update_idletasks()
-        
     def start_processing(self):
         """처리 시작"""
         self.is_running = True
+        self.cancel_event.clear()
         self.start_button.config(state="disabled")
         self.cancel_button.config(state="normal")
         
@@ -139,10 +227,10 @@ class ProgressGUI:
         self.processing_thread.start()
         
     def cancel_processing(self):
-        """처리 취소"""
-        self.is_running = False
-        self.update_status("처리가 취소되었습니다")
-        self.reset_ui()
+        """처리 취소 (진행 중인 행도 중단, UI 리셋은 작업 종료 이벤트에서)"""
+        self.cancel_event.set()
+        self.cancel_button.config(state="disabled")
+        self.update_status("취소 중...")
         
     def reset_ui(self):
         """UI 초기 상태로 리셋"""
@@ -151,104 +239,58 @@ class ProgressGUI:
         self.progress_var.set(0)
         self.progress_text.config(text="0%")
         
+    def on_engine_event(self, event):
+        """엔진 실행 이벤트를 UI 이벤트로 변환 (작업 스레드에서 호출됨)"""
+        kind = event["kind"]
+        if kind == "stage":
+            self.report_status(event["message"])
+        elif kind == "row" and not event["total"]:
+            # 전체 건수를 모르는 경우 (스트리밍 원본)
+            self.post_event(
+                "status",
+                f"{event['name']} 지원서 생성 중... ({event['done']}건, {event['rate']:.1f}건/초)"
+            )
+        elif kind == "row":
+            eta = event["eta_sec"]
+            eta_text = f", 남은 시간 {int(eta // 60):02d}:{int(eta % 60):02d}" if eta is not None else ""
+            self.post_event("progress", event["done"], event["total"])
+            self.post_event(
+                "status",
+                f"{event['name']} 지원서 생성 중... ({event['done']}/{event['total']}, "
+                f"{event['rate']:.1f}건/초{eta_text})"
+            )
+        elif kind == "error":
+            self.post_event("error", event["message"])
+
     def run_processing(self):
-        """실제 처리 실행 (별도 스레드)"""
+        """실제 처리 실행 (별도 스레드) - 엔진 배치 루프를 그대로 사용"""
         try:
-            # 1단계: 초기화 및 파일 확인
-            self.update_status("파일 확인 중...")
-            self.update_progress(1, 10, "설정 파일 로드 중...")
-            
-            filler = ExcelTemplateFiller()
+            self.report_status("설정 파일 로드 중...")
+            config = self.engine.load_config()
+            filler = self.engine.ExcelTemplateFiller(config=config)
             
-            # 파일 경로 확인
-            template_path = filler.config["template_file"]
-            raw_data_path = filler.config["raw_data_file"]
-            
-            if not os.path.exists(template_path):
-                raise FileNotFoundError(f"템플릿 파일이 없습니다: {template_path}")
-                
-            if not os.path.exists(raw_data_path):
-                raise FileNotFoundError(f"원천 데이터 파일이 없습니다: {raw_data_path}")
-            
-            self.update_progress(2, 10, "파일 확인 완료")
-            
-            # 2단계: 데이터 로드
-            self.update_status("데이터 로드 중...")
-            
-            import pandas as pd
-            df = pd.read_excel(
-                raw_data_path, 
-                sheet_name=filler.config["raw_data_sheet"],
-                dtype=str
-            ).fillna("")
-            
-            total_applicants = len(df)
-            print(f"데이터 로드 완료: {total_applicants}명의 지원자")
-            print(f"컬럼 목록: {list(df.columns)}")
-            
-            self.update_progress(3, 10, f"{total_applicants}명 지원자 데이터 로드 완료")
-            
-            if not self.is_running:
+            report = filler.process_all(events=self.on_engine_event, cancel_event=self.cancel_event)
+            if report is None:
+                # 파일 누락/로드 실패는 error 이벤트로 이미 전달됨
                 return
-                
-            # 3단계: 출력 디렉토리 생성
-            output_dir = filler.config["output_dir"]
-            os.makedirs(output_dir, exist_ok=True)
-            self.update_progress(4, 10, "출력 폴더 준비 완료")
-            
-            # 4단계: 각 지원자별 처리
-            success_count = 0
             
-            for index, row in df.iterrows():
-                if not self.is_running:
-                    break
-                    
-                try:
-                    # 진행률 계산 (4~9단계를 지원자 처리에 할당)
-                    progress_step = 4 + ((index + 1) / total_applicants) * 5
-                    
-                    context = row.to_dict()
-                    applicant_name = context.get('이름', f'지원자{index+1}')
-                    
-                    self.update_progress(
-                        progress_step, 10, 
-                        f"{applicant_name} 지원서 생성 중... ({index+1}/{total_applicants})"
-                    )
-                    
-                    # 파일명 생성
-                    try:
-                        filename = filler.config["filename_pattern"].format(**context)
-                    except KeyError as e:
-                        print(f"파일명 패턴 오류 (행 {index+1}): {e}")
-                        filename = f"application_{index+1}.xlsx"
-                    
-                    output_path = os.path.join(output_dir, filename)
-                    
-                    # 지원서 생성
-                    filler.fill_workbook(template_path, context, output_path)
-                    success_count += 1
-                    
-                    print(f"{applicant_name} 지원서 완료: {filename}")
-                    
-                except Exception as e:
-                    print(f"{applicant_name} 처리 실패: {e}")
-                    continue
-            
-            if not self.is_running:
+            if report["cancelled"] or self.cancel_event.is_set():
+                self.report_status("처리가 취소되었습니다")
                 return
                 
-            # 5단계: 완료
-            self.update_progress(10, 10, "모든 처리 완료!")
+            self.report_status("모든 처리 완료!")
             
             # 완료 팝업 표시
-            self.show_completion_dialog(success_count, total_applicants, output_dir)
+            self.post_event(
+                "completed", report["success"], report["selected_rows"] - report.get("skipped", 0), report["output_dir"]
+            )
             
         except Exception as e:
             print(f"처리 중 오류 발생: {e}")
-            messagebox.showerror("오류", f"처리 중 오류가 발생했습니다:\n\n{e}")
+            self.post_event("error", str(e))
             
         finally:
-            self.reset_ui()
+            self.post_event("finished")
             
     def show_completion_dialog(self, success_count, total_count, output_dir):
         """완료 대화상자 표시"""
@@ -324,35 +366,134 @@ class ProgressGUI:
         dialog.bind('<Return>', lambda e: dialog.destroy())
         dialog.focus()
         
-    def run(self):
-        """GUI 실행"""
-        # 초기 상태 확인
+    def show_find_dialog(self):
+        """출력 카탈로그에서 수험번호/이름으로 지원서를 찾아 여는 대화상자"""
+        from output_catalog import OutputCatalog, open_path
+        
+        catalog_path = self.engine.ExcelTemplateFiller(config=self.config).get_catalog_path()
+        if not os.path.exists(catalog_path):
+            messagebox.showinfo("지원서 찾기", "아직 생성 기록이 없습니다.\n지원서를 생성한 후 다시 시도해주세요.")
+            return
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("지원서 찾기")
+        dialog.geometry("560x320")
+        dialog.transient(self.root)
+        
+        frame = ttk.Frame(dialog, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        # 검색어 입력
+        search_frame = ttk.Frame(frame)
+        search_frame.pack(fill=tk.X, pady=(0, 8))
+        ttk.Label(search_frame, text="수험번호 또는 이름:").pack(side=tk.LEFT)
+        query_var = tk.StringVar()
+        entry = ttk.Entry(search_frame, textvariable=query_var)
+        entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        
+        # 검색 결과 목록
+        listbox = tk.Listbox(frame, height=10)
+        listbox.pack(fill=tk.BOTH, expand=True)
+        results = []
+        
+        def search(event=None):
+            query = query_var.get().strip()
+            listbox.delete(0, tk.END)
+            results.clear()
+            if not query:
+                return
+            catalog = OutputCatalog(catalog_path)
+            try:
+                results.extend(catalog.find(query))
+            finally:
+                catalog.close()
+            for result in results:
+                kind = "PDF" if result["pdf_path"] else "xlsx"
+                listbox.insert(tk.END, f"{result['key']}  {result['name']}  [{kind}]  {os.path.basename(result['xlsx_path'])}")
+            if not results:
+                listbox.insert(tk.END, "검색 결과가 없습니다.")
+        
+        def open_selected(event=None):
+            selection = listbox.curselection()
+            if not selection or selection[0] >= len(results):
+                return
+            result = results[selection[0]]
+            try:
+                open_path(result["pdf_path"] or result["xlsx_path"])
+            except Exception as e:
+                messagebox.showerror("오류", f"파일을 열 수 없습니다:\n\n{e}", parent=dialog)
+        
+        ttk.Button(search_frame, text="검색", command=search).pack(side=tk.LEFT)
+        btn_frame = ttk.Frame(frame)
+        btn_frame.pack(pady=(8, 0))
+        ttk.Button(btn_frame, text="열기", command=open_selected).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="닫기", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+        
+        entry.bind('<Return>', search)
+        listbox.bind('<Double-Button-1>', open_selected)
+        entry.focus()
+        
+    def start_preview(self):
+        """행 번호 또는 수험번호를 물어 지원자 한 명 미리보기"""
+        selector = simpledialog.askstring("미리보기", "행 번호 또는 수험번호:", parent=self.root)
+        if not selector or not selector.strip():
+            return
+        self.preview_button.config(state="disabled")
+        threading.Thread(target=self.run_preview, args=(selector.strip(),), daemon=True).start()
+        
+    def run_preview(self, selector):
+        """미리보기 실행 (별도 스레드) - 엔진과 스냅샷을 유지해 두 번째부터는 바로 렌더링"""
         try:
-            filler = ExcelTemplateFiller()
-            template_path = filler.config["template_file"]
-            raw_data_path = filler.config["raw_data_file"]
+            from preview import preview_row
+            from raw_snapshot import RawSnapshot
+            
+            if self.preview_filler is None:
+                self.preview_filler = self.engine.ExcelTemplateFiller(config=self.config)
+                self.preview_snapshot = RawSnapshot(self.preview_filler)
+            self.report_status(f"미리보기 생성 중... ({selector})")
+            if preview_row(self.preview_filler, selector, snapshot=self.preview_snapshot):
+                self.report_status("미리보기 파일을 열었습니다")
+            else:
+                self.report_status("준비 완료")
+                self.post_event("error", f"'{selector}'에 해당하는 지원자가 없습니다.")
+        except Exception as e:
+            print(f"미리보기 오류: {e}")
+            self.post_event("error", str(e))
+        finally:
+            self.post_event("preview_done")
+        
+    def load_engine(self):
+        """엔진 모듈 임포트 + 설정 검증 + 파일 확인 (백그라운드 스레드)"""
+        try:
+            import excel_template_filler as engine
+            self.engine = engine
+            self.config = engine.load_config()
+            template_path = self.config["template_file"]
+            raw_data_path = self.config["raw_data_file"]
             
             if not os.path.exists(template_path):
                 print(f"템플릿 파일이 없습니다: {template_path}")
-                self.status_label.config(text="템플릿 파일을 확인해주세요")
-                self.start_button.config(state="disabled")
+                self.post_event("engine_ready", "템플릿 파일을 확인해주세요", False)
             elif not os.path.exists(raw_data_path):
                 print(f"원본 데이터 파일이 없습니다: {raw_data_path}")
-                self.status_label.config(text="원본 데이터 파일을 확인해주세요")
-                self.start_button.config(state="disabled")
+                self.post_event("engine_ready", "원본 데이터 파일을 확인해주세요", False)
             else:
                 print("모든 파일이 준비되었습니다.")
-                self.status_label.config(text="시작 준비 완료")
+                self.post_event("engine_ready", "시작 준비 완료", True)
                 
         except Exception as e:
             print(f"초기화 오류: {e}")
-            self.status_label.config(text="설정 파일을 확인해주세요")
-            self.start_button.config(state="disabled")
+            self.post_event("engine_ready", "설정 파일을 확인해주세요", False)
+        
+    def run(self):
+        """GUI 실행 - 창을 먼저 띄우고 엔진은 백그라운드에서 로드"""
+        self.status_label.config(text="준비 중...")
+        self.start_button.config(state="disabled")
+        threading.Thread(target=self.load_engine, daemon=True).start()
         
         # GUI 시작
         self.root.mainloop()
 
-
 def main():
     """메인 실행 함수"""
     # GUI 모드로 실행
@@ -0,0 +1,237 @@
+"""
+메모리 상한 실행 - 대량 배치에서 메모리 사용량을 일정하게 유지하고 RSS를 실행 보고서에 기록
+
+config.json:
+- memory_sample_rows: N행마다 RSS를 기록 (실행 보고서의 memory.samples)
+- memory_limit_mb: 메모리 상한 (0이면 기록만) - 설정하면 메모리 제한 모드로 실행
+  - 매니페스트 항목을 메모리에 모으지 않고 임시 파일에 기록 (ManifestSpool)
+  - 출력 경로 충돌 검사 색인을 임시 SQLite 파일에 보관 (DiskIndex)
+  - 샘플마다 순환 참조 정리 (gc) - 행별 객체를 정해진 시점에 해제
+  - 상한의 90%에 이르면 경고, 상한을 넘으면 템플릿 캐시를 비우고 작업자 수를 줄임
+    (상한의 80% 아래로 내려가면 작업자 수를 다시 늘림)
+
+측정은 감시 프로세스 RSS + 작업자가 마지막으로 보고한 RSS 합계이다.
+
+메모리 제한 모드에서도 행 수에 비례해 남는 것:
+- 매니페스트 행 번호/파일 위치 (행당 16바이트)
+- 데이터 품질 검사의 값 색인 (검사 필드마다 서로 다른 값 + 행 번호 목록, data_quality가 off가 아닐 때)
+  행 키/이름은 임시 파일에 기록하고 보고할 행만 다시 읽음
+제한 모드가 아니면 충돌 검사 색인도 메모리에 둔다 (행당 약 250바이트, 10만 행에 약 25MB).
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import tempfile
+from array import array
+
+# 상한 대비 경고 / 회복 기준
+WARN_RATIO = 0.9
+RESUME_RATIO = 0.8
+# 보고서에 남기는 최대 샘플 수 (넘으면 간격을 두 배로 늘려 절반만 유지)
+MAX_SAMPLES = 200
+
+
+def windows_rss_bytes():
+    """Windows 작업 집합 크기 (psapi GetProcessMemoryInfo) - 실패하면 None"""
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    kernel32 = ctypes.WinDLL("kernel32")
+    psapi = ctypes.WinDLL("psapi")
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD]
+    psapi.GetProcessMemoryInfo.restype = wintypes.BOOL
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.WorkingSetSize
+
+
+def current_rss_mb():
+    """현재 프로세스의 메모리 사용량(RSS, MB) - 알 수 없으면 None
+
+    psutil이 있으면 psutil, 없으면 Linux는 /proc, Windows는 GetProcessMemoryInfo로 측정
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    if sys.platform == "win32":
+        try:
+            rss = windows_rss_bytes()
+        except (OSError, AttributeError):
+            rss = None
+        return rss / (1024 * 1024) if rss is not None else None
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class MemoryGuard:
+    """N행마다 RSS를 기록하고 상한 대비 상태를 판단"""
+
+    def __init__(self, limit_mb=0, sample_rows=100):
+        self.limit_mb = limit_mb
+        self.sample_rows = sample_rows
+        self.samples = []      # [처리한 행 수, RSS MB]
+        self.next_sample = sample_rows
+        self.peak_mb = None
+        self.state = "ok"
+        self.warnings = 0
+        self.relieved = 0
+        self.rss_available = True
+
+    def due(self, done):
+        # 건너뛴 행(충돌 정책 skip)도 done에 포함되므로 배수가 아니라 다음 기준 이상인지로 판단
+        return self.sample_rows > 0 and done >= self.next_sample
+
+    def sample(self, done, extra_mb=0.0):
+        """RSS 기록 -> 'ok' / 'warn' (상한의 90% 이상) / 'over' (상한 초과)
+
+        RSS를 측정할 수 없으면 상한을 판단할 수 없으므로 한 번 알리고 summary에 표시한다.
+        """
+        self.next_sample = done + self.sample_rows
+        rss = current_rss_mb()
+        if rss is None:
+            if self.rss_available:
+                self.rss_available = False
+                if self.limit_mb:
+                    print(f"  경고: 메모리(RSS)를 측정할 수 없어 memory_limit_mb ({self.limit_mb}MB)가 "
+                          "적용되지 않습니다 (psutil 설치 권장)")
+                else:
+                    print("  메모리(RSS)를 측정할 수 없어 메모리 기록을 남기지 않습니다 (psutil 설치 권장)")
+            return "ok"
+        total = rss + extra_mb
+        self.samples.append([done, round(total, 1)])
+        if len(self.samples) > MAX_SAMPLES:
+            self.samples = self.samples[::2]
+            self.sample_rows *= 2
+        self.peak_mb = round(max(self.peak_mb or 0, total), 1)
+        if not self.limit_mb:
+            return "ok"
+
+        previous = self.state
+        if total >= self.limit_mb:
+            state = "over"
+        elif total >= self.limit_mb * WARN_RATIO:
+            state = "warn"
+        elif previous != "ok" and total >= self.limit_mb * RESUME_RATIO:
+            state = "warn"  # 회복 기준 아래로 내려갈 때까지 유지
+        else:
+            state = "ok"
+        if state != previous:
+            if state == "ok":
+                print(f"  메모리 회복: {total:.0f}MB / 상한 {self.limit_mb}MB")
+            else:
+                self.warnings += 1
+                print(f"  메모리 {'상한 초과' if state == 'over' else '경고'}: {total:.0f}MB / 상한 {self.limit_mb}MB ({done}행)")
+        if state == "over":
+            self.relieved += 1
+        self.state = state
+        return state
+
+    def summary(self):
+        summary = {
+            "limit_mb": self.limit_mb or None,
+            "sample_rows": self.sample_rows,
+            "rss_available": self.rss_available,
+            "peak_mb": self.peak_mb,
+            "warnings": self.warnings,
+            "relieved": self.relieved,
+            "samples": self.samples,
+        }
+        if not self.rss_available:
+            summary["note"] = "RSS를 측정할 수 없어 peak_mb/samples가 없고 메모리 상한이 적용되지 않았습니다 (psutil 설치 권장)"
+        return summary
+
+
+class ManifestSpool:
+    """매니페스트 항목을 임시 파일에 기록 (메모리에는 행 번호와 파일 위치만 보관)
+
+    list처럼 append/len을 지원하고, 저장할 때 행 순서로 정렬해 JSON 배열로 쓴다.
+    """
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        # 닫으면 자동 삭제되는 임시 파일
+        self.file = tempfile.TemporaryFile("w+b", dir=directory, prefix="manifest_", suffix=".jsonl")
+        self.rows = array("q")
+        self.offsets = array("q")
+
+    def append(self, entry):
+        self.rows.append(entry["row"])
+        self.offsets.append(self.file.tell())
+        self.file.write(json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    def __len__(self):
+        return len(self.rows)
+
+    def write_json(self, f):
+        """행 순서로 정렬한 JSON 배열을 텍스트 파일 f에 기록"""
+        self.file.flush()
+        end = self.file.tell()
+        order = sorted(range(len(self.rows)), key=self.rows.__getitem__)
+        f.write("[")
+        for n, i in enumerate(order):
+            self.file.seek(self.offsets[i])
+            line = self.file.readline().decode("utf-8").rstrip("\n")
+            f.write(("\n  " if n == 0 else ",\n  ") + line)
+        f.write("\n]" if order else "]")
+        self.file.seek(end)
+
+    def close(self):
+        self.file.close()
+
+
+class DiskIndex:
+    """키 -> 행 번호 색인을 임시 SQLite 파일에 보관 (dict의 get/in/[]= 만 지원)
+
+    충돌 검사처럼 행마다 항목이 늘어나는 색인을 메모리 대신 디스크에 둔다.
+    close()하면 파일을 지운다.
+    """
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=directory, prefix="index_", suffix=".sqlite")
+        os.close(fd)
+        self.conn = sqlite3.connect(self.path)
+        # 임시 색인이므로 저널/동기화 없이 기록
+        self.conn.execute("PRAGMA journal_mode=OFF")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("CREATE TABLE entries (key PRIMARY KEY, value INTEGER) WITHOUT ROWID")
+
+    def get(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __setitem__(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?)", (key, value))
+
+    def close(self):
+        self.conn.close()
+        os.remove(self.path)
@@ -0,0 +1,137 @@
+"""
+ooxml 백엔드 - .xlsx 패키지(zip)의 시트 XML에서 플레이스홀더 셀만 직접 바꿔 쓰기
+
+Excel도 openpyxl 저장도 거치지 않으므로 템플릿의 이미지/도형/서식/인쇄 설정이
+바이트 그대로 유지된다. 템플릿 zip은 한 번만 읽어 두고, 시트 XML은 플레이스홀더 셀
+위치에서 미리 잘라 두어 렌더링 시에는 문자열 이어 붙이기만 한다. 바뀌지 않은 zip 항목은
+템플릿의 압축된 바이트를 그대로 복사하고, 시트 XML만 압축 정책(zip_policy.py)에 따라 압축한다.
+
+제약 (fidelity):
+- 지원자 사진은 삽입하지 않음 (사진 셀은 비움)
+- 플레이스홀더 셀의 부분 서식(리치 텍스트)은 셀 전체 서식 하나로 합쳐짐
+- 수식은 다시 계산하지 않음 (Excel에서 열 때 계산)
+- PDF 저장 불가 (Excel 필요)
+"""
+
+import re
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+from zip_policy import ZipPolicy, PackedEntry, PackageWriter
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# XML 1.0에서 허용되지 않는 제어 문자 (탭/줄바꿈 제외)
+ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+TYPE_ATTRIBUTE = re.compile(r'\s+t="[^"]*"')
+
+
+def column_letter(col):
+    """열 번호(1부터) -> 'A', 'B', ..., 'AA'"""
+    letters = ""
+    while col:
+        col, remainder = divmod(col - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def sheet_parts(archive):
+    """시트 이름 -> zip 안의 워크시트 XML 경로"""
+    workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+    rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {}
+    for rel in rels.iter(f"{PKG_REL_NS}Relationship"):
+        target = rel.get("Target")
+        if target.startswith("/"):
+            target = target.lstrip("/")
+        else:
+            target = posixpath.normpath(posixpath.join("xl", target))
+        targets[rel.get("Id")] = target
+    return {
+        sheet.get("name"): targets[sheet.get(f"{REL_NS}id")]
+        for sheet in workbook.iter(f"{MAIN_NS}sheet")
+    }
+
+
+def inline_string_cell(open_tag, value):
+    """기존 셀 여는 태그의 속성(r, s 등)을 유지한 인라인 문자열 셀"""
+    attributes = TYPE_ATTRIBUTE.sub("", open_tag[2:].rstrip("/>").rstrip())
+    if not value:
+        return f"<c{attributes}/>"
+    text = escape(ILLEGAL_XML_CHARS.sub("", value))
+    return f'<c{attributes} t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+class OoxmlTemplate:
+    """zip 항목과 잘라 둔 시트 XML을 보관하는 템플릿 (CompiledTemplate마다 하나)
+
+    cells: CompiledTemplate.cells와 같은 (시트 이름, 행, 열, ...) 목록
+    """
+
+    def __init__(self, path, cells):
+        self.path = path
+        self.entries = []      # (ZipInfo, 압축된 항목) - 시트 XML은 렌더링 시 새로 만듦 (None)
+        self.sheets = {}       # zip 경로 -> (조각 목록, 셀 위치 목록, 여는 태그 목록)
+
+        with zipfile.ZipFile(path) as archive:
+            parts = sheet_parts(archive)
+            positions = {}
+            for sheet_name, row, col, *_ in cells:
+                positions.setdefault(parts[sheet_name], []).append((sheet_name, row, col))
+
+            for info in archive.infolist():
+                if info.filename in positions:
+                    self.entries.append((info, None))
+                    self.sheets[info.filename] = self.split_sheet(
+                        info.filename, archive.read(info.filename).decode("utf-8"), positions[info.filename]
+                    )
+                    continue
+                # 바뀌지 않는 항목은 압축된 바이트 그대로 (다른 압축 방식이면 한 번만 다시 압축)
+                entry = PackedEntry.copy_from(archive, info)
+                if entry is None:
+                    entry = PackedEntry.pack(info.filename, archive.read(info.filename), ZipPolicy(), info.date_time)
+                self.entries.append((info, entry))
+
+    @staticmethod
+    def split_sheet(part, xml, positions):
+        """시트 XML을 플레이스홀더 셀 앞뒤로 잘라 둠"""
+        spans = []
+        for sheet_name, row, col in positions:
+            ref = f"{column_letter(col)}{row}"
+            match = re.search(rf'<c\s[^>]*?\br="{ref}"[^>]*?(?:/>|>.*?</c>)', xml, re.DOTALL)
+            if not match:
+                raise ValueError(f"{part}: 셀 {ref}를 찾을 수 없습니다")
+            open_tag = xml[match.start():xml.index(">", match.start()) + 1]
+            spans.append((match.start(), match.end(), (sheet_name, row, col), open_tag))
+        spans.sort()
+
+        chunks, keys, open_tags = [], [], []
+        position = 0
+        for start, end, key, open_tag in spans:
+            chunks.append(xml[position:start])
+            keys.append(key)
+            open_tags.append(open_tag)
+            position = end
+        chunks.append(xml[position:])
+        return chunks, keys, open_tags
+
+    def render(self, values, output_path, policy=None):
+        """values: {(시트 이름, 행, 열): 문자열} -> output_path에 .xlsx 저장
+
+        policy: 시트 XML 압축 정책 (None이면 ZipPolicy 기본값)
+        """
+        policy = policy or ZipPolicy()
+        with PackageWriter(output_path) as package:
+            for info, entry in self.entries:
+                if entry is None:
+                    chunks, keys, open_tags = self.sheets[info.filename]
+                    pieces = [chunks[0]]
+                    for key, open_tag, chunk in zip(keys, open_tags, chunks[1:]):
+                        pieces.append(inline_string_cell(open_tag, values.get(key, "")))
+                        pieces.append(chunk)
+                    entry = PackedEntry.pack(info.filename, "".join(pieces).encode("utf-8"), policy, info.date_time)
+                package.add(entry)
@@ -0,0 +1,208 @@
+"""
+출력 카탈로그 - 실행마다 지원자별 출력 파일 정보를 SQLite에 기록하고 바로 찾아 열기
+
+기록 항목: 키(수험번호 등), 이름, 행 번호, xlsx/pdf 경로, 크기, SHA-1, 렌더링 시간,
+백엔드, 원천 행 지문, 실행 ID. 같은 출력 경로는 마지막 실행 결과로 갱신된다.
+
+찾기:
+- python excel_template_filler.py find 홍길동        (키 일치 또는 이름 포함 검색)
+- python excel_template_filler.py find A0001 --open  (첫 번째 결과의 PDF, 없으면 xlsx 열기)
+- GUI의 '지원서 찾기' 버튼
+
+카탈로그 위치는 config.json의 catalog_file (비어 있으면 report_dir/catalog.sqlite).
+
+여러 샤드가 같은 카탈로그에 쓸 수 있도록 WAL 모드에서 행마다 바로 커밋한다 (쓰기 잠금을 렌더링
+동안 쥐고 있지 않음). 잠금을 얻지 못한 기록은 보류했다가 다음 행에서 다시 쓰고, 끝까지 기록하지
+못한 출력 수는 실행 보고서(catalog_unrecorded)에 남긴다.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import hashlib
+import subprocess
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT,
+    finished_at TEXT,
+    shard TEXT,
+    host TEXT,
+    backend TEXT,
+    success INTEGER,
+    failed INTEGER
+);
+CREATE TABLE IF NOT EXISTS outputs (
+    xlsx_path TEXT PRIMARY KEY,
+    key TEXT,
+    name TEXT,
+    row INTEGER,
+    xlsx_size INTEGER,
+    xlsx_sha1 TEXT,
+    pdf_path TEXT,
+    pdf_size INTEGER,
+    pdf_sha1 TEXT,
+    render_ms REAL,
+    backend TEXT,
+    row_fingerprint TEXT,
+    run_id TEXT,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS outputs_key ON outputs (key);
+CREATE INDEX IF NOT EXISTS outputs_name ON outputs (name);
+"""
+
+INSERT_OUTPUT = "INSERT OR REPLACE INTO outputs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+# 행 기록 시 잠금 대기 (초) - 넘으면 보류하고 다음 행에서 다시 시도 (렌더링을 오래 막지 않음)
+ROW_BUSY_TIMEOUT = 2
+# 실행 끝(보류 기록, 실행 요약)과 검색 시 잠금 대기 (초)
+FINISH_BUSY_TIMEOUT = 30
+# 보류 기록 상한 (넘으면 오래된 것부터 버리고 기록 못 한 수로 집계)
+MAX_PENDING = 10000
+
+
+def file_sha1(path):
+    """파일 SHA-1 (1MB 단위로 읽음)"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def open_path(path):
+    """운영체제 기본 프로그램으로 파일/폴더 열기"""
+    if hasattr(os, "startfile"):
+        os.startfile(path)
+    elif sys.platform == "darwin":
+        subprocess.Popen(["open", path])
+    else:
+        subprocess.Popen(["xdg-open", path])
+
+
+class OutputCatalog:
+    """출력 카탈로그 (SQLite 파일 하나)"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=FINISH_BUSY_TIMEOUT)
+        # 검색(find/GUI)과 쓰기가 서로 막지 않고, 행마다 커밋해도 비용이 작음
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.pending = []      # 잠금 때문에 아직 기록하지 못한 outputs 레코드
+        self.recorded = 0
+        self.dropped = 0
+        self.warned = False
+
+    def add(self, run_id, entry, fingerprint, render_ms, backend):
+        """성공한 행의 출력 파일 기록 (entry: 매니페스트 항목) - 기록했으면 True, 보류했으면 False"""
+        created_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        # 파일 해시는 트랜잭션 밖에서 계산
+        for xlsx_path in entry["outputs"]:
+            if not os.path.exists(xlsx_path):
+                continue
+            pdf_path = xlsx_path.replace(".xlsx", ".pdf")
+            has_pdf = pdf_path != xlsx_path and os.path.exists(pdf_path)
+            try:
+                record = (
+                    xlsx_path, entry["key"], entry["name"], entry["row"],
+                    os.path.getsize(xlsx_path), file_sha1(xlsx_path),
+                    pdf_path if has_pdf else None,
+                    os.path.getsize(pdf_path) if has_pdf else None,
+                    file_sha1(pdf_path) if has_pdf else None,
+                    round(render_ms, 1) if render_ms is not None else None,
+                    backend, fingerprint, run_id, created_at,
+                )
+            except OSError as e:
+                print(f"  카탈로그 기록 실패: {os.path.basename(xlsx_path)} ({e})")
+                self.dropped += 1
+                continue
+            self.pending.append(record)
+        if len(self.pending) > MAX_PENDING:
+            self.dropped += len(self.pending) - MAX_PENDING
+            del self.pending[:len(self.pending) - MAX_PENDING]
+        return self.flush(ROW_BUSY_TIMEOUT)
+
+    def flush(self, busy_timeout):
+        """보류 기록을 한 트랜잭션으로 쓰고 바로 커밋 - 잠금을 얻지 못하면 보류한 채 False"""
+        self.conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout * 1000)}")
+        if not self.pending:
+            return True
+        try:
+            with self.conn:
+                self.conn.executemany(INSERT_OUTPUT, self.pending)
+        except sqlite3.OperationalError as e:
+            # 다른 샤드가 쓰는 중 (database is locked 등) - 다음 행에서 다시 시도
+            if not self.warned:
+                print(f"  카탈로그 기록 보류 ({e}) - 다음 행에서 다시 기록합니다")
+                self.warned = True
+            return False
+        self.recorded += len(self.pending)
+        self.pending = []
+        return True
+
+    def unrecorded(self):
+        """카탈로그에 기록하지 못한 출력 수 (보류 중 + 상한 초과로 버림)"""
+        return len(self.pending) + self.dropped
+
+    def finish_run(self, run_id, report):
+        """보류 기록과 실행 요약을 기록 -> 끝내 기록하지 못한 출력 수"""
+        self.flush(FINISH_BUSY_TIMEOUT)
+        shard = report.get("shard")
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id, report["started_at"], report["finished_at"],
+                    f"{shard[0]}/{shard[1]}" if shard else None,
+                    report["host"], report.get("backend"), report["success"], report["failed"],
+                ),
+            )
+        return self.unrecorded()
+
+    def find(self, query, limit=50):
+        """키 일치 또는 이름 포함 검색 -> 최근 기록 순 dict 목록"""
+        self.conn.row_factory = sqlite3.Row
+        try:
+            rows = self.conn.execute(
+                "SELECT * FROM outputs WHERE key = ? OR name LIKE ? ORDER BY created_at DESC LIMIT ?",
+                (query, f"%{query}%", limit),
+            ).fetchall()
+        finally:
+            self.conn.row_factory = None
+        return [dict(row) for row in rows]
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+def run_find(catalog_path, query, open_first=False):
+    """find 명령 - 검색 결과 출력 (open_first면 첫 결과 열기), 결과 수 반환"""
+    if not os.path.exists(catalog_path):
+        print(f"카탈로그가 없습니다: {catalog_path} (실행 후 생성됩니다)")
+        return 0
+    catalog = OutputCatalog(catalog_path)
+    try:
+        results = catalog.find(query)
+    finally:
+        catalog.close()
+
+    if not results:
+        print(f"'{query}'에 해당하는 지원서가 없습니다.")
+        return 0
+    for result in results:
+        print(f"{result['key']}  {result['name']}  (행 {result['row']}, {result['created_at']}, {result['backend']})")
+        print(f"    xlsx: {result['xlsx_path']}")
+        if result["pdf_path"]:
+            print(f"    pdf:  {result['pdf_path']}")
+    if open_first:
+        target = results[0]["pdf_path"] or results[0]["xlsx_path"]
+        print(f"열기: {target}")
+        open_path(target)
+    return len(results)
@@ -0,0 +1,227 @@
+"""
+묶음 PDF - 지원자별 PDF를 생성되는 즉시 하나의 PDF 뒤에 이어 붙이기 (지원자별 책갈피)
+
+config.json:
+- pdf_bundle: true면 PDF 저장 시 묶음 PDF도 생성 (pypdf 라이브러리 필요)
+- pdf_bundle_file: 묶음 PDF 파일명 (output_dir 기준)
+- pdf_bundle_group_field: 나눌 기준 필드 (예: "공고") - 값마다 '파일명_값.pdf'로 따로 생성
+
+메모리 사용량을 일정하게 유지하기 위해 문서를 모아 두지 않고, 지원자 PDF 하나를 읽을 때마다
+그 객체들을 번호만 바꿔 묶음 파일에 바로 기록한다. 끝날 때 페이지 트리, 책갈피, 상호 참조표만 추가로 쓴다.
+메모리에 남는 것은 객체 위치 목록과 페이지/책갈피 번호뿐이다.
+"""
+
+import os
+import re
+
+# 파일명에 쓸 수 없는 문자
+UNSAFE_FILENAME_CHARS = re.compile(r'[\\/:*?"<>|]')
+
+
+class StreamingPdfWriter:
+    """객체를 즉시 파일에 기록하는 PDF 작성기 (pypdf의 PdfReader/객체 직렬화 사용)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.part_path = path + ".part"
+        self.file = open(self.part_path, "wb")
+        self.file.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+        self.offsets = []       # 객체 번호 - 1 -> 파일 내 위치
+        self.page_numbers = []  # 페이지 객체 번호
+        self.bookmarks = []     # (제목, 첫 페이지 객체 번호)
+        self.documents = 0
+        self.pages_number = self.reserve()
+
+    def reserve(self):
+        """새 객체 번호 예약"""
+        self.offsets.append(None)
+        return len(self.offsets)
+
+    def write_object(self, number, obj):
+        self.offsets[number - 1] = self.file.tell()
+        self.file.write(f"{number} 0 obj\n".encode("ascii"))
+        obj.write_to_stream(self.file)
+        self.file.write(b"\nendobj\n")
+
+    def append(self, pdf_path, title):
+        """지원자 PDF 하나의 모든 페이지를 이어 붙이고 책갈피 추가"""
+        from pypdf import PdfReader
+        from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject
+
+        reader = PdfReader(pdf_path)
+        mapping = {}  # 원본 (번호, 세대) -> 새 번호
+        pending = []
+
+        def renumber(obj):
+            """참조를 새 번호로 바꾼 값 반환 (dict/list는 제자리에서 수정)"""
+            if isinstance(obj, IndirectObject):
+                if obj.pdf is None:
+                    return obj  # 이미 새 번호로 바뀐 참조 (여러 페이지가 공유하는 직접 객체)
+                key = (obj.idnum, obj.generation)
+                if key not in mapping:
+                    mapping[key] = self.reserve()
+                    pending.append(obj)
+                return IndirectObject(mapping[key], 0, None)
+            if isinstance(obj, DictionaryObject):
+                for key, value in list(dict.items(obj)):
+                    dict.__setitem__(obj, key, renumber(value))
+            elif isinstance(obj, ArrayObject):
+                for i, value in enumerate(list.__iter__(obj)):
+                    list.__setitem__(obj, i, renumber(value))
+            return obj
+
+        # 페이지 번호를 먼저 정해 두어 주석(/P) 등의 페이지 참조가 새 페이지를 가리키게 함
+        pages = list(reader.pages)
+        numbers = []
+        for page in pages:
+            number = self.reserve()
+            ref = page.indirect_reference
+            if ref is not None:
+                mapping[(ref.idnum, ref.generation)] = number
+            numbers.append(number)
+
+        for page, number in zip(pages, numbers):
+            # 원본 페이지 트리로 이어지지 않도록 부모를 묶음의 페이지 트리로 교체
+            dict.__setitem__(page, NameObject("/Parent"), IndirectObject(self.pages_number, 0, None))
+            for key, value in list(dict.items(page)):
+                if key != "/Parent":
+                    dict.__setitem__(page, key, renumber(value))
+            self.write_object(number, page)
+
+            # 페이지가 참조하는 객체를 차례로 기록 (기록하면서 새로 발견한 참조도 처리)
+            while pending:
+                ref = pending.pop()
+                number_of_ref = mapping[(ref.idnum, ref.generation)]
+                self.write_object(number_of_ref, renumber(ref.get_object()))
+
+        if numbers:
+            self.page_numbers.extend(numbers)
+            self.bookmarks.append((title, numbers[0]))
+        self.documents += 1
+        return len(numbers)
+
+    def close(self):
+        """페이지 트리/책갈피/카탈로그/상호 참조표 기록 후 파일 완성"""
+        from pypdf.generic import (
+            ArrayObject, DictionaryObject, IndirectObject, NameObject, NumberObject, create_string_object,
+        )
+
+        def ref(number):
+            return IndirectObject(number, 0, None)
+
+        pages = DictionaryObject({
+            NameObject("/Type"): NameObject("/Pages"),
+            NameObject("/Kids"): ArrayObject([ref(n) for n in self.page_numbers]),
+            NameObject("/Count"): NumberObject(len(self.page_numbers)),
+        })
+        self.write_object(self.pages_number, pages)
+
+        catalog = DictionaryObject({
+            NameObject("/Type"): NameObject("/Catalog"),
+            NameObject("/Pages"): ref(self.pages_number),
+        })
+        if self.bookmarks:
+            outlines_number = self.reserve()
+            item_numbers = [self.reserve() for _ in self.bookmarks]
+            for i, (title, page_number) in enumerate(self.bookmarks):
+                item = DictionaryObject({
+                    NameObject("/Title"): create_string_object(title),
+                    NameObject("/Parent"): ref(outlines_number),
+                    NameObject("/Dest"): ArrayObject([ref(page_number), NameObject("/Fit")]),
+                })
+                if i > 0:
+                    item[NameObject("/Prev")] = ref(item_numbers[i - 1])
+                if i < len(item_numbers) - 1:
+                    item[NameObject("/Next")] = ref(item_numbers[i + 1])
+                self.write_object(item_numbers[i], item)
+            outlines = DictionaryObject({
+                NameObject("/Type"): NameObject("/Outlines"),
+                NameObject("/First"): ref(item_numbers[0]),
+                NameObject("/Last"): ref(item_numbers[-1]),
+                NameObject("/Count"): NumberObject(len(item_numbers)),
+            })
+            self.write_object(outlines_number, outlines)
+            catalog[NameObject("/Outlines")] = ref(outlines_number)
+            catalog[NameObject("/PageMode")] = NameObject("/UseOutlines")
+        catalog_number = self.reserve()
+        self.write_object(catalog_number, catalog)
+
+        # 상호 참조표 (한 줄 20바이트 고정 형식)
+        xref_offset = self.file.tell()
+        lines = [f"xref\n0 {len(self.offsets) + 1}\n", "0000000000 65535 f \n"]
+        for offset in self.offsets:
+            lines.append(f"{offset:010d} 00000 n \n" if offset is not None else "0000000000 00000 f \n")
+        self.file.write("".join(lines).encode("ascii"))
+        self.file.write(
+            f"trailer\n<< /Size {len(self.offsets) + 1} /Root {catalog_number} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n".encode("ascii")
+        )
+        self.file.close()
+        os.replace(self.part_path, self.path)
+
+    def discard(self):
+        """완성하지 않고 버리기"""
+        self.file.close()
+        if os.path.exists(self.part_path):
+            os.remove(self.part_path)
+
+
+class PdfBundler:
+    """지원자 PDF를 그룹별 묶음 PDF에 이어 붙이는 출력 단계
+
+    pypdf가 없으면 한 번 안내하고 비활성화 (사진 크기 조정의 PIL 처리와 같은 방식)
+    """
+
+    def __init__(self, output_dir, file_name, group_field="", suffix=""):
+        self.output_dir = output_dir
+        self.file_name = file_name
+        self.group_field = group_field
+        self.suffix = suffix  # 샤드 실행 시 '_shard-1-of-3' 등
+        self.writers = {}     # 그룹 값 -> StreamingPdfWriter
+        self.enabled = True
+        try:
+            import pypdf  # noqa: F401
+        except ImportError:
+            print("  pypdf 라이브러리가 없어 묶음 PDF를 만들지 않습니다. (pip install pypdf)")
+            self.enabled = False
+
+    def bundle_path(self, group):
+        stem, ext = os.path.splitext(self.file_name)
+        if group is not None:
+            # 파일명에 쓸 수 없는 문자는 '_'로
+            stem = f"{stem}_{UNSAFE_FILENAME_CHARS.sub('_', group) or '미지정'}"
+        return os.path.join(self.output_dir, f"{stem}{self.suffix}{ext or '.pdf'}")
+
+    def add(self, pdf_path, title, context):
+        """PDF 하나 추가 - 추가한 페이지 수 반환 (비활성화/실패 시 0)"""
+        if not self.enabled or not os.path.exists(pdf_path):
+            return 0
+        group = str(context.get(self.group_field, "")).strip() if self.group_field else None
+        writer = self.writers.get(group)
+        if writer is None:
+            writer = self.writers[group] = StreamingPdfWriter(self.bundle_path(group))
+        try:
+            return writer.append(pdf_path, title)
+        except Exception as e:
+            print(f"  묶음 PDF 추가 실패 ({os.path.basename(pdf_path)}): {e}")
+            return 0
+
+    def close(self):
+        """모든 묶음 PDF 완성 -> [{"path", "group", "documents", "pages"}]"""
+        results = []
+        for group, writer in self.writers.items():
+            try:
+                writer.close()
+            except Exception as e:
+                print(f"  묶음 PDF 저장 실패 ({writer.path}): {e}")
+                writer.discard()
+                continue
+            print(f"묶음 PDF 저장: {writer.path} ({writer.documents}명, {len(writer.page_numbers)}쪽)")
+            results.append({
+                "path": os.path.abspath(writer.path),
+                "group": group,
+                "documents": writer.documents,
+                "pages": len(writer.page_numbers),
+            })
+        self.writers = {}
+        return results
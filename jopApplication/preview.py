@@ -0,0 +1,120 @@
+"""
+미리보기 - 지원자 한 명만 렌더링해 임시 폴더에 저장하고 바로 열기 (템플릿 수정 확인용)
+
+- python excel_template_filler.py preview 12          (12번째 행)
+- python excel_template_filler.py preview A0012       (키 - shard_key_field 또는 photo_field 값)
+- python excel_template_filler.py preview A0012 --no-open
+- GUI의 '미리보기' 버튼
+
+Excel 없이 가장 빠른 ooxml 백엔드로 렌더링하고 (사진/PDF 없음), 원천 데이터는
+raw_snapshot.py의 스냅샷에서 한 행만 조회한다. 플레이스홀더마다 필드, 변환, 원래 값,
+결과 값을 표로 출력한다.
+"""
+
+import os
+import time
+import shutil
+import tempfile
+
+from openpyxl.utils import get_column_letter
+
+from raw_snapshot import RawSnapshot
+from output_catalog import open_path
+
+# 미리보기 파일 위치 (열려 있는 이전 파일과 겹치지 않도록 매번 새 하위 폴더)
+PREVIEW_DIR = os.path.join(tempfile.gettempdir(), "excel_template_preview")
+# 이보다 오래된 이전 미리보기 폴더는 정리 (초)
+PREVIEW_KEEP_SEC = 24 * 3600
+# 표에 보여 줄 값의 최대 길이
+TABLE_VALUE_WIDTH = 40
+
+
+def clean_old_previews():
+    """오래된 미리보기 폴더 정리 (열려 있어 지울 수 없으면 그대로 둠)"""
+    try:
+        entries = list(os.scandir(PREVIEW_DIR))
+    except OSError:
+        return
+    now = time.time()
+    for entry in entries:
+        try:
+            if entry.is_dir() and now - entry.stat().st_mtime > PREVIEW_KEEP_SEC:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def short(value):
+    """표 출력용 한 줄 문자열"""
+    text = str(value).replace("\n", "⏎")
+    return text if len(text) <= TABLE_VALUE_WIDTH else text[:TABLE_VALUE_WIDTH - 1] + "…"
+
+
+def placeholder_table(filler, template_path, context, rendered):
+    """템플릿의 플레이스홀더마다 (셀, 필드, 변환, 원래 값, 결과 값)"""
+    template = filler.templates.get(template_path)
+    photo_placeholder = filler.config["photo_placeholder"]
+    rows = []
+    for sheet_name, row, col, original_value, segments in template.cells:
+        for seg in segments:
+            if not isinstance(seg, tuple):
+                continue
+            field, pipe = seg
+            raw = context.get(field, "")
+            if photo_placeholder in original_value:
+                result = "(사진 - 미리보기에서는 생략)"
+            elif seg in rendered:
+                result = rendered[seg]
+            else:
+                result = filler.apply_transforms(raw, pipe, context)
+            rows.append((f"{sheet_name}!{get_column_letter(col)}{row}", field, pipe.lstrip("|"), raw, result))
+    return rows
+
+
+def print_table(rows):
+    headers = ("셀", "필드", "변환", "원래 값", "결과 값")
+    cells = [headers] + [tuple(short(value) for value in row) for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for n, row in enumerate(cells):
+        print("  " + " | ".join(value.ljust(width) for value, width in zip(row, widths)))
+        if n == 0:
+            print("  " + "-+-".join("-" * width for width in widths))
+
+
+def preview_row(filler, selector, open_file=True, snapshot=None):
+    """행 번호 또는 키로 지원자 한 명 렌더링 -> 생성한 파일 경로 목록 (찾지 못하면 None)
+
+    snapshot: 재사용할 RawSnapshot (GUI는 하나를 유지해 연결/색인을 재사용)
+    """
+    start = time.perf_counter()
+    snapshot = snapshot or RawSnapshot(filler)
+    found = snapshot.find(selector)
+    if found is None:
+        print(f"'{selector}'에 해당하는 행이 없습니다 (행 번호는 1부터, 키는 {filler.config['photo_field']} 값)")
+        return None
+    index, context = found
+
+    clean_old_previews()
+    os.makedirs(PREVIEW_DIR, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix=f"row{index + 1}_", dir=PREVIEW_DIR)
+
+    paths = []
+    rendered = {}
+    tables = []
+    for template_path, output_path in filler.get_row_outputs(context, index, work_dir):
+        # Excel 없이 가장 빠른 헤드리스 경로 (컴파일된 템플릿 재사용, PDF 없음)
+        filler.fill_workbook_ooxml(template_path, context, output_path, rendered, save_pdf=False)
+        paths.append(output_path)
+        tables.append((template_path, placeholder_table(filler, template_path, context, rendered)))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\n미리보기: 행 {index + 1} {context.get('이름', '')} ({elapsed_ms:.0f}ms)")
+    for template_path, rows in tables:
+        print(f"\n[{os.path.basename(template_path)}]")
+        print_table(rows)
+    for path in paths:
+        print(f"\n파일: {path}")
+
+    if open_file and paths:
+        open_path(paths[0])
+    return paths
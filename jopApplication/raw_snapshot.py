@@ -0,0 +1,118 @@
+"""
+원천 데이터 스냅샷 - 읽어 둔 행을 SQLite 캐시에 보관해 한 행 조회를 빠르게
+
+preview 명령처럼 한 지원자만 필요할 때 매번 원천 파일 전체를 다시 읽지 않도록,
+원천 파일(과 조인 파일)이 바뀌지 않았으면 스냅샷에서 행 번호나 키로 바로 조회한다.
+원천 파일, 시트, 조회문, 조인 설정, 읽는 컬럼이 바뀌면 다시 만든다.
+profile 명령(data_profile.py)의 컬럼 통계도 같은 파일에 원천 데이터 기준으로 보관한다.
+
+위치: report_dir/cache/raw_snapshot.sqlite
+"""
+
+import os
+import json
+import sqlite3
+
+from row_sources import open_row_source, file_signature
+
+# 다시 만들 때 한 번에 넣는 행 수
+INSERT_BATCH = 1000
+
+
+class RawSnapshot:
+    """원천 데이터 행 스냅샷 (행 번호/키로 조회)"""
+
+    def __init__(self, filler):
+        self.filler = filler
+        self.path = os.path.join(filler.get_report_dir(), "cache", "raw_snapshot.sqlite")
+        self.conn = None
+
+    def signature(self, all_columns=False):
+        """스냅샷을 다시 만들어야 하는지 판단하는 값 (all_columns면 프로젝션 없이 전체 컬럼 기준)"""
+        config = self.filler.config
+        fields = None if all_columns else self.filler.projected_fields()
+        return json.dumps({
+            "raw_data_file": os.path.abspath(config["raw_data_file"]),
+            "raw_data": file_signature(config["raw_data_file"]),
+            "sheet": config["raw_data_sheet"],
+            "format": config.get("raw_data_format", ""),
+            "query": config.get("raw_data_query", ""),
+            "joins": config.get("joins", []),
+            "join_files": [file_signature(join["file"]) for join in config.get("joins", []) if join.get("file")],
+            "key_field": config.get("shard_key_field") or config["photo_field"],
+            "fields": sorted(fields) if fields is not None else None,
+        }, ensure_ascii=False, sort_keys=True)
+
+    def connect(self):
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # GUI는 미리보기마다 다른 작업 스레드에서 조회 (동시에 하나씩만)
+            self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self.conn.executescript(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);"
+                "CREATE TABLE IF NOT EXISTS rows (idx INTEGER PRIMARY KEY, key TEXT, data TEXT);"
+                "CREATE INDEX IF NOT EXISTS rows_key ON rows (key);"
+                "CREATE TABLE IF NOT EXISTS profile (signature TEXT PRIMARY KEY, data TEXT);"
+            )
+        return self.conn
+
+    def is_fresh(self, signature):
+        row = self.connect().execute("SELECT value FROM meta WHERE name = 'signature'").fetchone()
+        return row is not None and row[0] == signature
+
+    def ensure(self):
+        """스냅샷이 최신인지 확인하고 아니면 다시 만들기 -> 다시 만들었으면 True"""
+        signature = self.signature()
+        if self.is_fresh(signature):
+            return False
+
+        print(f"원천 데이터 스냅샷 생성: {self.filler.config['raw_data_file']}")
+        conn = self.connect()
+        with conn:
+            conn.execute("DELETE FROM rows")
+            conn.execute("DELETE FROM meta")
+            source = open_row_source(self.filler.config, fields=self.filler.projected_fields())
+            batch = []
+            for index, context in enumerate(source.iter_rows()):
+                key = self.filler.get_shard_key(context, index)
+                batch.append((index, key, json.dumps(context, ensure_ascii=False)))
+                if len(batch) >= INSERT_BATCH:
+                    conn.executemany("INSERT INTO rows VALUES (?, ?, ?)", batch)
+                    batch = []
+            if batch:
+                conn.executemany("INSERT INTO rows VALUES (?, ?, ?)", batch)
+            conn.execute("INSERT INTO meta VALUES ('signature', ?)", (signature,))
+        return True
+
+    def find(self, selector):
+        """키가 일치하는 행, 없으면 행 번호(1부터)로 조회 -> (행 인덱스, 컨텍스트) 또는 None"""
+        self.ensure()
+        selector = str(selector).strip()
+        conn = self.connect()
+        row = conn.execute("SELECT idx, data FROM rows WHERE key = ? ORDER BY idx LIMIT 1", (selector,)).fetchone()
+        if row is None and selector.isdigit():
+            row = conn.execute("SELECT idx, data FROM rows WHERE idx = ?", (int(selector) - 1,)).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def load_profile(self, signature):
+        """저장된 컬럼 통계 (원천 데이터가 바뀌었으면 None)"""
+        row = self.connect().execute("SELECT data FROM profile WHERE signature = ?", (signature,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_profile(self, signature, profile):
+        """컬럼 통계 저장 (최신 하나만 유지)"""
+        conn = self.connect()
+        with conn:
+            conn.execute("DELETE FROM profile")
+            conn.execute("INSERT INTO profile VALUES (?, ?)", (signature, json.dumps(profile, ensure_ascii=False)))
+
+    def count(self):
+        self.ensure()
+        return self.connect().execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
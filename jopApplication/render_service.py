@@ -0,0 +1,299 @@
+"""
+로컬 렌더링 서비스 - 템플릿을 메모리에 유지한 채 요청마다 지원서 1건 생성
+
+python excel_template_filler.py serve 로 실행 (Ctrl+C로 종료)
+
+요청:
+- POST /render   본문 JSON {"context": {필드: 값}, "pdf": false, "template": "선택 (템플릿 경로)"}
+                 응답: .xlsx (템플릿이 여러 개면 .zip, pdf=true면 .pdf)
+                 헤더 X-Render-Ms: 서버 안에서 걸린 렌더링 시간 (밀리초)
+- GET  /health   상태와 템플릿 캐시 정보
+- GET  /metrics  요청 수, 실패 수, 지연 시간 통계 (p50/p95/최대)
+
+기본 주소는 127.0.0.1:8765 (config.json의 service_host / service_port).
+렌더링은 Excel 없이 동작하는 헤드리스 백엔드로 한다 (ooxml, 없으면 openpyxl - 시작할 때 한 번 결정).
+pdf=true 변환은 Excel(COM)을 쓰므로 COM을 초기화한 전용 스레드 하나에서 차례로 처리한다
+(요청 스레드마다 Excel을 동시에 조작하지 않도록).
+요청 검증 오류(JSON 형식, context 누락, 파일명 필드 누락, 등록되지 않은 템플릿)는 400, 그 밖의 실패
+(PDF를 저장할 수 없는 환경 포함)는 500.
+"""
+
+import io
+import os
+import json
+import time
+import shutil
+import string
+import zipfile
+import tempfile
+import threading
+import urllib.parse
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from excel_template_filler import ExcelTemplateFiller
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# 서비스가 쓰는 헤드리스 백엔드 (앞에 있을수록 우선)
+HEADLESS_BACKENDS = ["ooxml", "openpyxl"]
+
+
+class RenderRequestError(Exception):
+    """요청 자체가 잘못됨 (HTTP 400)"""
+
+
+def init_com():
+    """PDF 스레드의 COM 초기화 (Windows에서 xlwings를 쓰는 스레드마다 필요, pywin32가 없으면 건너뜀)"""
+    try:
+        import pythoncom
+    except ImportError:
+        return
+    pythoncom.CoInitialize()
+
+
+class RenderService:
+    """컴파일된 템플릿/사진 색인을 유지하는 렌더링 엔진 래퍼"""
+
+    def __init__(self, config_path="config.json", config=None):
+        self.filler = ExcelTemplateFiller(config_path, config=config)
+        self.backend = self.resolve_headless_backend()
+        self.lock = threading.Lock()
+        self.latencies = deque(maxlen=1000)  # 최근 요청 지연 시간 (ms)
+        self.requests = 0
+        self.failures = 0
+        self.images_signature = None
+        # PDF 변환 전용 스레드 (COM 초기화, 한 번에 한 건)
+        self.pdf_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render-pdf", initializer=init_com)
+
+        # 시작 시 템플릿을 미리 컴파일해 첫 요청도 빠르게 처리
+        for template_path in self.filler.get_template_paths():
+            self.filler.templates.get(template_path)
+        self.refresh_photo_index()
+
+    def resolve_headless_backend(self):
+        """요청마다 Excel을 띄우지 않도록 헤드리스 백엔드 선택 (backend가 ooxml/openpyxl이면 그 설정)"""
+        capabilities = self.filler.detect_backends()
+        self.filler.capabilities = capabilities
+        policy = self.filler.config["backend"]
+        candidates = [policy] if policy in HEADLESS_BACKENDS else HEADLESS_BACKENDS
+        for name in candidates:
+            if capabilities.get(name) is None:
+                self.filler.backend = name
+                print(f"렌더링 백엔드: {name} (설정: {policy})")
+                return name
+        raise RuntimeError("사용 가능한 헤드리스 렌더링 백엔드가 없습니다: " + ", ".join(
+            f"{name}: {capabilities.get(name)}" for name in candidates
+        ))
+
+    def check_filename_fields(self, context):
+        """출력 파일명 패턴에 필요한 필드가 요청에 있는지 확인"""
+        for _, pattern in self.filler.select_templates(context):
+            pattern = pattern or self.filler.config["filename_pattern"]
+            missing = [
+                name for _, name, _, _ in string.Formatter().parse(pattern) if name and name not in context
+            ]
+            if missing:
+                raise RenderRequestError(f"파일명에 필요한 필드가 없습니다: {', '.join(missing)}")
+
+    def refresh_photo_index(self):
+        """images 폴더가 바뀌었을 때만 사진 색인 재생성"""
+        try:
+            signature = os.stat(self.filler.config["images_dir"]).st_mtime_ns
+        except OSError:
+            signature = None
+        if signature != self.images_signature or self.filler.photo_index is None:
+            self.filler.photo_index = self.filler.build_photo_index()
+            self.images_signature = signature
+
+    def render(self, context, pdf=False, template=None):
+        """컨텍스트 1건 렌더링 -> (본문 바이트, Content-Type, 파일명)"""
+        self.refresh_photo_index()
+        context = {str(key): "" if value is None else str(value) for key, value in context.items()}
+        if template and template not in self.filler.get_template_paths():
+            # 설정에 등록된 템플릿만 허용
+            raise RenderRequestError(f"등록되지 않은 템플릿입니다: {template}")
+        self.check_filename_fields(context)
+        if pdf and not self.filler.pdf_available():
+            raise RuntimeError("PDF를 저장할 수 없습니다 (Excel 필요)")
+
+        work_dir = tempfile.mkdtemp(prefix="render_")
+        try:
+            jobs = self.filler.get_row_outputs(context, 0, work_dir)
+            if template:
+                jobs = [(template, output_path) for _, output_path in jobs[:1]]
+
+            # 요청 값으로 만든 파일명이 작업 폴더 밖을 가리키지 않도록 확인
+            for _, output_path in jobs:
+                if os.path.dirname(os.path.abspath(output_path)) != os.path.abspath(work_dir):
+                    raise RenderRequestError(f"허용되지 않는 출력 파일명입니다: {os.path.basename(output_path)}")
+
+            fill = (self.filler.fill_workbook_ooxml if self.backend == "ooxml"
+                    else self.filler.fill_workbook_openpyxl)
+            rendered = {}
+            files = []
+            for template_path, output_path in jobs:
+                # 대화형 선택이 없는 헤드리스 경로 (컴파일된 템플릿 재사용)
+                fill(template_path, context, output_path, rendered, save_pdf=False)
+                if pdf:
+                    pdf_path = os.path.splitext(output_path)[0] + ".pdf"
+                    self.pdf_executor.submit(self.filler.save_as_pdf_xlwings, output_path, pdf_path).result()
+                    output_path = pdf_path
+                files.append(output_path)
+
+            if len(files) == 1:
+                with open(files[0], "rb") as f:
+                    body = f.read()
+                content_type = "application/pdf" if pdf else XLSX_CONTENT_TYPE
+                return body, content_type, os.path.basename(files[0])
+
+            # 템플릿이 여러 개면 zip으로 묶어서 반환
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+                for path in files:
+                    archive.write(path, os.path.basename(path))
+            return buffer.getvalue(), "application/zip", "applications.zip"
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def close(self):
+        """PDF 스레드 종료"""
+        self.pdf_executor.shutdown()
+
+    def record(self, elapsed_ms, ok):
+        with self.lock:
+            self.requests += 1
+            if not ok:
+                self.failures += 1
+            self.latencies.append(elapsed_ms)
+
+    def metrics(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            requests, failures = self.requests, self.failures
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 2)
+
+        return {
+            "backend": self.backend,
+            "requests": requests,
+            "failures": failures,
+            "latency_ms": {
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": round(latencies[-1], 2) if latencies else None,
+            },
+            "template_cache": {
+                "size": len(self.filler.templates.entries),
+                "hits": self.filler.templates.hits,
+                "misses": self.filler.templates.misses,
+            },
+        }
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """HTTP 요청 처리 (요청마다 스레드 하나)"""
+
+    service = None  # make_server에서 설정
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, {"status": "ok", "templates": self.service.filler.get_template_paths()})
+        elif self.path == "/metrics":
+            self.send_json(200, self.service.metrics())
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/render":
+            self.send_json(404, {"error": "not found"})
+            return
+
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            # JSON 형식 오류(JSONDecodeError/UnicodeDecodeError)도 ValueError
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict) or not isinstance(request.get("context"), dict):
+                raise RenderRequestError("'context' 객체가 필요합니다")
+            context = request["context"]
+        except (ValueError, RenderRequestError) as e:
+            self.service.record((time.perf_counter() - start) * 1000, False)
+            self.send_json(400, {"error": str(e)})
+            return
+
+        try:
+            body, content_type, filename = self.service.render(
+                context, pdf=bool(request.get("pdf")), template=request.get("template")
+            )
+        except Exception as e:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.service.record(elapsed_ms, False)
+            status = 400 if isinstance(e, RenderRequestError) else 500
+            self.send_json(status, {"error": str(e), "render_ms": round(elapsed_ms, 2)})
+            return
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.service.record(elapsed_ms, True)
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{urllib.parse.quote(filename)}")
+        self.send_header("X-Render-Ms", f"{elapsed_ms:.2f}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        print(f"  [serve] {self.address_string()} {format % args}")
+
+
+def make_server(config_path="config.json", host=None, port=None, config=None):
+    """서버 객체 생성 (serve_forever는 호출하지 않음, port=0이면 빈 포트 자동 선택)"""
+    service = RenderService(config_path, config=config)
+    host = host or service.filler.config["service_host"]
+    port = service.filler.config["service_port"] if port is None else port
+    handler = type("BoundRenderRequestHandler", (RenderRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(config_path="config.json"):
+    """serve 명령 진입점"""
+    server = make_server(config_path)
+    host, port = server.server_address[:2]
+    print(f"렌더링 서비스 시작: http://{host}:{port} (Ctrl+C로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n렌더링 서비스 종료")
+    finally:
+        server.server_close()
+        server.RequestHandlerClass.service.close()
+
+
+def render_remote(context, url="http://127.0.0.1:8765", pdf=False, template=None, timeout=60):
+    """로컬 서비스에 렌더링 요청 (포털/테스트용 클라이언트) -> (본문 바이트, 응답 헤더)"""
+    payload = {"context": context, "pdf": pdf}
+    if template:
+        payload["template"] = template
+    request = urllib.request.Request(
+        url.rstrip("/") + "/render",
+        data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read(), dict(response.headers)
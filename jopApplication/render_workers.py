@@ -0,0 +1,316 @@
+"""
+감시되는 렌더링 작업 프로세스 (config.json의 workers > 0 일 때 process_all에서 사용)
+
+- 작업자마다 감시 프로세스의 설정(FillerConfig)으로 ExcelTemplateFiller를 한 번 만들고 행을 하나씩 받아 렌더링
+- row_timeout 초 안에 끝나지 않은 행은 작업자(와 그 작업자가 띄운 Excel)를 강제 종료하고 실패로 기록
+- 작업자가 비정상 종료하면 처리 중이던 행을 실패로 기록하고 새 작업자를 띄움
+- 강제 종료한 행이 쓰다 만 출력 파일(.xlsx/.pdf)은 삭제 (감시 모드가 정상 출력으로 보지 않도록)
+- worker_max_rows 행을 처리했거나 메모리(RSS)가 worker_max_memory_mb를 넘은 작업자는 새 작업자로 교체
+- 행 값은 공유 메모리 행 테이블(shared_rows.py)에서 읽고 작업자에게는 행 번호만 전달
+- memory_limit_mb를 넘으면 쉬는 작업자를 하나씩 줄이고, 회복되면 다시 늘림 (throttle)
+
+멈춘 Excel 인스턴스 하나 때문에 전체 배치가 멈추지 않도록 하기 위한 구조이다.
+"""
+
+import os
+import signal
+import time
+import multiprocessing
+from multiprocessing.connection import wait
+
+from excel_template_filler import ExcelTemplateFiller, FillerConfig
+from memory_guard import current_rss_mb
+from shared_rows import SharedRowTable
+
+
+def worker_main(conn, config, config_path, capabilities, table_name=None):
+    """작업자 프로세스 본체 - None을 받을 때까지 (행 번호, 컨텍스트, 출력 폴더) 처리
+
+    config: 감시 프로세스의 설정 값 (설정 파일을 다시 읽지 않으므로 메모리에서 바꾼 설정도 그대로 사용)
+    table_name이 있으면 컨텍스트 대신 None을 받고 공유 메모리 행 테이블에서 읽음
+    """
+    # Ctrl+C는 감시 프로세스가 처리 (작업자는 종료 신호를 받을 때까지 대기)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    filler = ExcelTemplateFiller(config=FillerConfig(config, path=config_path))
+    filler.photo_index = filler.build_photo_index()
+    # 백엔드는 감시 프로세스가 확인한 결과로 결정 (작업자마다 Excel 시작을 다시 시도하지 않음)
+    filler.resolve_backend(capabilities, report=False)
+    # Excel을 띄우면 pid를 알려 시간 초과 시 감시 프로세스가 함께 종료할 수 있게 함
+    filler.on_excel_started = lambda pid: conn.send(("excel", pid))
+    table = SharedRowTable.attach(table_name) if table_name else None
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+
+        index, context, output_dir, jobs = task
+        if context is None:
+            context = table.row(index)
+        outputs = []
+        start = time.perf_counter()
+        try:
+            print(f"\n 행 {index+1} 처리 중... (작업자 {os.getpid()})")
+            print(f"  대상: {context.get('이름', 'Unknown')}")
+            filler.render_row(index, context, output_dir, outputs, jobs)
+            status, error = "success", None
+        except Exception as e:
+            print(f" 행 {index+1} 처리 실패: {e}")
+            status, error = "failed", str(e)
+        render_ms = (time.perf_counter() - start) * 1000
+        conn.send(("done", index, status, outputs, error, current_rss_mb(), render_ms))
+
+    if table is not None:
+        table.close()
+
+
+class Worker:
+    """작업자 프로세스 하나와 처리 중인 행 상태"""
+
+    def __init__(self, context, config, config_path, capabilities, table_name=None):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=worker_main, args=(child_conn, config, config_path, capabilities, table_name), daemon=True
+        )
+        self.shared = table_name is not None
+        self.process.start()
+        child_conn.close()
+        self.task = None       # (행 번호, 키, 컨텍스트, 출력 목록)
+        self.deadline = None
+        self.rows = 0
+        self.rss = None        # 마지막으로 보고한 RSS (MB)
+        self.excel_pid = None
+
+    def assign(self, task, output_dir, timeout):
+        index, _, context, jobs = task
+        # 공유 행 테이블이 있으면 행 번호만 전달
+        self.conn.send((index, None if self.shared else context, output_dir, jobs))
+        self.task = task
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.excel_pid = None
+
+    def kill(self):
+        """작업자와 그 작업자가 띄운 Excel 강제 종료"""
+        if self.excel_pid:
+            try:
+                os.kill(self.excel_pid, signal.SIGTERM)
+            except OSError:
+                pass
+        self.process.kill()
+        self.process.join(5)
+        self.conn.close()
+
+    def stop(self):
+        """정상 종료 요청 (응답이 없으면 강제 종료)"""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(5)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class WorkerSupervisor:
+    """작업자 프로세스 풀 감시 - 행 결과를 끝나는 순서대로 반환"""
+
+    def __init__(self, filler, cancel_event=None, table=None):
+        config = filler.config
+        self.filler = filler
+        self.table_name = table.name if table is not None else None
+        # 작업자에게는 일반 dict로 넘기고 작업자에서 FillerConfig로 다시 검증
+        self.config = dict(config)
+        self.config_path = config.path
+        self.capabilities = filler.capabilities
+        self.count = config["workers"]
+        self.row_timeout = config["row_timeout"]
+        self.max_rows = config["worker_max_rows"]
+        self.max_memory_mb = config["worker_max_memory_mb"]
+        self.cancel_event = cancel_event
+        self.context = multiprocessing.get_context("spawn")
+        self.workers = []
+        # 메모리 상한 모드에서 동시에 띄울 작업자 수 (throttle로 조정)
+        self.active_limit = self.count
+        self.stats = {
+            "workers": self.count,
+            "started": 0,
+            "recycled": 0,
+            "timeouts": 0,
+            "crashes": 0,
+            "max_rss_mb": None,
+            "throttled": 0,
+            "min_workers": self.count,
+            "rss_unavailable": False,
+        }
+
+    def spawn(self):
+        self.stats["started"] += 1
+        return Worker(self.context, self.config, self.config_path, self.capabilities, self.table_name)
+
+    def cancelled(self):
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def worker_rss_mb(self):
+        """작업자가 마지막으로 보고한 RSS 합계 (MB)"""
+        return sum(w.rss for w in self.workers if w.rss is not None)
+
+    def throttle(self, state):
+        """메모리 상태에 따라 작업자 수 조정 - 'over'면 하나 줄이고(최소 1), 'ok'면 하나 늘림"""
+        if state == "over" and self.active_limit > 1:
+            self.active_limit -= 1
+            self.stats["throttled"] += 1
+            self.stats["min_workers"] = min(self.stats["min_workers"], self.active_limit)
+            print(f"  메모리 상한: 작업자 수를 {self.active_limit}개로 줄입니다")
+        elif state == "ok" and self.active_limit < self.count:
+            self.active_limit += 1
+            print(f"  메모리 회복: 작업자 수를 {self.active_limit}개로 늘립니다")
+
+    def remove_partial_outputs(self, task, output_dir):
+        """강제 종료한 행의 출력 파일 삭제 (쓰다 만 파일이 남지 않도록)"""
+        index, _, context, jobs = task
+        if jobs is None:
+            jobs = self.filler.get_row_outputs(context, index, output_dir)
+        for _, output_path in jobs:
+            for path in (output_path, output_path.replace('.xlsx', '.pdf')):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"  행 {index+1}: 쓰다 만 출력 파일을 삭제하지 못했습니다 ({path}: {e})")
+
+    def should_recycle(self, worker, rss_mb):
+        if self.max_rows and worker.rows >= self.max_rows:
+            return f"{worker.rows}행 처리"
+        if self.max_memory_mb and rss_mb is not None and rss_mb >= self.max_memory_mb:
+            return f"메모리 {rss_mb:.0f}MB"
+        return None
+
+    def run(self, tasks, output_dir):
+        """tasks: (행 번호, 키, 컨텍스트, 출력 목록 또는 None) 반복자
+        반환: (행 번호, 키, 컨텍스트, 상태, 출력 경로 목록, 오류, 렌더링 ms) 반복자
+        """
+        tasks = iter(tasks)
+        exhausted = False
+        requeued = []  # 쉬는 동안 종료된 작업자에게 보내지 못한 행
+        assign_failures = {}
+        workers = self.workers = [self.spawn() for _ in range(self.count)]
+        print(f"작업자 {self.count}개 시작 (행 제한 시간: {self.row_timeout or '없음'}초)")
+
+        try:
+            while True:
+                # 작업자 수를 active_limit에 맞춤 (줄일 때는 쉬는 작업자만 종료)
+                for worker in [w for w in workers if w.task is None][:max(0, len(workers) - self.active_limit)]:
+                    worker.stop()
+                    workers.remove(worker)
+                while len(workers) < self.active_limit and not exhausted and not self.cancelled():
+                    workers.append(self.spawn())
+
+                # 쉬는 작업자에게 다음 행 배정
+                for position, worker in enumerate(workers):
+                    if worker.task is None and not exhausted and not self.cancelled():
+                        task = requeued.pop() if requeued else next(tasks, None)
+                        if task is None:
+                            exhausted = True
+                            continue
+                        try:
+                            worker.assign(task, output_dir, self.row_timeout)
+                        except (OSError, ValueError) as e:
+                            # 쉬는 동안 종료된 작업자 - 새 작업자로 바꾸고 같은 행을 다시 배정
+                            index, shard_key, context, _ = task
+                            print(f"  작업자 {worker.process.pid} 비정상 종료 (exitcode {worker.process.exitcode}) - 새 작업자 시작")
+                            self.stats["crashes"] += 1
+                            worker.kill()
+                            workers[position] = self.spawn()
+                            assign_failures[index] = assign_failures.get(index, 0) + 1
+                            if assign_failures[index] < 3:
+                                requeued.append(task)
+                            else:
+                                # 새 작업자도 시작하자마자 종료되는 경우 같은 행을 계속 다시 보내지 않음
+                                print(f" 행 {index+1} 처리 실패: 작업자에게 보낼 수 없음 ({e})")
+                                yield index, shard_key, context, "failed", [], f"작업자 비정상 종료 ({e})", None
+
+                busy = [w for w in workers if w.task is not None]
+                if self.cancelled():
+                    # 처리 중인 행은 작업자를 종료하고 취소로 기록
+                    for worker in busy:
+                        index, shard_key, context, _ = worker.task
+                        worker.kill()
+                        self.remove_partial_outputs(worker.task, output_dir)
+                        workers.remove(worker)
+                        yield index, shard_key, context, "cancelled", [], "사용자 취소", None
+                    return
+                if not busy:
+                    if exhausted:
+                        return
+                    continue
+
+                now = time.monotonic()
+                deadlines = [w.deadline for w in busy if w.deadline is not None]
+                # 취소 신호를 확인할 수 있도록 최대 0.5초 단위로 대기
+                timeout = min([0.5] + [max(0, d - now) for d in deadlines])
+                wait([w.conn for w in busy] + [w.process.sentinel for w in busy], timeout)
+
+                for worker in busy:
+                    index, shard_key, context, _ = worker.task
+                    result = None
+                    try:
+                        while worker.conn.poll():
+                            message = worker.conn.recv()
+                            if message[0] == "excel":
+                                worker.excel_pid = message[1]
+                            elif message[0] == "done":
+                                result = message
+                    except (EOFError, OSError):
+                        pass
+
+                    if result is not None:
+                        _, _, status, outputs, error, rss_mb, render_ms = result
+                        worker.task = None
+                        worker.rows += 1
+                        worker.rss = rss_mb
+                        if rss_mb is None and self.max_memory_mb and not self.stats["rss_unavailable"]:
+                            # psutil도 /proc도 Windows API도 쓸 수 없는 환경 - 조용히 꺼지지 않도록 한 번 알림
+                            print(f"  경고: 작업자 메모리(RSS)를 측정할 수 없어 worker_max_memory_mb "
+                                  f"({self.max_memory_mb}MB)에 따른 교체가 동작하지 않습니다 (psutil 설치 권장)")
+                            self.stats["rss_unavailable"] = True
+                        if rss_mb is not None:
+                            self.stats["max_rss_mb"] = round(max(self.stats["max_rss_mb"] or 0, rss_mb), 1)
+                        yield index, shard_key, context, status, outputs, error, render_ms
+
+                        reason = self.should_recycle(worker, rss_mb)
+                        if reason:
+                            print(f"  작업자 {worker.process.pid} 교체 ({reason})")
+                            self.stats["recycled"] += 1
+                            worker.stop()
+                            workers[workers.index(worker)] = self.spawn()
+                        continue
+
+                    if not worker.process.is_alive():
+                        exitcode = worker.process.exitcode
+                        print(f" 행 {index+1} 처리 실패: 작업자 비정상 종료 (exitcode {exitcode})")
+                        self.stats["crashes"] += 1
+                        worker.kill()
+                        self.remove_partial_outputs(worker.task, output_dir)
+                        workers[workers.index(worker)] = self.spawn()
+                        yield index, shard_key, context, "failed", [], f"작업자 비정상 종료 (exitcode {exitcode})", None
+                    elif worker.deadline is not None and time.monotonic() >= worker.deadline:
+                        print(f" 행 {index+1} 처리 실패: 시간 초과 ({self.row_timeout}초) - 작업자 재시작")
+                        self.stats["timeouts"] += 1
+                        worker.kill()
+                        self.remove_partial_outputs(worker.task, output_dir)
+                        workers[workers.index(worker)] = self.spawn()
+                        yield index, shard_key, context, "failed", [], f"시간 초과 ({self.row_timeout}초)", None
+        finally:
+            for worker in workers:
+                if worker.task is not None:
+                    worker.kill()
+                    self.remove_partial_outputs(worker.task, output_dir)
+                else:
+                    worker.stop()
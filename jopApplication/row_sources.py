@@ -0,0 +1,540 @@
+"""
+원천 데이터 행 공급자 (Excel / CSV / JSON Lines / SQLite)
+
+모든 공급자는 pd.read_excel(dtype=str).fillna("") 와 같은 행 계약을 따른다.
+- 각 행은 {컬럼명: 문자열} dict, 빈 값/NULL은 ""
+- 빈 헤더는 'Unnamed: N', 중복 헤더는 '이름.1', '이름.2' (pandas와 동일)
+
+CSV / JSONL / SQLite는 파일 전체를 읽지 않고 한 행씩 스트리밍한다.
+
+fields를 지정하면 그 컬럼만 읽는다 (프로젝션 - 자기소개서 같은 긴 자유 서술 컬럼 제외).
+- Excel: usecols로 필요한 컬럼만 로드, 값 종류가 적은 컬럼(성별, 공고 등)은 category로 보관
+- SQLite: SELECT 컬럼 목록으로 DB에서 바로 줄여서 조회
+- CSV / JSONL: 필요한 컬럼만 dict로 만들고, 값 종류가 적은 컬럼은 같은 문자열 객체를 공유
+
+설정 (config.json):
+- raw_data_file: 원천 데이터 경로 (확장자로 형식 자동 선택)
+- raw_data_format: "excel" / "csv" / "jsonl" / "sqlite" (비어 있으면 확장자로 판단)
+- raw_data_sheet: Excel 시트 이름 또는 SQLite 테이블 이름
+- raw_data_query: SQLite 조회 SQL (비어 있으면 raw_data_sheet 테이블 전체)
+- joins: 보조 시트 조인 목록 (JoinedRowSource 참고)
+"""
+
+import os
+import re
+import csv
+import json
+import sqlite3
+import hashlib
+
+# 확장자 -> 형식
+FORMAT_BY_EXTENSION = {
+    ".xlsx": "excel",
+    ".xlsm": "excel",
+    ".xls": "excel",
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".db": "sqlite",
+    ".sqlite": "sqlite",
+    ".sqlite3": "sqlite",
+}
+
+
+# pandas 기본 na_values와 같은 문자열은 빈 값으로 취급 (read_excel + fillna("") 결과와 동일)
+NA_STRINGS = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+])
+
+
+def normalize_columns(header):
+    """헤더 값을 pandas와 같은 규칙의 컬럼명 목록으로 변환"""
+    columns = []
+    seen = {}
+    for i, value in enumerate(header):
+        name = str(value) if value is not None and str(value) != "" else f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def file_signature(path):
+    """파일 변경 감지용 (수정 시각, 크기) - 파일이 없으면 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def row_fingerprint(context):
+    """행 내용 지문 (값이 하나라도 바뀌면 달라짐)"""
+    payload = json.dumps(dict(context), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class ValueInterner:
+    """값 종류가 적은 컬럼의 같은 값은 같은 문자열 객체를 공유 (행을 오래 보관할 때 메모리 절약)
+
+    컬럼별 서로 다른 값이 limit개를 넘으면 그 컬럼은 더 이상 공유하지 않음 (자유 서술 컬럼)
+    """
+
+    def __init__(self, limit=256):
+        self.limit = limit
+        self.tables = {}
+
+    def __call__(self, column, value):
+        table = self.tables.get(column)
+        if table is None:
+            if column in self.tables:
+                return value  # 값 종류가 많은 컬럼
+            table = self.tables[column] = {}
+        shared = table.get(value)
+        if shared is not None:
+            return shared
+        if len(table) >= self.limit:
+            self.tables[column] = None
+            return value
+        table[value] = value
+        return value
+
+
+def to_cell_text(value):
+    """셀 값을 렌더러가 보는 문자열로 변환 (None -> "")"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return "" if value in NA_STRINGS else value
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return ""
+        return str(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+class RowSource:
+    """원천 데이터 행 공급자 기본 클래스"""
+
+    format_name = None
+
+    def __init__(self, path, config, fields=None):
+        self.path = path
+        self.config = config
+        # 읽을 컬럼 (None이면 전체)
+        self.fields = frozenset(fields) if fields is not None else None
+
+    def columns(self):
+        """컬럼명 목록 (가능하면 헤더만 읽음) - 프로젝션과 관계없이 전체"""
+        raise NotImplementedError
+
+    def selected(self, columns):
+        """프로젝션 적용 후 읽을 컬럼 목록 (원본 순서 유지)"""
+        if self.fields is None:
+            return list(columns)
+        return [column for column in columns if column in self.fields]
+
+    def iter_rows(self):
+        """{컬럼명: 문자열} dict를 한 행씩 반환"""
+        raise NotImplementedError
+
+    def count(self):
+        """전체 행 수 (싸게 알 수 없으면 None)"""
+        return None
+
+    def describe(self):
+        return f"{self.format_name}: {self.path}"
+
+
+class ExcelRowSource(RowSource):
+    """Excel 시트 (pandas read_excel, dtype=str)"""
+
+    format_name = "excel"
+
+    # 서로 다른 값이 행 수의 이 비율 이하인 컬럼은 category로 보관
+    CATEGORY_RATIO = 0.5
+
+    def __init__(self, path, config, fields=None):
+        super().__init__(path, config, fields)
+        self.frame = None
+        self.header = None
+
+    def columns(self):
+        if self.header is not None:
+            return list(self.header)
+
+        # 헤더 행만 스트리밍으로 읽기 (전체 시트 로드 없음)
+        from openpyxl import load_workbook
+
+        wb = load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            ws = wb[self.config["raw_data_sheet"]]
+            self.header = []
+            for header in ws.iter_rows(min_row=1, max_row=1, values_only=True):
+                self.header = normalize_columns(header)
+            return list(self.header)
+        finally:
+            wb.close()
+
+    def load(self):
+        """시트 전체 로드 (한 번만)"""
+        if self.frame is None:
+            import pandas as pd
+
+            usecols = None
+            if self.fields is not None:
+                # 헤더 위치로 지정 (빈/중복 헤더도 pandas와 같은 이름 규칙으로 선택)
+                usecols = [i for i, column in enumerate(self.columns()) if column in self.fields] or None
+            frame = pd.read_excel(
+                self.path,
+                sheet_name=self.config["raw_data_sheet"],
+                dtype=str,  # 모든 컬럼을 문자열로 읽기
+                usecols=usecols,
+            ).fillna("")
+            # 값 종류가 적은 컬럼은 category로 (값 문자열을 한 번만 보관)
+            for column in frame.columns:
+                if frame[column].nunique() <= len(frame) * self.CATEGORY_RATIO:
+                    frame[column] = frame[column].astype("category")
+            self.frame = frame
+        return self.frame
+
+    def iter_rows(self):
+        frame = self.load()
+        columns = list(frame.columns)
+        for values in frame.itertuples(index=False, name=None):
+            yield dict(zip(columns, values))
+
+    def count(self):
+        return len(self.load())
+
+
+class CsvRowSource(RowSource):
+    """CSV 파일 (csv 모듈로 한 행씩 스트리밍)"""
+
+    format_name = "csv"
+
+    def open(self):
+        encoding = self.config.get("encoding", "utf-8")
+        # UTF-8 BOM이 붙은 ATS 내보내기 파일 대응
+        if encoding.lower().replace("-", "") == "utf8":
+            encoding = "utf-8-sig"
+        return open(self.path, "r", encoding=encoding, newline="")
+
+    def columns(self):
+        with self.open() as f:
+            header = next(csv.reader(f), [])
+        return normalize_columns(header)
+
+    def iter_rows(self):
+        with self.open() as f:
+            reader = csv.reader(f)
+            columns = normalize_columns(next(reader, []))
+            wanted = set(self.selected(columns))
+            picks = [(i, column) for i, column in enumerate(columns) if column in wanted]
+            intern = ValueInterner()
+            for values in reader:
+                if not values:
+                    continue  # 완전히 빈 줄은 pandas와 같이 건너뜀
+                row = {}
+                for i, column in picks:
+                    value = values[i] if i < len(values) else ""
+                    row[column] = "" if value in NA_STRINGS else intern(column, value)
+                yield row
+
+    def count(self):
+        with self.open() as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            return sum(1 for values in reader if values)
+
+
+class JsonlRowSource(RowSource):
+    """JSON Lines 파일 (한 줄에 객체 하나)"""
+
+    format_name = "jsonl"
+
+    def open(self):
+        return open(self.path, "r", encoding=self.config.get("encoding", "utf-8"))
+
+    def iter_records(self):
+        with self.open() as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError(f"{self.path}:{line_no}: JSON 객체가 아닙니다")
+                yield record
+
+    def columns(self):
+        # 첫 번째 레코드의 키를 컬럼으로 사용
+        for record in self.iter_records():
+            return list(record.keys())
+        return []
+
+    def iter_rows(self):
+        columns = None
+        intern = ValueInterner()
+        for record in self.iter_records():
+            if columns is None:
+                columns = self.selected(record.keys())
+            row = {column: intern(column, to_cell_text(record.get(column))) for column in columns}
+            # 첫 레코드에 없던 키도 보존 (프로젝션 대상인 경우만)
+            for key, value in record.items():
+                if key not in row and (self.fields is None or key in self.fields):
+                    row[key] = intern(key, to_cell_text(value))
+            yield row
+
+    def count(self):
+        with self.open() as f:
+            return sum(1 for line in f if line.strip())
+
+
+class SqliteRowSource(RowSource):
+    """SQLite 데이터베이스 (raw_data_query 또는 raw_data_sheet 테이블)"""
+
+    format_name = "sqlite"
+
+    def query(self):
+        query = self.config.get("raw_data_query", "")
+        if query:
+            return query.strip().rstrip(";")
+        table = self.config["raw_data_sheet"].replace('"', '""')
+        return f'SELECT * FROM "{table}"'
+
+    def connect(self):
+        # 읽기 전용으로 열기 (원본 DB 보호)
+        uri = "file:" + os.path.abspath(self.path).replace("?", "%3f") + "?mode=ro"
+        return sqlite3.connect(uri, uri=True)
+
+    def columns(self):
+        conn = self.connect()
+        try:
+            cursor = conn.execute(f"SELECT * FROM ({self.query()}) LIMIT 0")
+            return normalize_columns([d[0] for d in cursor.description])
+        finally:
+            conn.close()
+
+    def projected_query(self):
+        """필요한 컬럼만 SELECT하는 조회문 (중복 컬럼명이 있으면 원래 조회문)"""
+        if self.fields is None:
+            return self.query()
+        conn = self.connect()
+        try:
+            names = [d[0] for d in conn.execute(f"SELECT * FROM ({self.query()}) LIMIT 0").description]
+        finally:
+            conn.close()
+        if len(set(names)) != len(names):
+            return self.query()
+        wanted = self.selected(names)
+        if not wanted:
+            return self.query()
+        column_list = ", ".join('"' + name.replace('"', '""') + '"' for name in wanted)
+        return f"SELECT {column_list} FROM ({self.query()})"
+
+    def iter_rows(self):
+        query = self.projected_query()
+        conn = self.connect()
+        try:
+            cursor = conn.execute(query)
+            columns = normalize_columns([d[0] for d in cursor.description])
+            wanted = set(self.selected(columns))
+            picks = [(i, column) for i, column in enumerate(columns) if column in wanted]
+            intern = ValueInterner()
+            while True:
+                batch = cursor.fetchmany(500)
+                if not batch:
+                    break
+                for values in batch:
+                    yield {column: intern(column, to_cell_text(values[i])) for i, column in picks}
+        finally:
+            conn.close()
+
+    def count(self):
+        conn = self.connect()
+        try:
+            return conn.execute(f"SELECT COUNT(*) FROM ({self.query()})").fetchone()[0]
+        finally:
+            conn.close()
+
+
+# 조인 필드 이름: '접두어.컬럼' (1:1) 또는 '접두어[번호].컬럼' (1:N)
+JOIN_FIELD_PATTERN = re.compile(r"^(.+?)(?:\[(\d+)\])?\.(.+)$")
+
+
+class JoinedRowSource(RowSource):
+    """기본 행 공급자에 보조 시트(경력, 자격증, 점수 등)를 키로 붙여 주는 공급자
+
+    config.json의 joins 예시:
+      [{"sheet": "경력", "key": "수험번호", "many": true},
+       {"sheet": "점수", "key": "수험번호", "prefix": "시험"}]
+    - sheet: 보조 시트 이름 (SQLite는 테이블, 다른 파일이면 "file"도 지정)
+    - key: 보조 시트의 키 컬럼, on: 기본 시트의 키 컬럼 (생략하면 key와 같음)
+    - prefix: 필드 접두어 (생략하면 시트 이름)
+    - many: false면 1:1 -> '시험.점수', true면 1:N -> '경력[0].회사', '경력[1].회사', '경력.건수'
+
+    보조 시트마다 키 -> 레코드 해시 색인을 한 번만 만들고, 기본 시트 행마다 색인을 조회하므로
+    전체 비용은 (기본 행 수 + 보조 행 수)에 비례한다.
+    """
+
+    format_name = "joined"
+
+    def __init__(self, base, config, fields=None):
+        super().__init__(base.path, config, fields)
+        self.base = base
+        self.joins = [self.plan(spec) for spec in config.get("joins", [])]
+        self.indexes = None
+
+        if fields is not None:
+            # 기본 시트에서는 조인 필드 대신 조인 키 컬럼을 읽음
+            prefixes = {join["prefix"] for join in self.joins}
+            base_fields = {field for field in fields if self.join_prefix(field) not in prefixes}
+            base_fields.update(join["on"] for join in self.joins)
+            self.base.fields = frozenset(base_fields)
+
+    @staticmethod
+    def join_prefix(field):
+        match = JOIN_FIELD_PATTERN.match(field)
+        return match.group(1) if match else None
+
+    def plan(self, spec):
+        """조인 설정 하나 -> 보조 공급자와 읽을 컬럼/레코드 수"""
+        key = spec.get("key", "수험번호")
+        prefix = spec.get("prefix") or spec["sheet"]
+        many = bool(spec.get("many", False))
+        secondary_config = dict(self.config, raw_data_sheet=spec["sheet"], raw_data_query="")
+        if spec.get("file"):
+            secondary_config["raw_data_format"] = spec.get("format", "")
+        path = spec.get("file") or self.config["raw_data_file"]
+
+        columns = None
+        limit = None  # 1:N에서 붙일 최대 레코드 수 (None이면 전부)
+        if self.fields is not None:
+            columns, indexes = {key}, []
+            for field in self.fields:
+                match = JOIN_FIELD_PATTERN.match(field)
+                if match and match.group(1) == prefix:
+                    columns.add(match.group(3))
+                    if match.group(2) is not None:
+                        indexes.append(int(match.group(2)))
+            limit = max(indexes) + 1 if indexes else 0
+        source = open_row_source(secondary_config, path, columns)
+        return {
+            "sheet": spec["sheet"], "key": key, "on": spec.get("on") or key,
+            "prefix": prefix, "many": many, "source": source, "limit": limit,
+        }
+
+    def build_indexes(self):
+        """보조 시트마다 키 -> [레코드 수, 레코드 목록] 색인 (한 번만)"""
+        if self.indexes is not None:
+            return self.indexes
+        self.indexes = []
+        for join in self.joins:
+            index = {}
+            duplicates = 0
+            limit = 1 if not join["many"] else join["limit"]
+            for record in join["source"].iter_rows():
+                value = str(record.pop(join["key"], "")).strip()
+                if not value:
+                    continue
+                entry = index.get(value)
+                if entry is None:
+                    entry = index[value] = [0, []]
+                entry[0] += 1
+                if not join["many"] and entry[0] > 1:
+                    duplicates += 1
+                # 템플릿이 참조하는 번호까지만 보관 (예: 경력[2]까지 쓰면 3건)
+                if limit is None or len(entry[1]) < limit:
+                    entry[1].append(record)
+            if duplicates:
+                print(f"  조인 '{join['sheet']}': 키 중복 {duplicates}건은 첫 레코드만 사용 (1:1)")
+            self.indexes.append(index)
+        return self.indexes
+
+    def secondary_columns(self, join):
+        return [column for column in join["source"].selected(join["source"].columns()) if column != join["key"]]
+
+    def columns(self):
+        columns = self.base.columns()
+        for join in self.joins:
+            names = self.secondary_columns(join)
+            if join["many"]:
+                columns += [f"{join['prefix']}[0].{name}" for name in names] + [f"{join['prefix']}.건수"]
+            else:
+                columns += [f"{join['prefix']}.{name}" for name in names]
+        return columns
+
+    def selected(self, columns):
+        # 1:N 필드는 번호와 관계없이 '경력[0].회사' 형태로 비교
+        wanted = None if self.fields is None else {re.sub(r"\[\d+\]\.", "[0].", field) for field in self.fields}
+        return self.base.selected(self.base.columns()) + [
+            column for column in columns[len(self.base.columns()):] if wanted is None or column in wanted
+        ]
+
+    def iter_rows(self):
+        indexes = self.build_indexes()
+        empty_columns = [self.secondary_columns(join) for join in self.joins]
+        no_match = (0, ())
+        for row in self.base.iter_rows():
+            for join, index, names in zip(self.joins, indexes, empty_columns):
+                total, records = index.get(str(row.get(join["on"], "")).strip(), no_match)
+                prefix = join["prefix"]
+                if join["many"]:
+                    for i, record in enumerate(records):
+                        for name, value in record.items():
+                            row[f"{prefix}[{i}].{name}"] = value
+                    row[f"{prefix}.건수"] = str(total)
+                elif records:
+                    for name, value in records[0].items():
+                        row[f"{prefix}.{name}"] = value
+                else:
+                    for name in names:
+                        row[f"{prefix}.{name}"] = ""
+            yield row
+
+    def count(self):
+        return self.base.count()
+
+    def describe(self):
+        return self.base.describe() + "".join(f" + 조인 {join['sheet']}" for join in self.joins)
+
+
+ROW_SOURCES = {
+    "excel": ExcelRowSource,
+    "csv": CsvRowSource,
+    "jsonl": JsonlRowSource,
+    "sqlite": SqliteRowSource,
+}
+
+
+def detect_format(path, config):
+    """raw_data_format 설정 또는 확장자로 형식 결정"""
+    fmt = (config.get("raw_data_format") or "").lower()
+    if fmt:
+        if fmt not in ROW_SOURCES:
+            raise ValueError(f"지원하지 않는 raw_data_format: {fmt} (가능: {', '.join(ROW_SOURCES)})")
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMAT_BY_EXTENSION:
+        raise ValueError(f"원천 데이터 형식을 알 수 없습니다: {path} (raw_data_format 설정 필요)")
+    return FORMAT_BY_EXTENSION[ext]
+
+
+def open_row_source(config, path=None, fields=None):
+    """설정에 맞는 행 공급자 생성 (fields: 읽을 컬럼 집합, None이면 전체)"""
+    source = ROW_SOURCES[detect_format(path or config["raw_data_file"], config)](
+        path or config["raw_data_file"], config, fields
+    )
+    # 기본 원천 데이터에만 보조 시트 조인 적용
+    if path is None and config.get("joins"):
+        return JoinedRowSource(source, config, fields)
+    return source
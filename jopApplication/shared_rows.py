@@ -0,0 +1,167 @@
+"""
+공유 메모리 행 테이블 - 작업자 프로세스에 행 번호만 보내고 값은 공유 메모리에서 읽기
+
+workers > 0 일 때 process_all이 원천 데이터를 한 번 읽어 공유 메모리 블록 하나에 기록하고,
+작업자는 같은 블록을 열어 행 번호로 읽기 전용 컨텍스트(SharedRowView)를 만든다.
+행마다 컨텍스트 dict를 pickle해 보내지 않으므로 (긴 자기소개서 등) 작업자 수가 늘어도
+감시 프로세스의 CPU 사용량과 전체 메모리가 늘지 않는다.
+
+블록 구성 (정수는 모두 8바이트):
+- 헤더 길이 + 헤더 JSON (행 수, 셀 수, 컬럼명 목록, 행 구성 목록)
+- 행별 구성 번호 / 행별 첫 셀 위치 (행마다 있는 컬럼이 다를 수 있음 - 1:N 조인 등)
+- 셀 끝 위치 (셀 수 + 1)
+- 셀 값 UTF-8 바이트
+"""
+
+import json
+from array import array
+from collections.abc import Mapping
+from multiprocessing import shared_memory
+
+ITEM_SIZE = 8
+
+
+def align(offset):
+    return (offset + ITEM_SIZE - 1) // ITEM_SIZE * ITEM_SIZE
+
+
+class SharedRowTable:
+    """원천 데이터 행 전체를 담은 공유 메모리 블록 (감시 프로세스가 만들고 작업자는 이름으로 열기)"""
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        buf = shm.buf
+        header_size = int.from_bytes(buf[:ITEM_SIZE], "little")
+        header = json.loads(bytes(buf[ITEM_SIZE:ITEM_SIZE + header_size]).decode("utf-8"))
+        self.rows = header["rows"]
+        self.columns = header["columns"]
+        # 구성 번호 -> (컬럼명 튜플, 컬럼명 -> 행 안에서의 위치)
+        self.schemas = []
+        for schema in header["schemas"]:
+            names = tuple(self.columns[i] for i in schema)
+            self.schemas.append((names, {name: j for j, name in enumerate(names)}))
+
+        offset = align(ITEM_SIZE + header_size)
+        self.row_schema = buf[offset:offset + self.rows * ITEM_SIZE].cast("q")
+        offset += self.rows * ITEM_SIZE
+        self.row_start = buf[offset:offset + self.rows * ITEM_SIZE].cast("q")
+        offset += self.rows * ITEM_SIZE
+        self.cell_end = buf[offset:offset + (header["cells"] + 1) * ITEM_SIZE].cast("q")
+        offset += (header["cells"] + 1) * ITEM_SIZE
+        self.data = buf[offset:offset + header["data_size"]]
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @classmethod
+    def create(cls, rows):
+        """행 dict 반복자로 공유 메모리 블록 생성 (값은 문자열로 저장)"""
+        columns = []
+        column_ids = {}
+        schemas = []
+        schema_ids = {}
+        row_schema = array("q")
+        row_start = array("q")
+        cell_end = array("q", [0])
+        data = bytearray()
+
+        for row in rows:
+            key = tuple(row)
+            schema_id = schema_ids.get(key)
+            if schema_id is None:
+                for name in key:
+                    if name not in column_ids:
+                        column_ids[name] = len(columns)
+                        columns.append(name)
+                schema_id = schema_ids[key] = len(schemas)
+                schemas.append([column_ids[name] for name in key])
+            row_schema.append(schema_id)
+            row_start.append(len(cell_end) - 1)
+            for value in row.values():
+                data += str(value).encode("utf-8")
+                cell_end.append(len(data))
+
+        header = json.dumps({
+            "rows": len(row_schema),
+            "cells": len(cell_end) - 1,
+            "data_size": len(data),
+            "columns": columns,
+            "schemas": schemas,
+        }, ensure_ascii=False).encode("utf-8")
+        parts = [row_schema.tobytes(), row_start.tobytes(), cell_end.tobytes(), data]
+        offset = align(ITEM_SIZE + len(header))
+        size = offset + sum(len(part) for part in parts)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            shm.buf[:ITEM_SIZE] = len(header).to_bytes(ITEM_SIZE, "little")
+            shm.buf[ITEM_SIZE:ITEM_SIZE + len(header)] = header
+            for part in parts:
+                shm.buf[offset:offset + len(part)] = part
+                offset += len(part)
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """작업자 프로세스에서 이름으로 열기"""
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def size_mb(self):
+        return self.shm.size / (1024 * 1024)
+
+    def row(self, index):
+        return SharedRowView(self, index)
+
+    def iter_rows(self):
+        for index in range(self.rows):
+            yield SharedRowView(self, index)
+
+    def cell(self, position):
+        start = self.cell_end[position]
+        return str(self.data[start:self.cell_end[position + 1]], "utf-8")
+
+    def close(self):
+        """블록 닫기 (만든 프로세스는 삭제까지)"""
+        if self.shm is None:
+            return
+        # 메모리 뷰를 먼저 놓아야 블록을 닫을 수 있음
+        for view in (self.row_schema, self.row_start, self.cell_end, self.data):
+            view.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.shm = None
+
+
+class SharedRowView(Mapping):
+    """공유 메모리의 한 행을 읽는 읽기 전용 컨텍스트 (값은 처음 읽을 때 디코딩)"""
+
+    __slots__ = ("table", "names", "positions", "start", "values")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.names, self.positions = table.schemas[table.row_schema[index]]
+        self.start = table.row_start[index]
+        self.values = {}
+
+    def __getitem__(self, key):
+        value = self.values.get(key)
+        if value is None:
+            value = self.values[key] = self.table.cell(self.start + self.positions[key])
+        return value
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
@@ -0,0 +1,63 @@
+"""
+테스트 공용 설정 - 모듈이 jopApplication/ 아래 평평하게 있으므로 그 폴더를 import 경로에 추가
+
+실행: python -m pytest jopApplication/tests
+"""
+
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_template(path, cells, image=False, sheet="지원서"):
+    """cells: {"A1": "{{이름}}", ...} 값을 넣은 템플릿 .xlsx 작성 (image=True면 그림 하나 포함)"""
+    openpyxl = pytest.importorskip("openpyxl")
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = sheet
+    for ref, value in cells.items():
+        ws[ref] = value
+    if image:
+        from PIL import Image
+        from openpyxl.drawing.image import Image as SheetImage
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (16, 16), "red").save(buffer, "PNG")
+        buffer.seek(0)
+        ws.add_image(SheetImage(buffer), "E2")
+    wb.save(path)
+    return str(path)
+
+
+def read_cells(path, refs, sheet="지원서"):
+    """출력 .xlsx의 셀 값 읽기 -> {ref: 값}"""
+    openpyxl = pytest.importorskip("openpyxl")
+
+    wb = openpyxl.load_workbook(path)
+    try:
+        return {ref: wb[sheet][ref].value for ref in refs}
+    finally:
+        wb.close()
+
+
+@pytest.fixture
+def make_filler(tmp_path):
+    """설정 dict로 ExcelTemplateFiller 생성 (출력/보고서 폴더는 tmp_path 아래)"""
+    from excel_template_filler import ExcelTemplateFiller, FillerConfig
+
+    def factory(**settings):
+        raw = {
+            "save_pdf": False,
+            "catalog": False,
+            "output_dir": str(tmp_path / "output"),
+            "images_dir": str(tmp_path / "images"),
+        }
+        raw.update(settings)
+        return ExcelTemplateFiller(config=FillerConfig(raw, path=str(tmp_path / "config.json")))
+
+    return factory
@@ -0,0 +1,49 @@
+"""출력 경로 충돌/키 중복 사전 검사 (plan_collisions)"""
+
+import os
+
+import pytest
+
+
+def rows(*names):
+    return enumerate({"수험번호": key, "이름": name} for key, name in names)
+
+
+@pytest.fixture(params=[0, 512], ids=["memory", "bounded"])
+def plan(request, tmp_path, make_filler):
+    """메모리 색인과 메모리 제한 모드(임시 SQLite 색인) 양쪽으로 실행"""
+    def run(policy, *names):
+        filler = make_filler(collision_policy=policy, filename_pattern="{이름}.xlsx", memory_limit_mb=request.param)
+        result = filler.plan_collisions(rows(*names), str(tmp_path / "output"))
+        # 임시 색인 파일은 남기지 않음
+        report_dir = filler.get_report_dir()
+        assert not os.path.isdir(report_dir) or not os.listdir(report_dir)
+        return result
+
+    return run
+
+
+def test_summary_lists_only_collided_paths_and_keys(tmp_path, plan):
+    overrides, skipped, summary = plan(
+        "suffix", ("A1", "홍길동"), ("A2", "김철수"), ("A3", "홍길동"), ("A1", "이영희"), ("A4", "홍길동"),
+    )
+
+    path = os.path.normcase(os.path.abspath(tmp_path / "output" / "홍길동.xlsx"))
+    assert summary["paths"] == [{"path": path, "rows": [1, 3, 5]}]
+    assert summary["keys"] == [{"key": "A1", "rows": [1, 4]}]
+    assert {index: [os.path.basename(p) for _, p in jobs] for index, jobs in overrides.items()} == {
+        2: ["홍길동_2.xlsx"], 4: ["홍길동_3.xlsx"],
+    }
+    assert skipped == {} and summary["renamed"] == 2
+
+
+def test_suffix_skips_names_already_taken_by_other_rows(plan):
+    # '홍길동_2'라는 이름의 지원자가 이미 있으면 _3을 씀
+    overrides, _, _ = plan("suffix", ("A1", "홍길동"), ("A2", "홍길동_2"), ("A3", "홍길동"))
+    assert [os.path.basename(p) for _, p in overrides[2]] == ["홍길동_3.xlsx"]
+
+
+def test_skip_policy_reports_reasons(plan):
+    _, skipped, summary = plan("skip", ("A1", "홍길동"), ("A1", "김철수"), ("A2", "홍길동"))
+    assert skipped == {1: "수험번호 중복: A1", 2: "출력 경로 중복: 홍길동.xlsx"}
+    assert summary["skipped"] == 2
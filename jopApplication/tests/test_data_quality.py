@@ -0,0 +1,112 @@
+"""데이터 품질 사전 검사 - 문제 행 보고, 샤드별 결과 파일과 병합"""
+
+import csv
+import json
+import os
+
+import pytest
+
+from conftest import make_template
+from excel_template_filler import shard_of
+
+ROWS = 24
+# 이 행 인덱스의 생년월일은 입력 형식과 다름
+BAD_ROWS = {2, 7, 11, 19}
+
+
+@pytest.fixture
+def batch(tmp_path, make_filler):
+    data = tmp_path / "applicants.csv"
+    with open(data, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["수험번호", "이름", "생년월일"])
+        for i in range(ROWS):
+            birth = "1990/01/02" if i in BAD_ROWS else f"1990-01-{i % 28 + 1:02d}"
+            writer.writerow([f"A{i:03d}", f"지원자{i}", birth])
+    template = make_template(tmp_path / "template.xlsx", {
+        "A1": "{{이름}}", "B1": "{{생년월일|date:%Y-%m-%d->%Y.%m.%d}}",
+    })
+    return make_filler(
+        template_file=template, raw_data_file=str(data), backend="ooxml",
+        filename_pattern="{수험번호}.xlsx",
+    )
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_reports_rows_with_bad_dates(batch):
+    from data_quality import check_data_quality
+    from row_sources import open_row_source
+
+    result = check_data_quality(batch, enumerate(open_row_source(batch.config).iter_rows()), verbose=False)
+
+    assert result["rows"] == ROWS
+    assert {entry["row"] - 1 for entry in result["row_issues"]} == BAD_ROWS
+    assert result["by_check"] == [{"field": "생년월일", "check": "date", "rows": len(BAD_ROWS)}]
+    assert os.path.basename(result["file"]) == "data_quality.json"
+
+
+def test_shard_runs_write_separate_files_and_merge_combines_them(batch):
+    report_dir = batch.get_report_dir()
+    for i in (1, 2, 3):
+        report = batch.process_all(shard=(i, 3))
+        quality = report["data_quality"]
+        assert os.path.basename(quality["file"]) == f"data_quality_shard-{i}-of-3.json"
+        # 샤드는 자기 몫의 행만 검사
+        assert quality["rows"] == report["selected_rows"]
+
+    parts = [load(os.path.join(report_dir, f"data_quality_shard-{i}-of-3.json")) for i in (1, 2, 3)]
+    assert sum(part["rows"] for part in parts) == ROWS
+    assert not os.path.exists(os.path.join(report_dir, "data_quality.json"))
+
+    merged = batch.merge_run_reports()
+
+    assert merged["data_quality"]["rows"] == ROWS
+    assert merged["data_quality"]["rows_with_issues"] == len(BAD_ROWS)
+    assert merged["data_quality"]["shards"] == [1, 2, 3]
+    combined = load(os.path.join(report_dir, "data_quality.json"))
+    assert [entry["row"] - 1 for entry in combined["row_issues"]] == sorted(BAD_ROWS)
+    assert combined["by_check"] == [{"field": "생년월일", "check": "date", "rows": len(BAD_ROWS)}]
+
+
+def test_fail_mode_stops_only_shards_with_issues(batch):
+    batch.config["data_quality"] = "fail"
+
+    for i in (1, 2, 3):
+        report = batch.process_all(shard=(i, 3))
+        has_bad_rows = any(shard_of(f"A{index:03d}", 3) == i for index in BAD_ROWS)
+        assert (report is None) == has_bad_rows
+
+
+def test_check_keeps_stdout_and_transforms_stay_quiet(tmp_path, make_filler, monkeypatch, capsys):
+    # 검사 중에도 sys.stdout을 바꾸지 않음 (GUI/서비스 스레드 출력이 사라지지 않도록)
+    from data_quality import check_data_quality
+
+    template = make_template(tmp_path / "template.xlsx", {
+        "A1": "{{주소|split_line:1}}",
+        "B1": "{{입사일|combine:퇴사일,~,%Y-%m-%d->%y.%m.%d}}",
+        "C1": "{{생년월일|date:%Y-%m-%d->%Y.%m.%d|suffix:생}}",
+    })
+    filler = make_filler(template_file=template)
+    rows = [
+        {"주소": "서울\n강남구", "입사일": "2020-01-01", "퇴사일": "2021-01-01", "생년월일": "1990/01/02"},
+        {"주소": "부산", "입사일": "", "퇴사일": "", "생년월일": ""},
+    ]
+    filler.templates.get(template)
+    capsys.readouterr()
+    apply_step = filler.apply_step
+
+    def apply_step_beside_other_output(*args):
+        print("다른 스레드 출력")
+        return apply_step(*args)
+
+    monkeypatch.setattr(filler, "apply_step", apply_step_beside_other_output)
+
+    result = check_data_quality(filler, enumerate(rows), verbose=False)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines and set(lines) == {"다른 스레드 출력"}
+    assert result["rows_with_issues"] == 2
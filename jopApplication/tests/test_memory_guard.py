@@ -0,0 +1,61 @@
+"""메모리 측정과 메모리 상한 판단"""
+
+import sys
+
+import memory_guard
+
+
+def hide_psutil(monkeypatch):
+    # psutil이 설치되어 있어도 없는 것처럼 (import 시 ImportError)
+    monkeypatch.setitem(sys.modules, "psutil", None)
+
+
+def test_current_rss_mb_measures_this_process(monkeypatch):
+    hide_psutil(monkeypatch)
+    if sys.platform not in ("linux", "win32"):
+        return
+    rss = memory_guard.current_rss_mb()
+    assert rss is not None and rss > 0
+
+
+def test_current_rss_mb_uses_windows_api_on_windows(monkeypatch):
+    hide_psutil(monkeypatch)
+    monkeypatch.setattr(sys, "platform", "win32")
+    monkeypatch.setattr(memory_guard, "windows_rss_bytes", lambda: 64 * 1024 * 1024)
+    assert memory_guard.current_rss_mb() == 64
+
+
+def test_current_rss_mb_is_none_when_windows_api_fails(monkeypatch):
+    hide_psutil(monkeypatch)
+    monkeypatch.setattr(sys, "platform", "win32")
+
+    def unavailable():
+        raise OSError("psapi 없음")
+
+    monkeypatch.setattr(memory_guard, "windows_rss_bytes", unavailable)
+    assert memory_guard.current_rss_mb() is None
+
+
+def test_guard_reports_rss_unavailable_once(monkeypatch, capsys):
+    monkeypatch.setattr(memory_guard, "current_rss_mb", lambda: None)
+    guard = memory_guard.MemoryGuard(limit_mb=512, sample_rows=10)
+
+    assert guard.sample(10) == "ok"
+    assert guard.sample(20) == "ok"
+
+    assert capsys.readouterr().out.count("memory_limit_mb (512MB)가 적용되지 않습니다") == 1
+    summary = guard.summary()
+    assert summary["rss_available"] is False
+    assert summary["peak_mb"] is None and summary["samples"] == []
+    assert "RSS를 측정할 수 없어" in summary["note"]
+
+
+def test_guard_summary_without_limit(monkeypatch):
+    monkeypatch.setattr(memory_guard, "current_rss_mb", lambda: 100.0)
+    guard = memory_guard.MemoryGuard(sample_rows=10)
+
+    assert guard.sample(10, extra_mb=20.0) == "ok"
+
+    summary = guard.summary()
+    assert summary["rss_available"] is True and "note" not in summary
+    assert summary["peak_mb"] == 120.0 and summary["samples"] == [[10, 120.0]]
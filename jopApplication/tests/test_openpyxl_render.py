@@ -0,0 +1,40 @@
+"""openpyxl 백엔드 - 캐시된 컴파일 템플릿으로 여러 행 렌더링"""
+
+import pytest
+
+from conftest import make_template, read_cells
+
+pytest.importorskip("openpyxl")
+pytest.importorskip("PIL")
+
+
+def test_renders_many_rows_from_template_with_image(tmp_path, make_filler):
+    template = make_template(tmp_path / "template.xlsx", {"A1": "{{이름}}", "B1": "{{전화|digits}}"}, image=True)
+    filler = make_filler(template_file=template)
+
+    outputs = []
+    for i in range(3):
+        output = str(tmp_path / f"out{i}.xlsx")
+        filler.fill_workbook_openpyxl(template, {"이름": f"지원자{i}", "전화": f"010-000-{i}"}, output, save_pdf=False)
+        outputs.append(output)
+
+    import openpyxl
+
+    for i, output in enumerate(outputs):
+        assert read_cells(output, ["A1", "B1"]) == {"A1": f"지원자{i}", "B1": f"010000{i}"}
+        wb = openpyxl.load_workbook(output)
+        assert len(wb["지원서"]._images) == 1
+    # 템플릿은 한 번만 컴파일
+    assert filler.templates.misses == 1
+    assert filler.templates.hits == 2
+
+
+def test_render_does_not_change_cached_template(tmp_path, make_filler):
+    template = make_template(tmp_path / "template.xlsx", {"A1": "{{이름}}"})
+    filler = make_filler(template_file=template)
+
+    filler.fill_workbook_openpyxl(template, {"이름": "홍길동"}, str(tmp_path / "a.xlsx"), save_pdf=False)
+    filler.fill_workbook_openpyxl(template, {}, str(tmp_path / "b.xlsx"), save_pdf=False)
+
+    assert read_cells(tmp_path / "a.xlsx", ["A1"]) == {"A1": "홍길동"}
+    assert read_cells(tmp_path / "b.xlsx", ["A1"]) == {"A1": None}
@@ -0,0 +1,73 @@
+"""출력 카탈로그 - 행마다 커밋, 다른 프로세스(샤드)가 잠근 동안의 보류/재시도"""
+
+import sqlite3
+
+import pytest
+
+import output_catalog
+from output_catalog import OutputCatalog
+
+REPORT = {"started_at": "s", "finished_at": "f", "host": "h", "backend": "ooxml", "success": 2, "failed": 0}
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    monkeypatch.setattr(output_catalog, "ROW_BUSY_TIMEOUT", 0.05)
+    catalog = OutputCatalog(str(tmp_path / "catalog.sqlite"))
+    yield catalog
+    catalog.conn.close()
+
+
+def entry(tmp_path, row, name):
+    path = tmp_path / f"{name}.xlsx"
+    path.write_bytes(b"xlsx" * row)
+    return {"row": row, "key": f"A{row:03d}", "name": name, "outputs": [str(path)]}
+
+
+def count_outputs(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM outputs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_each_row_is_committed_immediately(tmp_path, catalog):
+    assert catalog.add("run", entry(tmp_path, 1, "홍길동"), "fp", 12.3, "ooxml")
+
+    # 다음 행을 렌더링하는 동안 쓰기 트랜잭션을 열어 두지 않음
+    assert not catalog.conn.in_transaction
+    assert count_outputs(catalog.path) == 1
+    assert catalog.find("홍")[0]["key"] == "A001"
+
+
+def test_locked_catalog_defers_and_retries(tmp_path, catalog):
+    other = sqlite3.connect(catalog.path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")  # 다른 샤드가 쓰기 잠금을 쥐고 있음
+    try:
+        assert not catalog.add("run", entry(tmp_path, 1, "홍길동"), "fp", 1.0, "ooxml")
+        assert catalog.unrecorded() == 1
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+    # 잠금이 풀리면 다음 행에서 보류한 기록까지 함께 기록
+    assert catalog.add("run", entry(tmp_path, 2, "김영희"), "fp", 1.0, "ooxml")
+    assert catalog.unrecorded() == 0
+    assert count_outputs(catalog.path) == 2
+    assert catalog.finish_run("run", REPORT) == 0
+
+
+def test_finish_run_reports_records_it_could_not_write(tmp_path, catalog, monkeypatch):
+    monkeypatch.setattr(output_catalog, "FINISH_BUSY_TIMEOUT", 0.05)
+    catalog.add("run", entry(tmp_path, 1, "홍길동"), "fp", 1.0, "ooxml")
+    other = sqlite3.connect(catalog.path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        catalog.add("run", entry(tmp_path, 2, "김영희"), "fp", 1.0, "ooxml")
+        with pytest.raises(sqlite3.OperationalError):
+            catalog.finish_run("run", REPORT)
+        assert catalog.unrecorded() == 1
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
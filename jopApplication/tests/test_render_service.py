@@ -0,0 +1,193 @@
+"""로컬 렌더링 서비스 - 임의 포트로 띄우고 render_remote 클라이언트로 요청 (포털 대신)"""
+
+import io
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import make_template
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from excel_template_filler import FillerConfig  # noqa: E402
+from render_service import make_server, render_remote  # noqa: E402
+
+
+@pytest.fixture
+def service(tmp_path):
+    """템플릿(그림 포함) 하나로 서비스 시작 -> (기본 URL, 서비스)"""
+    template = make_template(
+        tmp_path / "template.xlsx", {"A1": "{{이름}}", "B1": "{{전화|digits}}", "C1": "{{수험번호}}"}, image=True
+    )
+    config = FillerConfig({
+        "template_file": template,
+        "save_pdf": False,
+        "catalog": False,
+        "images_dir": str(tmp_path / "images"),
+        "output_dir": str(tmp_path / "output"),
+        "filename_pattern": "{수험번호}_{이름}.xlsx",
+    }, path=str(tmp_path / "config.json"))
+    server = make_server(host="127.0.0.1", port=0, config=config)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    try:
+        yield f"http://{host}:{port}", server.RequestHandlerClass.service
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.RequestHandlerClass.service.close()
+
+
+def applicant(i):
+    return {"수험번호": f"A{i:03d}", "이름": f"지원자{i}", "전화": f"010-1234-{i:04d}"}
+
+
+def check_workbook(body, context):
+    wb = openpyxl.load_workbook(io.BytesIO(body))
+    ws = wb["지원서"]
+    assert ws["A1"].value == context["이름"]
+    assert ws["B1"].value == context["전화"].replace("-", "")
+    assert ws["C1"].value == context["수험번호"]
+    # 템플릿 그림이 매 요청 유지됨
+    assert len(ws._images) == 1
+
+
+def get_json(url):
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return json.loads(response.read())
+
+
+def post_raw(url, body):
+    request = urllib.request.Request(url + "/render", data=body, method="POST",
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def test_sequential_requests_render_each_context(service):
+    url, _ = service
+    for i in range(3):
+        body, headers = render_remote(applicant(i), url=url)
+        check_workbook(body, applicant(i))
+        assert float(headers["X-Render-Ms"]) >= 0
+        assert f"A{i:03d}" in urllib.request.unquote(headers["Content-Disposition"])
+
+
+def test_concurrent_requests(service):
+    url, _ = service
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda i: render_remote(applicant(i), url=url), range(12)))
+    for i, (body, _) in enumerate(results):
+        check_workbook(body, applicant(i))
+
+
+def test_metrics_report_latency_and_backend(service):
+    url, service_object = service
+    for i in range(2):
+        render_remote(applicant(i), url=url)
+
+    metrics = get_json(url + "/metrics")
+    assert metrics["backend"] == service_object.backend == "ooxml"
+    assert metrics["requests"] == 2
+    assert metrics["failures"] == 0
+    assert metrics["latency_ms"]["p50"] is not None
+    assert metrics["latency_ms"]["p95"] is not None
+    assert metrics["latency_ms"]["max"] >= metrics["latency_ms"]["p50"]
+    assert get_json(url + "/health")["status"] == "ok"
+
+
+@pytest.mark.parametrize("body, message", [
+    (b"{not json", None),
+    (json.dumps({"pdf": False}).encode(), "context"),
+    (json.dumps({"context": {"이름": "홍길동"}}, ensure_ascii=False).encode(), "수험번호"),
+    (json.dumps({"context": {"수험번호": "../x", "이름": "a"}}).encode(), None),
+    (json.dumps({"context": applicant(1), "template": "other.xlsx"}, ensure_ascii=False).encode(), "other.xlsx"),
+])
+def test_invalid_requests_are_client_errors(service, body, message):
+    url, _ = service
+    status, payload = post_raw(url, body)
+    assert status == 400
+    if message:
+        assert message in json.loads(payload)["error"]
+
+
+def test_server_failures_are_server_errors(service):
+    url, service_object = service
+    # 렌더링 중 서버 쪽 실패 (템플릿 파일이 사라짐)
+    os.remove(service_object.filler.get_template_paths()[0])
+    status, payload = post_raw(url, json.dumps({"context": applicant(1)}).encode())
+    assert status == 500
+    assert get_json(url + "/metrics")["failures"] == 1
+
+
+def post_pdf(url, context):
+    return post_raw(url, json.dumps({"context": context, "pdf": True}, ensure_ascii=False).encode())
+
+
+def test_pdf_requests_without_excel(service):
+    url, _ = service
+    # 요청 검증 오류는 PDF 가능 여부와 관계없이 400
+    status, payload = post_pdf(url, {"이름": "홍길동"})
+    assert status == 400 and "수험번호" in json.loads(payload)["error"]
+    # Excel이 없어 PDF를 만들 수 없는 것은 서버 쪽 문제 (500)
+    status, payload = post_pdf(url, applicant(1))
+    assert status == 500 and "PDF" in json.loads(payload)["error"]
+
+
+@pytest.fixture
+def fake_excel(service, monkeypatch):
+    """PDF 변환을 가짜로 바꿈 -> 호출 기록 [(스레드 이름, 동시에 실행 중인 변환 수)]"""
+    _, service_object = service
+    calls = []
+    running = []
+    lock = threading.Lock()
+
+    def save_as_pdf(excel_path, pdf_path):
+        with lock:
+            running.append(excel_path)
+            calls.append((threading.current_thread().name, len(running)))
+        time.sleep(0.02)
+        with open(pdf_path, "wb") as f:
+            f.write(b"%PDF-fake " + os.path.basename(excel_path).encode("utf-8"))
+        with lock:
+            running.remove(excel_path)
+
+    monkeypatch.setattr(service_object.filler, "pdf_available", lambda: True)
+    monkeypatch.setattr(service_object.filler, "save_as_pdf_xlwings", save_as_pdf)
+    return calls
+
+
+def test_pdf_export_runs_one_at_a_time_on_its_own_thread(service, fake_excel):
+    url, _ = service
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda i: post_pdf(url, applicant(i)), range(8)))
+
+    for i, (status, body) in enumerate(results):
+        assert status == 200
+        assert body == f"%PDF-fake A{i:03d}_지원자{i}.xlsx".encode("utf-8")
+    assert len(fake_excel) == 8
+    # 요청 스레드가 아니라 PDF 전용 스레드 하나에서, 한 번에 한 건씩
+    assert {name for name, _ in fake_excel} == {"render-pdf_0"}
+    assert {count for _, count in fake_excel} == {1}
+
+
+def test_pdf_export_failure_is_server_error(service, monkeypatch):
+    url, service_object = service
+
+    def broken(excel_path, pdf_path):
+        raise RuntimeError("Excel 응답 없음")
+
+    monkeypatch.setattr(service_object.filler, "pdf_available", lambda: True)
+    monkeypatch.setattr(service_object.filler, "save_as_pdf_xlwings", broken)
+    status, payload = post_pdf(url, applicant(1))
+    assert status == 500 and "Excel 응답 없음" in json.loads(payload)["error"]
@@ -0,0 +1,198 @@
+"""감시되는 작업자 프로세스 (workers > 0) - 설정 전달, 시간 초과/비정상 종료/교체/취소/작업자 수 조정
+
+작업자는 spawn으로 시작하므로 실제 프로세스를 띄워 확인한다.
+렌더링을 바꿀 때는 작업자 본체를 이 모듈의 stub_worker_main으로 바꿔 작업자 안에서 render_row를 교체한다.
+"""
+
+import csv
+import os
+import threading
+import time
+
+import pytest
+
+import render_workers
+from conftest import make_template, read_cells
+from excel_template_filler import ExcelTemplateFiller, FillerConfig
+
+real_worker_main = render_workers.worker_main
+
+
+def stub_render_row(self, index, context, output_dir, outputs=None, jobs=None):
+    """출력 파일을 일부만 쓰고 '동작' 값에 따라 멈추거나 프로세스를 종료"""
+    outputs = outputs if outputs is not None else []
+    for _, output_path in jobs or self.get_row_outputs(context, index, output_dir):
+        outputs.append(output_path)
+        os.makedirs(output_dir, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(str(os.getpid()))
+        if context.get("동작") == "sleep":
+            time.sleep(60)
+        elif context.get("동작") == "crash":
+            os._exit(3)
+    return outputs
+
+
+def stub_worker_main(*args):
+    ExcelTemplateFiller.render_row = stub_render_row
+    real_worker_main(*args)
+
+
+def row(index, action=""):
+    context = {"수험번호": f"A{index:03d}", "이름": f"지원자{index}", "동작": action}
+    return index, context["수험번호"], context, None
+
+
+@pytest.fixture
+def stub_supervisor(monkeypatch, settings):
+    """렌더링을 stub_render_row로 바꾼 WorkerSupervisor 생성 함수"""
+    monkeypatch.setattr(render_workers, "worker_main", stub_worker_main)
+
+    def factory(cancel_event=None, **overrides):
+        filler = ExcelTemplateFiller(config=FillerConfig({**settings, **overrides}))
+        filler.resolve_backend(report=False)
+        return render_workers.WorkerSupervisor(filler, cancel_event)
+
+    return factory
+
+
+def run(supervisor, tasks, output_dir):
+    return {index: (status, error) for index, _, _, status, _, error, _ in supervisor.run(tasks, output_dir)}
+
+
+@pytest.fixture
+def settings(tmp_path):
+    data = tmp_path / "applicants.csv"
+    with open(data, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["수험번호", "이름"])
+        for i in range(3):
+            writer.writerow([f"A{i:03d}", f"지원자{i}"])
+    return {
+        "template_file": make_template(tmp_path / "template.xlsx", {"A1": "{{이름}}"}),
+        "raw_data_file": str(data),
+        "output_dir": str(tmp_path / "output"),
+        "images_dir": str(tmp_path / "images"),
+        "backend": "ooxml",
+        "save_pdf": False,
+        "catalog": False,
+        "workers": 1,
+        "filename_pattern": "{수험번호}_{이름}.xlsx",
+    }
+
+
+@pytest.mark.parametrize("path", [None, "missing"])
+def test_workers_render_with_the_parent_config(tmp_path, settings, path):
+    # 설정 파일이 없거나 경로가 없어도 작업자는 감시 프로세스의 설정으로 렌더링
+    config_path = str(tmp_path / "config.json") if path else None
+    filler = ExcelTemplateFiller(config=FillerConfig(settings, path=config_path))
+    # 메모리에서만 바꾼 설정도 작업자에 적용
+    filler.config["filename_pattern"] = "{이름}_메모리.xlsx"
+
+    report = filler.process_all()
+
+    assert report["success"] == 3
+    assert report["workers"]["crashes"] == 0
+    assert read_cells(os.path.join(settings["output_dir"], "지원자1_메모리.xlsx"), ["A1"]) == {"A1": "지원자1"}
+    assert not os.path.exists(tmp_path / "config.json")
+
+
+def test_idle_worker_that_died_is_replaced_and_row_requeued(tmp_path, settings):
+    from render_workers import WorkerSupervisor
+
+    filler = ExcelTemplateFiller(config=FillerConfig(settings, path=None))
+    filler.resolve_backend(report=False)
+    supervisor = WorkerSupervisor(filler)
+
+    def tasks():
+        for index in range(3):
+            if index == 1:
+                # 쉬고 있는 작업자가 죽은 뒤 다음 행을 배정
+                worker = supervisor.workers[0]
+                worker.process.kill()
+                worker.process.join(5)
+            yield index, f"A{index:03d}", {"수험번호": f"A{index:03d}", "이름": f"지원자{index}"}, None
+
+    results = list(supervisor.run(tasks(), settings["output_dir"]))
+
+    assert sorted((index, status) for index, _, _, status, *_ in results) == [
+        (0, "success"), (1, "success"), (2, "success"),
+    ]
+    assert supervisor.stats["crashes"] == 1
+    assert supervisor.stats["started"] == 2
+
+
+def test_row_past_timeout_kills_worker_and_removes_partial_output(settings, stub_supervisor):
+    supervisor = stub_supervisor(row_timeout=2)
+    output_dir = settings["output_dir"]
+
+    results = run(supervisor, [row(0), row(1, "sleep"), row(2)], output_dir)
+
+    assert results[0] == ("success", None) and results[2] == ("success", None)
+    assert results[1] == ("failed", "시간 초과 (2초)")
+    assert supervisor.stats["timeouts"] == 1
+    assert not os.path.exists(os.path.join(output_dir, "A001_지원자1.xlsx"))
+    assert os.path.exists(os.path.join(output_dir, "A002_지원자2.xlsx"))
+
+
+def test_crashed_worker_is_replaced_and_partial_output_removed(settings, stub_supervisor):
+    supervisor = stub_supervisor()
+    output_dir = settings["output_dir"]
+
+    results = run(supervisor, [row(0), row(1, "crash"), row(2)], output_dir)
+
+    assert results[1] == ("failed", "작업자 비정상 종료 (exitcode 3)")
+    assert results[0][0] == results[2][0] == "success"
+    assert supervisor.stats["crashes"] == 1
+    assert supervisor.stats["started"] == 2
+    assert not os.path.exists(os.path.join(output_dir, "A001_지원자1.xlsx"))
+
+
+def test_worker_is_recycled_after_worker_max_rows(settings, stub_supervisor):
+    supervisor = stub_supervisor(worker_max_rows=2)
+    output_dir = settings["output_dir"]
+
+    results = run(supervisor, [row(i) for i in range(5)], output_dir)
+
+    assert all(status == "success" for status, _ in results.values())
+    assert supervisor.stats["recycled"] == 2
+    assert supervisor.stats["started"] == 3
+    # stub_render_row는 출력 파일에 작업자 pid를 기록
+    pids = []
+    for i in range(5):
+        with open(os.path.join(output_dir, f"A{i:03d}_지원자{i}.xlsx"), encoding="utf-8") as f:
+            pids.append(f.read())
+    assert pids[0] == pids[1] != pids[2] == pids[3] != pids[4]
+
+
+def test_cancel_kills_busy_worker_and_reports_row_cancelled(settings, stub_supervisor):
+    cancel = threading.Event()
+    supervisor = stub_supervisor(cancel_event=cancel)
+    timer = threading.Timer(1.0, cancel.set)
+    timer.start()
+    try:
+        start = time.monotonic()
+        results = run(supervisor, [row(0, "sleep"), row(1)], settings["output_dir"])
+    finally:
+        timer.cancel()
+
+    assert results == {0: ("cancelled", "사용자 취소")}
+    assert time.monotonic() - start < 10
+    assert not os.path.exists(os.path.join(settings["output_dir"], "A000_지원자0.xlsx"))
+
+
+def test_throttle_keeps_at_least_one_worker(settings):
+    filler = ExcelTemplateFiller(config=FillerConfig({**settings, "workers": 3}))
+    supervisor = render_workers.WorkerSupervisor(filler)
+
+    for _ in range(3):
+        supervisor.throttle("over")
+    assert supervisor.active_limit == 1
+    assert supervisor.stats["throttled"] == 2 and supervisor.stats["min_workers"] == 1
+
+    supervisor.throttle("warn")
+    assert supervisor.active_limit == 1
+    supervisor.throttle("ok")
+    supervisor.throttle("ok")
+    supervisor.throttle("ok")
+    assert supervisor.active_limit == 3
@@ -0,0 +1,177 @@
+"""원천 데이터 행 공급자 - 형식과 관계없이 같은 문자열 행 계약, 조인, 프로젝션"""
+
+import csv
+import json
+import sqlite3
+
+import pytest
+
+from row_sources import open_row_source, row_fingerprint
+
+COLUMNS = ["수험번호", "이름", "전화", "점수", "비고"]
+# 점수는 숫자로 저장 가능한 형식(Excel/JSONL/SQLite)에서는 숫자로 저장
+ROWS = [
+    ["A001", "홍길동", "010-1234-5678", 90, "0101"],
+    ["A002", "김영희", "", 85, None],
+    ["A003", "이철수", "010-5555-0000", 70, "N/A"],
+]
+EXPECTED = [
+    {"수험번호": "A001", "이름": "홍길동", "전화": "010-1234-5678", "점수": "90", "비고": "0101"},
+    {"수험번호": "A002", "이름": "김영희", "전화": "", "점수": "85", "비고": ""},
+    {"수험번호": "A003", "이름": "이철수", "전화": "010-5555-0000", "점수": "70", "비고": ""},
+]
+
+
+def write_excel(path, sheets):
+    openpyxl = pytest.importorskip("openpyxl")
+    pytest.importorskip("pandas")
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for name, (columns, rows) in sheets.items():
+        ws = wb.create_sheet(name)
+        ws.append(columns)
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+
+
+def write_csv(path, columns, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(["" if value is None else value for value in row])
+
+
+def write_jsonl(path, columns, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n")
+
+
+def write_sqlite(path, sheets):
+    conn = sqlite3.connect(path)
+    for name, (columns, rows) in sheets.items():
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        conn.execute(f'CREATE TABLE "{name}" ({column_list})')
+        conn.executemany(f'INSERT INTO "{name}" VALUES ({", ".join("?" * len(columns))})', rows)
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture(params=["excel", "csv", "jsonl", "sqlite"])
+def source_config(request, tmp_path):
+    """같은 데이터를 형식별 파일로 작성한 설정"""
+    fmt = request.param
+    if fmt == "excel":
+        path = tmp_path / "data.xlsx"
+        write_excel(path, {"지원자": (COLUMNS, ROWS)})
+    elif fmt == "csv":
+        path = tmp_path / "data.csv"
+        write_csv(path, COLUMNS, ROWS)
+    elif fmt == "jsonl":
+        path = tmp_path / "data.jsonl"
+        write_jsonl(path, COLUMNS, ROWS)
+    else:
+        path = tmp_path / "data.sqlite"
+        write_sqlite(path, {"지원자": (COLUMNS, ROWS)})
+    return {"raw_data_file": str(path), "raw_data_sheet": "지원자", "encoding": "utf-8"}
+
+
+def test_every_format_yields_same_string_rows(source_config):
+    source = open_row_source(source_config)
+    rows = [dict(row) for row in source.iter_rows()]
+
+    assert rows == EXPECTED
+    assert all(isinstance(value, str) for row in rows for value in row.values())
+    assert list(source.columns()) == COLUMNS
+
+
+def test_projection_reads_only_requested_columns(source_config):
+    source = open_row_source(source_config, fields={"이름", "점수"})
+    rows = [dict(row) for row in source.iter_rows()]
+
+    assert rows == [{"이름": row["이름"], "점수": row["점수"]} for row in EXPECTED]
+    # 컬럼 목록은 프로젝션과 관계없이 전체
+    assert list(source.columns()) == COLUMNS
+
+
+def test_count_matches_rows(source_config):
+    count = open_row_source(source_config).count()
+    assert count in (None, len(EXPECTED))
+
+
+def test_csv_blank_and_duplicate_headers_follow_pandas_names(tmp_path):
+    path = tmp_path / "data.csv"
+    write_csv(path, ["이름", "", "이름"], [["a", "b", "c"]])
+    rows = list(open_row_source({"raw_data_file": str(path)}).iter_rows())
+    assert rows == [{"이름": "a", "Unnamed: 1": "b", "이름.1": "c"}]
+
+
+def test_unknown_format_is_reported(tmp_path):
+    with pytest.raises(ValueError):
+        open_row_source({"raw_data_file": str(tmp_path / "data.txt")})
+
+
+@pytest.fixture
+def joined_config(tmp_path):
+    path = tmp_path / "joined.sqlite"
+    write_sqlite(path, {
+        "지원자": (["수험번호", "이름"], [["A001", "홍길동"], ["A002", "김영희"], ["A003", "이철수"]]),
+        # A001은 경력 2건, A002는 없음, A003은 1건
+        "경력": (["수험번호", "회사"], [["A001", "가회사"], ["A003", "다회사"], ["A001", "나회사"]]),
+        # A001은 키 중복 (1:1에서는 첫 레코드만 사용), A003은 없음
+        "점수": (["수험번호", "점수"], [["A001", 90], ["A002", 85], ["A001", 10]]),
+    })
+    return {
+        "raw_data_file": str(path),
+        "raw_data_sheet": "지원자",
+        "joins": [
+            {"sheet": "경력", "key": "수험번호", "many": True},
+            {"sheet": "점수", "key": "수험번호", "prefix": "시험"},
+        ],
+    }
+
+
+def test_join_one_to_many_and_one_to_one(joined_config):
+    rows = {row["수험번호"]: dict(row) for row in open_row_source(joined_config).iter_rows()}
+
+    assert rows["A001"] == {
+        "수험번호": "A001", "이름": "홍길동",
+        "경력[0].회사": "가회사", "경력[1].회사": "나회사", "경력.건수": "2",
+        "시험.점수": "90",
+    }
+    assert rows["A003"]["경력[0].회사"] == "다회사"
+    assert rows["A003"]["경력.건수"] == "1"
+
+
+def test_join_missing_key_gives_empty_values(joined_config):
+    rows = {row["수험번호"]: dict(row) for row in open_row_source(joined_config).iter_rows()}
+
+    # 1:N 매칭 없음 -> 건수 0, 번호 필드 없음 (렌더링 시 빈 칸)
+    assert rows["A002"]["경력.건수"] == "0"
+    assert "경력[0].회사" not in rows["A002"]
+    # 1:1 매칭 없음 -> 보조 시트 컬럼이 빈 값
+    assert rows["A003"]["시험.점수"] == ""
+
+
+def test_join_projection_keeps_only_referenced_records(joined_config):
+    source = open_row_source(joined_config, fields={"이름", "경력[0].회사"})
+    rows = [dict(row) for row in source.iter_rows()]
+
+    assert rows[0]["경력[0].회사"] == "가회사"
+    assert "경력[1].회사" not in rows[0]
+    assert rows[0]["경력.건수"] == "2"
+    # 템플릿이 참조하지 않는 보조 시트 컬럼은 붙이지 않음
+    assert "시험.점수" not in rows[0]
+
+
+def test_join_columns_describe_joined_fields(joined_config):
+    columns = open_row_source(joined_config).columns()
+    assert columns == ["수험번호", "이름", "경력[0].회사", "경력.건수", "시험.점수"]
+
+
+def test_row_fingerprint_depends_on_values_not_order():
+    row = {"이름": "홍길동", "전화": "010"}
+    assert row_fingerprint(row) == row_fingerprint({"전화": "010", "이름": "홍길동"})
+    assert row_fingerprint(row) != row_fingerprint({"이름": "홍길동", "전화": "011"})
@@ -0,0 +1,151 @@
+"""결정적 샤드 분배 (--shard i/N)와 샤드별 실행 보고서 병합"""
+
+import csv
+import json
+import os
+
+import pytest
+
+from conftest import make_template
+from excel_template_filler import parse_shard_spec, pop_option, shard_of
+
+ROWS = 30
+
+
+@pytest.fixture
+def batch(tmp_path, make_filler):
+    """ROWS행 CSV와 템플릿으로 만든 filler 생성 함수"""
+    data = tmp_path / "applicants.csv"
+    with open(data, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["수험번호", "이름"])
+        for i in range(ROWS):
+            writer.writerow([f"A{i:03d}", f"지원자{i}"])
+    template = make_template(tmp_path / "template.xlsx", {"A1": "{{이름}}"})
+
+    def factory(**settings):
+        return make_filler(
+            template_file=template, raw_data_file=str(data), backend="ooxml",
+            filename_pattern="{수험번호}_{이름}.xlsx", **settings,
+        )
+
+    return factory
+
+
+def read_manifest(filler, shard=None):
+    suffix = f"_shard-{shard[0]}-of-{shard[1]}" if shard else ""
+    with open(os.path.join(filler.get_report_dir(), f"manifest{suffix}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("spec, expected", [("1/3", (1, 3)), (" 2 / 4 ", (2, 4)), ("1/1", (1, 1))])
+def test_parse_shard_spec(spec, expected):
+    assert parse_shard_spec(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["0/3", "4/3", "1/0", "a/b", "1-3", ""])
+def test_parse_shard_spec_rejects_bad_specs(spec):
+    with pytest.raises(ValueError):
+        parse_shard_spec(spec)
+
+
+def test_shard_option_is_popped_from_args():
+    args = ["--shard", "2/3", "check"]
+    assert pop_option(args, "--shard") == "2/3"
+    assert args == ["check"]
+    args = ["--shard=1/2"]
+    assert pop_option(args, "--shard") == "1/2"
+    assert args == []
+    assert pop_option(["check"], "--shard") is None
+
+
+def test_shard_of_is_stable_across_processes():
+    # 프로세스/호스트마다 달라지는 hash()가 아니라 CRC32 기준 - 값이 바뀌면 호스트 간 분배가 어긋남
+    assert [shard_of("A000", 3), shard_of("A001", 3), shard_of("row-5", 3)] == [3, 1, 3]
+    assert shard_of("홍길동", 7) == 4
+    assert all(1 <= shard_of(f"A{i:03d}", 4) <= 4 for i in range(100))
+
+
+def test_get_shard_key_uses_key_field_then_row_number(batch):
+    filler = batch()
+    assert filler.get_shard_key({"수험번호": " A001 ", "이름": "홍길동"}, 0) == "A001"
+    assert filler.get_shard_key({"수험번호": "", "이름": "홍길동"}, 4) == "row-5"
+    assert batch(shard_key_field="이름").get_shard_key({"수험번호": "A001", "이름": "홍길동"}, 0) == "홍길동"
+
+
+def test_shards_partition_rows_exactly_once(batch):
+    filler = batch()
+    rows_by_shard = {}
+    for i in (1, 2, 3):
+        report = filler.process_all(shard=(i, 3))
+        manifest = read_manifest(filler, (i, 3))
+        rows_by_shard[i] = {entry["row"] for entry in manifest}
+        assert report["selected_rows"] == len(manifest)
+        assert all(shard_of(entry["key"], 3) == i for entry in manifest)
+
+    all_rows = set().union(*rows_by_shard.values())
+    assert all_rows == set(range(1, ROWS + 1))
+    assert sum(len(rows) for rows in rows_by_shard.values()) == ROWS
+
+
+def test_same_shard_selects_same_rows_every_run(batch):
+    filler = batch()
+    filler.process_all(shard=(2, 3))
+    first = read_manifest(filler, (2, 3))
+    filler.process_all(shard=(2, 3))
+    assert [entry["key"] for entry in read_manifest(filler, (2, 3))] == [entry["key"] for entry in first]
+
+
+def test_merge_run_reports_combines_all_shards(batch):
+    filler = batch()
+    for i in (1, 2, 3):
+        filler.process_all(shard=(i, 3))
+
+    merged = filler.merge_run_reports()
+
+    assert merged["shard_count"] == 3
+    assert merged["shards"] == [1, 2, 3]
+    assert merged["missing_shards"] == []
+    assert merged["selected_rows"] == merged["total_rows"] == ROWS
+    assert merged["success"] == ROWS
+    assert merged["output_collisions"] == {}
+    manifest = read_manifest(filler)
+    assert [entry["row"] for entry in manifest] == list(range(1, ROWS + 1))
+
+
+def test_merge_run_reports_reports_missing_shard(batch):
+    filler = batch()
+    filler.process_all(shard=(1, 3))
+    filler.process_all(shard=(3, 3))
+
+    merged = filler.merge_run_reports()
+
+    assert merged["missing_shards"] == [2]
+    assert merged["selected_rows"] < merged["total_rows"]
+
+
+def test_merge_run_reports_without_shard_reports(batch):
+    assert batch().merge_run_reports() is None
+
+
+def test_process_all_reads_the_source_once_before_rendering(batch, monkeypatch):
+    # 행 수 / 충돌 검사 / 데이터 품질 검사를 한 번의 순회로 - 원본은 사전 검사와 렌더링에서 두 번만 읽음
+    from row_sources import CsvRowSource
+
+    reads = []
+    iter_rows = CsvRowSource.iter_rows
+
+    def counted(self):
+        reads.append(1)
+        return iter_rows(self)
+
+    monkeypatch.setattr(CsvRowSource, "iter_rows", counted)
+    events = []
+    filler = batch(data_quality="warn")
+    report = filler.process_all(shard=(2, 3), events=events.append)
+
+    assert len(reads) == 2
+    started = next(event for event in events if event["kind"] == "run_started")
+    # 샤드 몫의 행 수도 사전 검사 순회에서 셈
+    assert started["total"] == report["selected_rows"]
+    assert report["data_quality"]["rows"] == report["selected_rows"]
@@ -0,0 +1,102 @@
+"""공유 메모리 행 테이블 - 만들기/열기/행 읽기/닫기, 행마다 다른 컬럼 구성"""
+
+import multiprocessing
+
+import pytest
+
+from shared_rows import SharedRowTable
+
+ROWS = [
+    {"수험번호": "A001", "이름": "홍길동", "자기소개": "안녕하세요\n반갑습니다"},
+    {"수험번호": "A002", "이름": "", "자기소개": "😀 유니코드"},
+    # 1:N 조인처럼 행마다 컬럼이 다름
+    {"수험번호": "A003", "이름": "이철수", "경력[0].회사": "가회사", "경력.건수": "1"},
+    {"수험번호": "A004", "이름": "박민수", "자기소개": "x" * 10000},
+]
+
+
+@pytest.fixture
+def table():
+    table = SharedRowTable.create(iter(ROWS))
+    yield table
+    table.close()
+
+
+def test_rows_round_trip_with_per_row_schemas(table):
+    assert table.rows == len(ROWS)
+    for index, expected in enumerate(ROWS):
+        row = table.row(index)
+        assert dict(row) == expected
+        assert list(row) == list(expected)  # 컬럼 순서 유지
+        assert len(row) == len(expected)
+    assert [dict(row) for row in table.iter_rows()] == ROWS
+    # 같은 컬럼 구성은 한 번만 저장
+    assert len(table.schemas) == 2
+
+
+def test_row_view_is_a_read_only_mapping(table):
+    row = table.row(2)
+    assert "경력[0].회사" in row
+    assert "자기소개" not in row
+    assert row.get("자기소개", "") == ""
+    with pytest.raises(KeyError):
+        row["자기소개"]
+    with pytest.raises(TypeError):
+        row["이름"] = "변경"
+
+
+def test_values_are_stored_as_strings():
+    table = SharedRowTable.create([{"점수": 90, "비율": 0.5, "없음": None}])
+    try:
+        assert dict(table.row(0)) == {"점수": "90", "비율": "0.5", "없음": "None"}
+    finally:
+        table.close()
+
+
+def test_empty_table():
+    table = SharedRowTable.create([])
+    try:
+        assert table.rows == 0
+        assert list(table.iter_rows()) == []
+    finally:
+        table.close()
+
+
+def test_attach_reads_same_rows_and_does_not_unlink(table):
+    attached = SharedRowTable.attach(table.name)
+    try:
+        assert dict(attached.row(3)) == ROWS[3]
+    finally:
+        attached.close()
+    # 연 쪽이 닫아도 블록은 남아 있음
+    assert dict(table.row(0)) == ROWS[0]
+
+
+def test_owner_close_unlinks_block():
+    table = SharedRowTable.create(ROWS)
+    name = table.name
+    table.close()
+    table.close()  # 두 번 닫아도 안전
+    with pytest.raises(FileNotFoundError):
+        SharedRowTable.attach(name)
+
+
+def read_in_child(name, index, queue):
+    table = SharedRowTable.attach(name)
+    try:
+        queue.put(dict(table.row(index)))
+    finally:
+        table.close()
+
+
+def test_attach_from_worker_process(table):
+    # 작업자와 같은 spawn 방식으로 다른 프로세스에서 열기
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=read_in_child, args=(table.name, 2, queue))
+    process.start()
+    try:
+        assert queue.get(timeout=30) == ROWS[2]
+    finally:
+        process.join(30)
+    assert process.exitcode == 0
@@ -0,0 +1,136 @@
+"""watch 모드 주기 - 실패한 행 재시도, 중복 키, 출력 경로 충돌 정책"""
+
+import csv
+import json
+import os
+
+import pytest
+
+from conftest import make_template, read_cells
+
+
+def write_rows(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["수험번호", "이름"])
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    """설정 파일/CSV/템플릿을 만든 Watcher 생성 함수 (rows: [(수험번호, 이름)])"""
+    from watch_mode import Watcher
+
+    def factory(rows, **settings):
+        write_rows(tmp_path / "applicants.csv", rows)
+        config = {
+            "template_file": make_template(tmp_path / "template.xlsx", {"A1": "{{이름}}", "B1": "{{수험번호}}"}),
+            "raw_data_file": str(tmp_path / "applicants.csv"),
+            "output_dir": str(tmp_path / "output"),
+            "images_dir": str(tmp_path / "images"),
+            "backend": "ooxml",
+            "save_pdf": False,
+            "catalog": False,
+            "filename_pattern": "{수험번호}_{이름}.xlsx",
+        }
+        config.update(settings)
+        with open(tmp_path / "config.json", "w", encoding="utf-8") as f:
+            json.dump(config, f, ensure_ascii=False)
+        return Watcher(str(tmp_path / "config.json"))
+
+    return factory
+
+
+def track_renders(monkeypatch, watcher, fail=()):
+    """render_row 호출 기록 (fail에 든 행 번호는 실패시킴)"""
+    rendered = []
+    render_row = watcher.filler.render_row
+
+    def tracked(index, context, output_dir, outputs=None, jobs=None):
+        rendered.append(index)
+        if index in fail:
+            raise RuntimeError("렌더링 실패")
+        return render_row(index, context, output_dir, outputs, jobs)
+
+    monkeypatch.setattr(watcher.filler, "render_row", tracked)
+    return rendered
+
+
+def test_failed_rows_are_retried_next_cycle(monkeypatch, watcher):
+    w = watcher([("A1", "가"), ("A2", "나"), ("A3", "다")])
+    fail = {1}
+    rendered = track_renders(monkeypatch, w, fail)
+
+    assert w.run_cycle(initial=True) == (2, 3)
+    assert w.unrendered == {"A2"}
+
+    # 데이터가 그대로여도 실패한 행만 다시 렌더링
+    fail.clear()
+    rendered.clear()
+    assert w.run_cycle() == (1, 1)
+    assert rendered == [1]
+    assert not w.unrendered
+    assert w.run_cycle() == (0, 0)
+    output = os.path.join(w.config["output_dir"], "A2_나.xlsx")
+    assert read_cells(output, ["A1"]) == {"A1": "나"}
+
+
+def test_duplicate_keys_do_not_renumber_when_an_earlier_row_is_removed(monkeypatch, watcher):
+    rows = [("A1", "가"), ("A1", "나"), ("A1", "다"), ("A2", "라")]
+    w = watcher(rows, filename_pattern="{이름}.xlsx")
+    w.run_cycle(initial=True)
+    keys = set(w.snapshot)
+    assert len(keys) == 4
+    first = next(key for key, entry in w.snapshot.items() if entry[1]["이름"] == "가")
+
+    # 앞의 중복 행을 지워도 나머지 중복 행은 같은 키 -> 재생성 없음
+    write_rows(w.config["raw_data_file"], rows[1:])
+    rendered = track_renders(monkeypatch, w)
+    assert w.run_cycle() == (0, 0)
+    assert rendered == []
+    assert set(w.snapshot) == keys - {first}
+
+
+def output_ids(w, names):
+    """출력 파일별 B1(수험번호) 값 (없으면 None)"""
+    ids = {}
+    for name in names:
+        path = os.path.join(w.config["output_dir"], name)
+        ids[name] = read_cells(path, ["B1"])["B1"] if os.path.exists(path) else None
+    return ids
+
+
+def test_suffix_policy_keeps_same_name_applicants_apart(watcher):
+    w = watcher([("A1", "홍길동"), ("A2", "홍길동")], filename_pattern="{이름}.xlsx", collision_policy="suffix")
+    assert w.run_cycle(initial=True) == (2, 2)
+    assert output_ids(w, ["홍길동.xlsx", "홍길동_2.xlsx"]) == {"홍길동.xlsx": "A1", "홍길동_2.xlsx": "A2"}
+
+    # 앞에 같은 이름이 끼어들면 뒤 행들의 출력 이름이 바뀌므로 함께 다시 렌더링
+    write_rows(w.config["raw_data_file"], [("A0", "홍길동"), ("A1", "홍길동"), ("A2", "홍길동")])
+    assert w.run_cycle() == (3, 3)
+    assert output_ids(w, ["홍길동.xlsx", "홍길동_2.xlsx", "홍길동_3.xlsx"]) == {
+        "홍길동.xlsx": "A0", "홍길동_2.xlsx": "A1", "홍길동_3.xlsx": "A2",
+    }
+
+
+def test_skip_policy_does_not_render_later_duplicates(monkeypatch, watcher):
+    w = watcher([("A1", "홍길동"), ("A2", "홍길동"), ("A3", "김철수")],
+                filename_pattern="{이름}.xlsx", collision_policy="skip")
+    rendered = track_renders(monkeypatch, w)
+
+    assert w.run_cycle(initial=True) == (2, 2)
+    assert rendered == [0, 2]
+    assert output_ids(w, ["홍길동.xlsx"]) == {"홍길동.xlsx": "A1"}
+    # 건너뛴 행은 다음 주기에 다시 대상이 되지 않음
+    assert w.run_cycle() == (0, 0)
+
+
+def test_fail_policy_renders_nothing_until_resolved(monkeypatch, watcher):
+    w = watcher([("A1", "홍길동"), ("A2", "홍길동")], filename_pattern="{이름}.xlsx", collision_policy="fail")
+    rendered = track_renders(monkeypatch, w)
+
+    assert w.run_cycle(initial=True) == (0, 0)
+    assert rendered == []
+
+    write_rows(w.config["raw_data_file"], [("A1", "홍길동"), ("A2", "김철수")])
+    assert w.run_cycle() == (2, 2)
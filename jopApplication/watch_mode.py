@@ -0,0 +1,260 @@
+"""
+watch 모드 - 입력이 바뀔 때마다 영향을 받은 지원자만 다시 생성
+
+python excel_template_filler.py watch 로 실행 (Ctrl+C로 종료)
+
+감시 대상:
+- 원천 데이터 파일: 행 스냅샷을 비교해 추가/변경된 행만 재생성 (삭제된 행은 보고만 함)
+  재생성에 실패한 행은 스냅샷에 넣지 않으므로 다음 주기에 다시 시도
+  주기마다 배치와 같은 출력 경로 충돌 검사(collision_policy: suffix/skip/fail)를 적용
+- images 폴더: 사진이 새로 생기거나 바뀐 지원자만 재생성
+- 템플릿 / config.json: 변경 시 다시 컴파일하고 전체 재생성
+
+파일 저장이 연달아 일어나는 경우 watch_debounce 초 동안 조용해질 때까지 기다렸다가 한 번만 처리한다.
+템플릿과 설정은 주기 사이에 메모리에 컴파일된 상태로 유지된다.
+"""
+
+import os
+import time
+
+from excel_template_filler import ExcelTemplateFiller, ConfigError, ProcessingCancelled
+from row_sources import open_row_source, row_fingerprint, file_signature
+
+
+def dir_signature(path):
+    """폴더 안 파일 목록과 각 파일의 (수정 시각, 크기)"""
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return None
+    return tuple(sorted(
+        (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+        for entry in entries if entry.is_file()
+    ))
+
+
+class Watcher:
+    """입력 변경을 감시해 영향받은 행만 재생성"""
+
+    def __init__(self, config_path="config.json"):
+        self.config_path = config_path
+        self.filler = ExcelTemplateFiller(config_path)
+        self.snapshot = {}  # 행 키 -> (행 번호, 컨텍스트, 지문, 사진 서명, 충돌 처리) - 렌더링에 성공한 상태
+        self.unrendered = set()  # 지난 주기에 렌더링하지 못한 행 키
+        self.signatures = {}
+
+    @property
+    def config(self):
+        return self.filler.config
+
+    def watched_signatures(self):
+        """감시 대상별 현재 서명"""
+        signatures = {
+            "config": file_signature(self.config_path),
+            "raw_data": file_signature(self.config["raw_data_file"]),
+            "images": dir_signature(self.config["images_dir"]),
+        }
+        for path in self.filler.get_template_paths():
+            signatures[f"template:{path}"] = file_signature(path)
+        for join in self.config.get("joins", []):
+            if join.get("file"):
+                signatures[f"join:{join['file']}"] = file_signature(join["file"])
+        return signatures
+
+    def wait_until_quiet(self, interval, debounce):
+        """변경이 멈출 때까지 대기 (연속 저장 묶기) - 마지막 서명 반환"""
+        current = self.watched_signatures()
+        quiet_since = time.monotonic()
+        while time.monotonic() - quiet_since < debounce:
+            time.sleep(interval)
+            latest = self.watched_signatures()
+            if latest != current:
+                current = latest
+                quiet_since = time.monotonic()
+        return current
+
+    def take_snapshot(self):
+        """원천 데이터 전체 행의 키 -> (행 번호, 컨텍스트, 지문, 사진 서명)
+
+        같은 키가 여러 행에 있으면 키에 행 지문을 붙여 구분한다 (등장 순서 번호를 쓰면 앞 행을
+        지우거나 끼워 넣을 때 뒤 행 번호가 모두 바뀌어 변경을 잘못 판단함).
+        내용까지 같은 행만 등장 순서 번호로 구분한다.
+        """
+        rows = []
+        counts = {}
+        source = open_row_source(self.config, fields=self.filler.projected_fields())
+        for index, context in enumerate(source.iter_rows()):
+            key = self.filler.get_shard_key(context, index)
+            counts[key] = counts.get(key, 0) + 1
+            rows.append((key, index, context, row_fingerprint(context)))
+
+        snapshot = {}
+        photo_field = self.config["photo_field"]
+        for key, index, context, fingerprint in rows:
+            if counts[key] > 1:
+                key = f"{key}#{fingerprint[:12]}"
+                base, number = key, 1
+                while key in snapshot:
+                    number += 1
+                    key = f"{base}#{number}"
+            photo_path = self.filler.photo_index.get(str(context.get(photo_field, "")).strip())
+            photo_signature = (photo_path, file_signature(photo_path)) if photo_path else None
+            snapshot[key] = (index, context, fingerprint, photo_signature)
+        return snapshot
+
+    def outputs_missing(self, index, context, jobs=None):
+        """행의 출력 파일 중 없는 것이 있는지 (jobs: 충돌 검사에서 바꾼 출력 목록)"""
+        if jobs is None:
+            jobs = self.filler.get_row_outputs(context, index, self.config["output_dir"])
+        return any(not os.path.exists(output_path) for _, output_path in jobs)
+
+    def run_cycle(self, rebuild_all=False, initial=False):
+        """스냅샷을 비교해 필요한 행만 렌더링"""
+        self.filler.photo_index = self.filler.build_photo_index()
+        snapshot = self.take_snapshot()
+        output_dir = self.config["output_dir"]
+
+        # 배치와 같은 충돌 검사 - 같은 이름의 지원자가 서로의 출력을 덮어쓰지 않도록
+        rows = sorted((entry[0], entry[1]) for entry in snapshot.values())
+        overrides, skipped, collisions = self.filler.plan_collisions(rows, output_dir)
+        if self.filler.print_collisions(collisions) and collisions["policy"] == "fail":
+            print("  collision_policy가 fail이므로 충돌이 해결될 때까지 재생성하지 않습니다")
+            return 0, 0
+
+        targets = []
+        for key, (index, context, fingerprint, photo_signature) in list(snapshot.items()):
+            # 충돌 처리 결과가 바뀐 행(새로 _2가 붙거나 건너뛰게 된 행 등)도 다시 렌더링
+            plan = ("skip",) if index in skipped else tuple(path for _, path in overrides.get(index, ()))
+            snapshot[key] = (index, context, fingerprint, photo_signature, plan)
+            previous = self.snapshot.get(key)
+            if rebuild_all:
+                reason = "템플릿/설정 변경"
+            elif initial:
+                reason = "출력 없음" if self.outputs_missing(index, context, overrides.get(index)) else None
+            elif previous is None:
+                reason = "재시도" if key in self.unrendered else "추가"
+            elif previous[2] != fingerprint:
+                reason = "변경"
+            elif previous[3] != photo_signature:
+                reason = "사진 변경"
+            elif previous[4] != plan:
+                reason = "출력 경로 변경"
+            else:
+                reason = None
+            if reason and index in skipped:
+                print(f"  [{reason}] 행 {index + 1}: 건너뜀 ({skipped[index]})")
+            elif reason:
+                targets.append((key, index, context, reason))
+
+        removed = [key for key in self.snapshot if key not in snapshot]
+        # 대상 행은 렌더링에 성공한 뒤에 스냅샷에 넣음 (실패/중단된 행은 다음 주기에 다시 시도)
+        pending = {key: snapshot.pop(key) for key, _, _, _ in targets}
+        self.snapshot = snapshot
+        self.unrendered = set(pending)
+
+        if removed:
+            print(f"  삭제된 행 {len(removed)}건 (기존 출력 파일은 유지): {removed[:10]}")
+        if not targets:
+            print("  재생성할 지원자가 없습니다.")
+            return 0, 0
+
+        os.makedirs(output_dir, exist_ok=True)
+        print(f"  재생성 대상 {len(targets)}건")
+        success = 0
+        for key, index, context, reason in targets:
+            print(f"\n [{reason}] 행 {index + 1}: {context.get('이름', key)}")
+            try:
+                self.filler.render_row(index, context, output_dir, jobs=overrides.get(index))
+                success += 1
+            except ProcessingCancelled:
+                raise
+            except Exception as e:
+                print(f" 행 {index + 1} 처리 실패: {e}")
+                continue
+            self.snapshot[key] = pending[key]
+            self.unrendered.discard(key)
+        print(f"\n  재생성 완료: {success}/{len(targets)}건")
+        if self.unrendered:
+            print(f"  실패한 {len(self.unrendered)}건은 다음 변경 감지 때 다시 시도합니다")
+        return success, len(targets)
+
+    def reload_config(self):
+        """설정 파일이 바뀌면 새 설정으로 엔진을 다시 만들고 검사"""
+        try:
+            self.filler = ExcelTemplateFiller(self.config_path)
+        except ConfigError as e:
+            print(e)
+            return False
+        return True
+
+    def check(self):
+        """사전 검사 - 실패하면 이번 주기는 건너뜀"""
+        if not self.config.get("preflight", True):
+            return True
+        problems = self.filler.preflight()
+        if problems:
+            print(f"  사전 검사 실패: {len(problems)}건 - 수정될 때까지 재생성하지 않습니다")
+            for problem in problems:
+                print(f"    - {problem}")
+            return False
+        return True
+
+    def run(self):
+        """감시 루프"""
+        interval = self.config["watch_interval"]
+        debounce = self.config["watch_debounce"]
+        print("=" * 60)
+        print("watch 모드 시작 (Ctrl+C로 종료)")
+        print(f"  원천 데이터: {self.config['raw_data_file']}")
+        print(f"  템플릿: {', '.join(self.filler.get_template_paths())}")
+        print(f"  사진 폴더: {self.config['images_dir']}")
+        print("=" * 60)
+
+        self.signatures = self.watched_signatures()
+        pending_full = not self.check()
+        if not pending_full:
+            self.run_cycle(initial=True)
+
+        retry = False
+        try:
+            while True:
+                time.sleep(interval)
+                if not retry and self.watched_signatures() == self.signatures:
+                    continue
+                retry = False
+
+                latest = self.wait_until_quiet(interval, debounce)
+                changed = [name for name in latest if latest.get(name) != self.signatures.get(name)]
+                self.signatures = latest
+                print(f"\n[{time.strftime('%H:%M:%S')}] 변경 감지: {', '.join(changed) or '재시도'}")
+
+                rebuild_all = pending_full
+                if "config" in changed:
+                    if not self.reload_config():
+                        pending_full = True
+                        continue
+                    self.signatures = self.watched_signatures()
+                    interval = self.config["watch_interval"]
+                    debounce = self.config["watch_debounce"]
+                    rebuild_all = True
+                if any(name.startswith("template:") for name in changed):
+                    rebuild_all = True
+
+                if not self.check():
+                    pending_full = True
+                    continue
+                pending_full = False
+
+                try:
+                    self.run_cycle(rebuild_all=rebuild_all)
+                except Exception as e:
+                    # 저장 도중의 파일을 읽은 경우 등 - 다음 변경 때 다시 시도
+                    print(f"  재생성 주기 실패: {e}")
+                    retry = True
+        except KeyboardInterrupt:
+            print("\nwatch 모드 종료")
+
+
+def watch(config_path="config.json"):
+    """watch 명령 진입점"""
+    Watcher(config_path).run()